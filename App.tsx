@@ -3,7 +3,7 @@ import React, { useState, useEffect } from 'react';
 import { 
   ClassLevel, Subject, Chapter, AppState, Board, Stream, User, ContentType, SystemSettings, ActivityLogEntry, WeeklyTest, LessonContent
 } from './types';
-import { getChapterData, saveChapterData, checkFirebaseConnection, saveTestResult, saveUserToLive, updateUserStatus, getUserData, subscribeToSettings, auth, savePublicActivity, saveUserHistory } from './firebase';
+import { getChapterData, saveChapterData, checkFirebaseConnection, saveTestResult, saveUserToLive, updateUserStatus, getUserData, subscribeToSettings, auth, savePublicActivity, saveUserHistory, syncPendingWrites } from './firebase';
 import { signInAnonymously } from 'firebase/auth';
 import { fetchChapters, fetchLessonContent } from './services/groq';
 import { BoardSelection } from './components/BoardSelection';
@@ -35,6 +35,8 @@ import { BrainCircuit, Globe, LogOut, LayoutDashboard, BookOpen, Headphones, Hel
 import { SUPPORT_EMAIL, APP_VERSION } from './constants';
 import { StudentTab, PendingReward, MCQResult, SubscriptionHistoryEntry } from './types';
 import { storage } from './utils/storage';
+import { getCachedSettings, persistSettings } from './utils/settingsStore';
+import { prefetchNextChapters } from './utils/prefetch';
 
 const TermsPopup: React.FC<{ onClose: () => void, text?: string }> = ({ onClose, text }) => (
     <div className="fixed inset-0 z-[100] bg-black/60 backdrop-blur-sm flex items-end md:items-center justify-center p-0 md:p-4 animate-in fade-in duration-300">
@@ -249,7 +251,7 @@ const App: React.FC = () => {
               console.log("Cleaned up old Groq keys");
               const updatedSettings = { ...state.settings, deletedGroqKeys: newDeletedKeys };
               setState(prev => ({ ...prev, settings: updatedSettings }));
-              localStorage.setItem('nst_system_settings', JSON.stringify(updatedSettings));
+              persistSettings(updatedSettings);
           }
       }
   }, [state.settings.deletedGroqKeys]);
@@ -378,30 +380,24 @@ const App: React.FC = () => {
     };
   }, []);
 
-  // Background Sync Logic
+  // Background Sync Logic: replay results/history saved while offline
   useEffect(() => {
       if (isOnline) {
-          const pendingStr = localStorage.getItem('nst_pending_sync_results');
-          if (pendingStr) {
-              try {
-                  const pending = JSON.parse(pendingStr);
-                  if (Array.isArray(pending) && pending.length > 0) {
-                      console.log(`Syncing ${pending.length} offline results...`);
-                      pending.forEach(async (item) => {
-                          if (item.type === 'HISTORY') {
-                              await saveUserHistory(item.userId, item.data);
-                          }
-                      });
-                      localStorage.removeItem('nst_pending_sync_results');
-                      setAlertConfig({isOpen: true, message: "Offline results synced successfully!"});
-                  }
-              } catch (e) {
-                  console.error("Sync failed", e);
-              }
-          }
+          syncPendingWrites().then(synced => {
+              if (synced > 0) setAlertConfig({isOpen: true, message: "Offline results synced successfully!"});
+          }).catch(e => console.error("Sync failed", e));
       }
   }, [isOnline]);
 
+  // Idle prefetch of the next chapters so they open from the offline cache
+  useEffect(() => {
+      if (!state.selectedBoard || !state.selectedClass || !state.selectedSubject) return;
+      if (state.view !== 'CHAPTERS' && state.view !== 'LESSON') return;
+      const streamKey = (state.selectedClass === '11' || state.selectedClass === '12') ? `-${state.selectedStream}` : '';
+      const keyPrefix = `nst_content_${state.selectedBoard}_${state.selectedClass}${streamKey}_${state.selectedSubject.name}_`;
+      return prefetchNextChapters(state.chapters, tempSelectedChapter?.id || null, chapter => `${keyPrefix}${chapter.id}`);
+  }, [state.view, state.chapters, state.selectedBoard, state.selectedClass, state.selectedStream, state.selectedSubject, tempSelectedChapter?.id]);
+
   // --- LIVE SETTINGS SYNC (REALTIME) ---
   useEffect(() => {
       // Subscribe to Firebase Settings Updates
@@ -410,7 +406,7 @@ const App: React.FC = () => {
               setState(prev => {
                   const hasChanges = JSON.stringify(prev.settings) !== JSON.stringify({...prev.settings, ...newSettings});
                   if (hasChanges) {
-                      localStorage.setItem('nst_system_settings', JSON.stringify(newSettings));
+                      // Already persisted by the settings store
                       return {...prev, settings: {...prev.settings, ...newSettings}};
                   }
                   return prev;
@@ -583,10 +579,10 @@ const App: React.FC = () => {
 
   useEffect(() => {
       let loadedSettings = state.settings;
-      const storedSettings = localStorage.getItem('nst_system_settings');
+      const storedSettings = getCachedSettings();
       if (storedSettings) {
           try {
-              const parsed = JSON.parse(storedSettings);
+              const parsed = storedSettings;
               loadedSettings = { ...state.settings, ...parsed };
 
               // BACKFILL BANNER CONFIG IF MISSING
@@ -812,7 +808,7 @@ const App: React.FC = () => {
 
   const updateSettings = (newSettings: SystemSettings) => {
       setState(prev => ({...prev, settings: newSettings}));
-      localStorage.setItem('nst_system_settings', JSON.stringify(newSettings));
+      persistSettings(newSettings);
   };
 
   // Provide a global toggle handler for TTS
@@ -916,6 +912,7 @@ const App: React.FC = () => {
     updatedUser.testResults.unshift(result);
     
     // Save to Firestore
+    // Chapter practice is not ranked: only challenge/weekly tests feed the leaderboard
     saveUserHistory(state.user.id, result);
     saveTestResult(state.user.id, result);
     
@@ -1104,11 +1101,7 @@ const App: React.FC = () => {
         const streamKey = (state.selectedClass === '11' || state.selectedClass === '12') ? `-${state.selectedStream}` : '';
         const mainKey = `nst_content_${state.selectedBoard}_${state.selectedClass}${streamKey}_${state.selectedSubject?.name}_${tempSelectedChapter.id}`;
         
-        let contentData = await getChapterData(mainKey);
-        if (!contentData) {
-            const stored = localStorage.getItem(mainKey);
-            if (stored) contentData = JSON.parse(stored);
-        }
+        const contentData = await getChapterData(mainKey, ['notes']);
 
         let actualContent = '';
         let cost = 0;
@@ -1571,7 +1564,14 @@ const App: React.FC = () => {
     localStorage.setItem(key, JSON.stringify(attempts));
 
     // 2. Firestore Sync (So Admin can see)
-    await saveTestResult(state.user.id, attempt);
+    // Admin impersonation must not rank the impersonated student
+    await saveTestResult(state.user.id, attempt, state.originalAdmin ? undefined : {
+        userName: state.user.name,
+        board: state.user.board || 'CBSE',
+        classLevel: state.user.classLevel || '10',
+        percentage: attempt.score,
+        topic: activeWeeklyTest.name
+    });
     
     logActivity("TEST_SUBMIT", `Completed ${activeWeeklyTest.name} with score ${score}/${total}`);
     setActiveWeeklyTest(null);
@@ -1,14 +1,18 @@
 
 import React, { useEffect, useState, useRef } from 'react';
-import { User, ViewState, SystemSettings, Subject, Chapter, MCQItem, RecoveryRequest, ActivityLogEntry, LeaderboardEntry, RecycleBinItem, Stream, Board, ClassLevel, GiftCode, SubscriptionPlan, CreditPackage, SpinReward, HtmlModule, PremiumNoteSlot, ContentInfoConfig, ContentInfoItem, SubscriptionHistoryEntry, UniversalAnalysisLog, ContentType, LessonContent } from '../types';
+import { User, ViewState, SystemSettings, Subject, Chapter, MCQItem, RecoveryRequest, ActivityLogEntry, LeaderboardEntry, RecycleBinItem, Stream, Board, ClassLevel, GiftCode, SubscriptionPlan, CreditPackage, SpinReward, HtmlModule, PremiumNoteSlot, ContentInfoConfig, ContentInfoItem, SubscriptionHistoryEntry, UniversalAnalysisLog, ContentType, LessonContent, AnalysisSummary } from '../types';
 import { List, LayoutDashboard, Users, Search, Trash2, Save, X, Eye, EyeOff, Shield, Megaphone, CheckCircle, ListChecks, Database, FileText, Monitor, Sparkles, Banknote, BrainCircuit, AlertOctagon, ArrowLeft, Key, Bell, ShieldCheck, Lock, Globe, Layers, Zap, PenTool, RefreshCw, RotateCcw, Plus, LogOut, Download, Upload, CreditCard, Ticket, Video, Image as ImageIcon, Type, Link, FileJson, Activity, AlertTriangle, Gift, Book, Mail, Edit3, MessageSquare, ShoppingBag, Cloud, Rocket, Code2, Layers as LayersIcon, Wifi, WifiOff, Copy, Crown, Gamepad2, Calendar, BookOpen, Image, HelpCircle, Youtube, Play, Star, Trophy, Palette, Settings, Headphones, Layout, Bot, LayoutDashboard as DashboardIcon } from 'lucide-react';
 import { getSubjectsList, DEFAULT_SUBJECTS, DEFAULT_APP_FEATURES, ALL_APP_FEATURES, STUDENT_APP_FEATURES, DEFAULT_CONTENT_INFO_CONFIG, ADMIN_PERMISSIONS, APP_VERSION, STATIC_SYLLABUS } from '../constants';
 import { fetchChapters, fetchLessonContent } from '../services/groq';
-import { runAutoPilot, runCommandMode } from '../services/autoPilot';
-import { saveChapterData, bulkSaveLinks, checkFirebaseConnection, saveSystemSettings, subscribeToUsers, rtdb, saveUserToLive, db, getChapterData, saveCustomSyllabus, deleteCustomSyllabus, subscribeToUniversalAnalysis, saveAiInteraction, saveSecureKeys, getSecureKeys, subscribeToApiUsage, subscribeToDrafts, resetAllContent, subscribeToDemands } from '../firebase'; // IMPORT FIREBASE
+import { runAutoPilot, runCommandMode, runDailyChallengesLoop } from '../services/autoPilot';
+import { saveChapterData, bulkSaveLinks, checkFirebaseConnection, saveSystemSettings, subscribeToUsers, rtdb, saveUserToLive, db, getChapterData, saveCustomSyllabus, deleteCustomSyllabus, subscribeToUniversalAnalysis, saveAiInteraction, saveSecureKeys, getSecureKeys, subscribeToApiUsage, subscribeToDrafts, resetAllContent, subscribeToDemands, getAnalysisSummary } from '../firebase'; // IMPORT FIREBASE
 import { ref, set, onValue, update, push, get } from "firebase/database";
 import { doc, deleteDoc } from "firebase/firestore";
 import { storage } from '../utils/storage';
+import { loadContent, saveContent, clearContent } from '../utils/contentStore';
+import { persistSettings } from '../utils/settingsStore';
+import { runMcqImport, ImportStats } from '../utils/mcqImport';
+import { readLines } from '../utils/mcqImportParser';
 import { SimpleRichTextEditor } from './SimpleRichTextEditor';
 import { ImageCropper } from './ImageCropper';
 import { DEFAULT_SYLLABUS, MonthlySyllabus } from '../syllabus_data';
@@ -45,21 +49,6 @@ const DEFAULT_ULTRA_FEATURES = [
     'Spin Wheel (10 Spins/Day)'
 ];
 
-const QUESTION_START_REGEX = /^(\*\*)?(Q\s*\d+[.:)]?|\d+[.:)]|Question\s*\d+[.:)]?)(\*\*)?\s*/i;
-
-const looksLikeQuestionBlock = (lines: string[], index: number): boolean => {
-    // Check if line index + 5 (Answer line) exists
-    if (index + 5 >= lines.length) return false;
-
-    // Check Answer pattern on line index + 5
-    const ansLine = lines[index + 5];
-    // Remove Markdown Bolding (**Answer**) if present
-    const cleanAnsLine = ansLine.replace(/^\*\*|\*\*$/g, '');
-
-    // Check if it starts with Answer/Ans/Correct/उत्तर
-    return /^(Answer|Ans|Correct|उत्तर)\s*[:\s-]*\s*/i.test(cleanAnsLine);
-};
-
 interface Props {
   onNavigate: (view: ViewState) => void;
   settings?: SystemSettings;
@@ -606,6 +595,7 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
   const [editingTestMcqs, setEditingTestMcqs] = useState<MCQItem[]>([]);
   const [importText, setImportText] = useState('');
   const [syllabusImportText, setSyllabusImportText] = useState('');
+  const [importProgress, setImportProgress] = useState<ImportStats | null>(null);
   
   // --- PDF PREVIEW STATE ---
   const [previewPdfFile, setPreviewPdfFile] = useState<File | null>(null);
@@ -624,6 +614,14 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
   const [newSubAdminId, setNewSubAdminId] = useState('');
   const [viewingSubAdminReport, setViewingSubAdminReport] = useState<string | null>(null);
   const [viewingUserHistory, setViewingUserHistory] = useState<User | null>(null); // NEW: User History Modal
+  const [platformSummary, setPlatformSummary] = useState<AnalysisSummary | null>(null);
+
+  // Platform benchmark for the history modal (30 precomputed daily docs, not raw logs)
+  useEffect(() => {
+      if (viewingUserHistory && !platformSummary) {
+          getAnalysisSummary('DAILY', 30).then(setPlatformSummary);
+      }
+  }, [viewingUserHistory]);
   
   // --- USER EDIT MODAL STATE ---
   const [editingUser, setEditingUser] = useState<User | null>(null);
@@ -761,7 +759,7 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
     const key = `nst_content_${selBoard}_${selClass}${streamKey}_${selSubject.name}_${editingChapterId}`;
     
     try {
-      const existing = await storage.getItem(key);
+      const existing = await loadContent(key);
       const existingData = existing || {};
       
       const modePrefix = syllabusMode === 'SCHOOL' ? 'school' : 'competition';
@@ -814,7 +812,7 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
       };
       
       // Save locally AND to Firebase
-      await storage.setItem(key, newData);
+      await saveContent(key, newData);
       if (isFirebaseConnected) {
           await saveChapterData(key, newData); // <--- FIREBASE SAVE
           
@@ -978,7 +976,7 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
       setLocalSettings({...localSettings, weeklyTests: updatedTests});
       
       // Save immediately
-      localStorage.setItem('nst_system_settings', JSON.stringify({...localSettings, weeklyTests: updatedTests}));
+      persistSettings({...localSettings, weeklyTests: updatedTests});
       
       // Reset Form
       setTestName('');
@@ -989,6 +987,15 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
       alert("✅ Weekly Test Created Successfully!");
   };
 
+  // --- DAILY AUTO-PILOT: challenges + morning insight, once a day per admin device ---
+  useEffect(() => {
+      if (!settings || new Date().getHours() < 6) return;
+      const lockKey = `nst_daily_loop_${new Date().toDateString()}`;
+      if (localStorage.getItem(lockKey)) return;
+      localStorage.setItem(lockKey, 'true'); // Lock (one run per admin device per day)
+      runDailyChallengesLoop((msg) => console.log(msg), settings);
+  }, [!!settings]);
+
   // --- INITIAL LOAD & AUTO REFRESH ---
   useEffect(() => {
       loadData();
@@ -1168,7 +1175,7 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
           delete settingsToSave.apiKeys; // REMOVE KEYS FROM PUBLIC
           
           onUpdateSettings(localSettings);
-          localStorage.setItem('nst_system_settings', JSON.stringify(settingsToSave));
+          persistSettings(settingsToSave);
           
           // SYNC TO FIREBASE
           if (isFirebaseConnected) {
@@ -1191,7 +1198,7 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
       const updated = { ...localSettings, [key]: newVal };
       setLocalSettings(updated);
       if(onUpdateSettings) onUpdateSettings(updated);
-      localStorage.setItem('nst_system_settings', JSON.stringify(updated));
+      persistSettings(updated);
       logActivity("SETTINGS_TOGGLED", `Toggled ${key} to ${newVal}`);
   };
 
@@ -1222,7 +1229,7 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
       return true;
   };
 
-  const handleRestoreItem = (item: RecycleBinItem) => {
+  const handleRestoreItem = async (item: RecycleBinItem) => {
       if (!window.confirm(`Restore "${item.name}"?`)) return;
 
       if (item.type === 'USER') {
@@ -1236,15 +1243,14 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
               return;
           }
       } else if (item.type === 'MCQ_BATCH' && item.restoreKey) {
-          const stored = localStorage.getItem(item.restoreKey);
-          const current = stored ? JSON.parse(stored) : {};
+          const current = (await loadContent(item.restoreKey)) || {};
           const isTest = item.data.isTest;
           if (isTest) {
               current.weeklyTestMcqData = [...(current.weeklyTestMcqData || []), ...item.data.mcqs];
           } else {
               current.manualMcqData = [...(current.manualMcqData || []), ...item.data.mcqs];
           }
-          localStorage.setItem(item.restoreKey, JSON.stringify(current));
+          await saveContent(item.restoreKey, current);
           if (isFirebaseConnected) saveChapterData(item.restoreKey, current);
 
       } else if (item.restoreKey) {
@@ -1679,16 +1685,16 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
           if (activeTab === 'BULK_UPLOAD') {
               const streamKey = (selClass === '11' || selClass === '12') ? `-${selStream}` : '';
               const tempBulk: any = {};
-              ch.forEach(c => {
+              // Links live in the meta record, so no notes/MCQ sections are read here
+              await Promise.all(ch.map(async c => {
                   const key = `nst_content_${selBoard}_${selClass}${streamKey}_${s.name}_${c.id}`;
-                  const stored = localStorage.getItem(key);
-                  if (stored) {
-                      const d = JSON.parse(stored);
+                  const d = await loadContent(key, []);
+                  if (d) {
                       tempBulk[c.id] = { free: d.freeLink || '', premium: d.premiumLink || '', price: d.price || 5 };
                   } else {
                       tempBulk[c.id] = { free: '', premium: '', price: 5 };
                   }
-              });
+              }));
               setBulkData(tempBulk);
           }
 
@@ -1705,7 +1711,7 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
       const key = `nst_content_${selBoard}_${selClass}${streamKey}_${selSubject?.name}_${chId}`;
       
       // 1. Try Local First (Instant Load)
-      const stored = await storage.getItem(key);
+      const stored = await loadContent(key);
       if (stored) {
           applyContentData(stored);
       } else {
@@ -1722,8 +1728,7 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
           try {
               const cloudData = await getChapterData(key);
               if (cloudData) {
-                  // Update Storage & State with Cloud Data (Source of Truth)
-                  await storage.setItem(key, cloudData);
+                  // State with Cloud Data (Source of Truth); getChapterData already refreshed the cache
                   applyContentData(cloudData);
               }
           } catch(e) { console.error("Cloud Fetch Error", e); }
@@ -1765,11 +1770,10 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
       
       const updates: Record<string, any> = {};
 
-      Object.keys(bulkData).forEach(chId => {
+      await Promise.all(Object.keys(bulkData).map(async chId => {
           const d = bulkData[chId];
           const key = `nst_content_${selBoard}_${selClass}${streamKey}_${selSubject.name}_${chId}`;
-          const existing = localStorage.getItem(key);
-          const existingData = existing ? JSON.parse(existing) : {};
+          const existingData = (await loadContent(key)) || {};
           
           const newData = {
               ...existingData,
@@ -1777,9 +1781,9 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
               premiumLink: d.premium,
               price: d.price
           };
-          localStorage.setItem(key, JSON.stringify(newData));
+          await saveContent(key, newData);
           updates[key] = newData;
-      });
+      }));
 
       if (isFirebaseConnected) {
           await bulkSaveLinks(updates); 
@@ -1857,342 +1861,68 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
       }
   };
 
-  // --- GOOGLE SHEET IMPORT HANDLER (ROBUST & ASYNC) ---
-  const handleGoogleSheetImport = (isTest: boolean) => {
-      if (!importText.trim()) {
-          alert("Please paste data first!");
-          return;
-      }
-
-      setIsContentLoading(true); // Lock UI
-
-      // Use timeout to allow UI render before heavy processing
-      setTimeout(() => {
-          try {
-              const rawText = importText.trim();
-              let newQuestions: MCQItem[] = [];
-
-              // MODE A: Tab-Separated (Excel/Sheets/Copy-Paste) - PREFERRED
-              if (rawText.includes('\t')) {
-                  const rows = rawText.split('\n').filter(r => r.trim());
-                  newQuestions = rows.map((row, idx) => {
-                      let cols = row.split('\t');
-                      
-                      // Handle mixed CSV fallback
-                      if (cols.length < 3 && row.includes(',')) cols = row.split(',');
-
-                      cols = cols.map(c => c.trim());
-
-                      // Flexible Column Check (Min: Q + 4 Opts + Ans = 6)
-                      if (cols.length < 6) {
-                          // Skip invalid rows gracefully in bulk mode, or log error
-                          console.warn(`Row ${idx + 1} invalid. Found ${cols.length} columns.`);
-                          return null; 
-                      }
-
-                      // Parse Answer (1-4 or A-D)
-                      let ansIdx = parseInt(cols[5]) - 1;
-                      if (isNaN(ansIdx)) {
-                          const map: any = { 'A': 0, 'B': 1, 'C': 2, 'D': 3, 'a': 0, 'b': 1, 'c': 2, 'd': 3 };
-                          if (map[cols[5]] !== undefined) ansIdx = map[cols[5]];
-                      }
-
-                      // Check for Topic in 8th column (Index 7)
-                      let topic = '';
-                      if (cols.length > 7) {
-                          topic = cols[7];
-                      }
-
-                      return {
-                          question: cols[0],
-                          options: [cols[1], cols[2], cols[3], cols[4]],
-                          correctAnswer: (ansIdx >= 0 && ansIdx <= 3) ? ansIdx : 0, // Default to A if invalid
-                          explanation: cols[6] || '',
-                          topic: topic
-                      };
-                  }).filter(q => q !== null) as MCQItem[];
-              } 
-              // MODE B: Vertical Block Format (Flexible for Long Explanation)
-              else {
-                  const lines = rawText.split('\n').map(l => l.trim()).filter(l => l);
-                  let i = 0;
-                  
-                  while (i < lines.length) {
-                      const line = lines[i];
-                      
-                      // Check for Question Start
-                      const isQuestionStart = QUESTION_START_REGEX.test(line) || looksLikeQuestionBlock(lines, i);
-
-                      if (isQuestionStart) {
-                          if (i + 5 >= lines.length) break;
-
-                          // Clean Question Text (Remove Markdown ** if present)
-                          const q = line.replace(/^\*\*|\*\*$/g, '');
-
-                          const opts = [lines[i+1], lines[i+2], lines[i+3], lines[i+4]];
-
-                          let ansLine = lines[i+5];
-                          ansLine = ansLine.replace(/^\*\*|\*\*$/g, '');
-                          let ansRaw = ansLine.replace(/^(Answer|Ans|Correct|उत्तर)\s*[:\s-]*\s*/i, '').trim();
-
-                          let ansIdx = parseInt(ansRaw) - 1;
-                          if (isNaN(ansIdx)) {
-                              const firstChar = ansRaw.charAt(0).toUpperCase();
-                              const map: any = { 'A': 0, 'B': 1, 'C': 2, 'D': 3 };
-                              if (map[firstChar] !== undefined) ansIdx = map[firstChar];
-                          }
-                          if (ansIdx < 0 || ansIdx > 3) ansIdx = 0;
-
-                          let expLines = [];
-                          let nextIndex = i + 6;
-
-                          while (nextIndex < lines.length) {
-                              const line = lines[nextIndex];
-                              const isNewQuestion = QUESTION_START_REGEX.test(line) || looksLikeQuestionBlock(lines, nextIndex);
-                              if (isNewQuestion) break;
-                              expLines.push(line);
-                              nextIndex++;
-                          }
-
-                          let explanation = expLines.join('\n').trim();
-                          // Improved Explanation Parsing
-                          explanation = explanation.replace(/^\*\*/, '');
-                          explanation = explanation.replace(/^(Explanation|Exp|व्याख्या)\s*[:\s-]*(\*\*)?\s*/i, '');
-                          explanation = explanation.replace(/^\*\*/, '').trim();
-
-                          let topic = '';
-                          const topicMatch = explanation.match(/Topic:\s*(.*)/i);
-                          if (topicMatch) {
-                              topic = topicMatch[1].trim();
-                              explanation = explanation.replace(/Topic:\s*.*$/im, '').trim();
-                          }
-
-                          newQuestions.push({
-                              question: q,
-                              options: opts,
-                              correctAnswer: ansIdx,
-                              explanation: explanation,
-                              topic: topic
-                          });
-
-                          i = nextIndex;
-                      } else {
-                          i++;
-                      }
-                  }
-              }
-
-              if (newQuestions.length === 0) {
-                  throw new Error("No valid questions detected. Use Tab-Separated columns OR Vertical Blocks.");
-              }
-
-              if (isTest) {
-                  setEditingTestMcqs(prev => [...prev, ...newQuestions]);
-              } else {
-                  setEditingMcqs(prev => [...prev, ...newQuestions]);
-              }
-              
-              setImportText('');
-              alert(`Success! ${newQuestions.length} questions imported.`);
-
-          } catch (error: any) {
-              alert("Import Failed: " + error.message);
-          } finally {
-              setIsContentLoading(false); // Unlock UI
-          }
-      }, 100);
-  };
+  // --- GOOGLE SHEET IMPORT HANDLER (WORKER, STREAMED IN CHUNKS) ---
+  const handleGoogleSheetImport = (isTest: boolean) => runImport(isTest, false);
 
   // --- UNIFIED IMPORT HANDLER (MCQ + NOTES) ---
-  const handleUnifiedImport = (isTest: boolean) => {
+  const handleUnifiedImport = (isTest: boolean) => runImport(isTest, true);
+
+  const runImport = async (isTest: boolean, allowNotes: boolean) => {
       if (!importText.trim()) {
           alert("Please paste data first!");
           return;
       }
+      if (importProgress) return; // One import at a time
+
+      const setList = isTest ? setEditingTestMcqs : setEditingMcqs;
+      // Chunks are buffered and committed once: appending each chunk re-rendered
+      // the whole (unvirtualized) editor list up to ~100 times during a large import
+      let imported: MCQItem[] = [];
+      const commitImported = () => {
+          if (imported.length > 0) {
+              const batch = imported;
+              setList(prev => prev.concat(batch));
+              imported = [];
+          }
+      };
+      let noteCount = 0;
+      setImportProgress({ processedChars: 0, totalChars: importText.length, imported: 0, skipped: 0, duplicates: 0, errors: [] });
 
-      setIsContentLoading(true);
-
-      setTimeout(() => {
-          try {
-              let rawText = importText.trim();
-              const newTopicNotes: typeof topicNotes = [];
-
-              // 1. EXTRACT NOTES BLOCKS
-              // Regex to find <NOTE: Topic> Content </NOTE>
-              const noteRegex = /<NOTE:\s*(.*?)>([\s\S]*?)<\/NOTE>/gi;
-              let match;
-              while ((match = noteRegex.exec(rawText)) !== null) {
-                  const topicName = match[1].trim();
-                  const noteContent = match[2].trim();
-
-                  if (topicName && noteContent) {
-                      newTopicNotes.push({
-                          id: `note-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`,
-                          title: `Note: ${topicName}`,
-                          topic: topicName,
-                          content: noteContent,
-                          isPremium: false // Default to Free HTML
-                      });
-                  }
-              }
-
-              // Update Topic Notes State
-              if (newTopicNotes.length > 0) {
-                  setTopicNotes(prev => [...prev, ...newTopicNotes]);
-              }
-
-              // 2. REMOVE NOTES FROM TEXT TO PARSE MCQs
-              // Note: We deliberately handle this to avoid parsing Note content as questions.
-              const textForMcq = rawText.replace(noteRegex, "");
-
-              // 3. PARSE MCQs (Reusing logic applied to cleaned text)
-              let newQuestions: MCQItem[] = [];
-
-              if (textForMcq.trim().length > 0) {
-                  // MODE A: Tab-Separated
-                  if (textForMcq.includes('\t')) {
-                      const rows = textForMcq.split('\n').filter(r => r.trim());
-                      newQuestions = rows.map((row, idx) => {
-                          let cols = row.split('\t');
-                          if (cols.length < 3 && row.includes(',')) cols = row.split(',');
-                          cols = cols.map(c => c.trim());
-                          if (cols.length < 6) return null;
-
-                          let ansIdx = parseInt(cols[5]) - 1;
-                          if (isNaN(ansIdx)) {
-                              const map: any = { 'A': 0, 'B': 1, 'C': 2, 'D': 3, 'a': 0, 'b': 1, 'c': 2, 'd': 3 };
-                              if (map[cols[5]] !== undefined) ansIdx = map[cols[5]];
-                          }
-
-                          let topic = '';
-                          if (cols.length > 7) topic = cols[7];
-
-                          return {
-                              question: cols[0],
-                              options: [cols[1], cols[2], cols[3], cols[4]],
-                              correctAnswer: (ansIdx >= 0 && ansIdx <= 3) ? ansIdx : 0,
-                              explanation: cols[6] || '',
-                              topic: topic
-                          };
-                      }).filter(q => q !== null) as MCQItem[];
-                  }
-                  // MODE B: Vertical Block (Improved Robustness)
-                  else {
-                      const lines = textForMcq.split('\n').map(l => l.trim()).filter(l => l);
-                      let i = 0;
-                      let currentGlobalTopic = '';
-
-                      while (i < lines.length) {
-                          const line = lines[i];
-
-                          // 1. CHECK FOR TOPIC TAG
-                          const topicTagMatch = line.match(/^<TOPIC:\s*(.*?)>/i);
-                          if (topicTagMatch) {
-                              currentGlobalTopic = topicTagMatch[1].trim();
-                              i++;
-                              continue;
-                          }
-
-                          // 2. CHECK FOR QUESTION START
-                          const isQuestionStart = QUESTION_START_REGEX.test(line) || looksLikeQuestionBlock(lines, i);
-
-                          if (isQuestionStart) {
-                              // Needs at least Q + 4 Options + Ans = 6 lines remaining
-                              if (i + 5 >= lines.length) break;
-
-                              // Clean Question Text (Remove Markdown ** if present)
-                              const q = line.replace(/^\*\*|\*\*$/g, '');
-
-                              const opts = [lines[i+1], lines[i+2], lines[i+3], lines[i+4]];
-
-                              let ansLine = lines[i+5];
-                              // Remove ** wrapper
-                              ansLine = ansLine.replace(/^\*\*|\*\*$/g, '');
-                              // Remove Label
-                              let ansRaw = ansLine.replace(/^(Answer|Ans|Correct|उत्तर)\s*[:\s-]*\s*/i, '').trim();
-
-                              // Flexible Answer Parsing
-                              let ansIdx = -1;
-                              if (/^\d+$/.test(ansRaw)) {
-                                  ansIdx = parseInt(ansRaw) - 1;
-                              } else {
-                                  // Extract first letter (A, B, C, D)
-                                  const firstChar = ansRaw.charAt(0).toUpperCase();
-                                  const map: any = { 'A': 0, 'B': 1, 'C': 2, 'D': 3 };
-                                  if (map[firstChar] !== undefined) ansIdx = map[firstChar];
-                              }
-                              // Default to 0 (A) if parsing fails
-                              if (ansIdx < 0 || ansIdx > 3) ansIdx = 0;
-
-                              // Parse Explanation (Optional lines until next Q/Topic)
-                              let expLines = [];
-                              let nextIndex = i + 6;
-
-                              while (nextIndex < lines.length) {
-                                  const nextLine = lines[nextIndex];
-                                  const isNextTopic = /^<TOPIC:\s*(.*?)>/i.test(nextLine);
-                                  const isNextQ = QUESTION_START_REGEX.test(nextLine) || looksLikeQuestionBlock(lines, nextIndex);
-
-                                  if (isNextQ || isNextTopic) break;
-
-                                  expLines.push(nextLine);
-                                  nextIndex++;
-                              }
-
-                              let explanation = expLines.join('\n').trim();
-                              // Improved Explanation Parsing
-                              // 1. Remove leading **
-                              explanation = explanation.replace(/^\*\*/, '');
-                              // 2. Remove Label
-                              explanation = explanation.replace(/^(Explanation|Exp|व्याख्या)\s*[:\s-]*(\*\*)?\s*/i, '');
-                              // 3. Remove leading ** again if left
-                              explanation = explanation.replace(/^\*\*/, '').trim();
-
-                              // Parse Inline Topic (if any) overrides global
-                              let topic = '';
-                              const inlineTopicMatch = explanation.match(/Topic:\s*(.*)/i);
-                              if (inlineTopicMatch) {
-                                  topic = inlineTopicMatch[1].trim();
-                                  explanation = explanation.replace(/Topic:\s*.*$/im, '').trim();
-                              }
-
-                              newQuestions.push({
-                                  question: q,
-                                  options: opts,
-                                  correctAnswer: ansIdx,
-                                  explanation: explanation,
-                                  topic: topic || currentGlobalTopic
-                              });
-
-                              i = nextIndex;
-                          } else {
-                              i++;
-                          }
-                      }
-                  }
-              }
-
-              if (newQuestions.length > 0) {
-                  if (isTest) {
-                      setEditingTestMcqs(prev => [...prev, ...newQuestions]);
-                  } else {
-                      setEditingMcqs(prev => [...prev, ...newQuestions]);
-                  }
-              }
-
-              if (newQuestions.length === 0 && newTopicNotes.length === 0) {
-                  throw new Error("No valid content found.");
+      try {
+          const { stats } = await runMcqImport(importText, {
+              allowNotes,
+              existing: isTest ? editingTestMcqs : editingMcqs,
+              onNotes: (notes) => {
+                  noteCount = notes.length;
+                  setTopicNotes(prev => [...prev, ...notes]);
+              },
+              onChunk: (questions, progress) => {
+                  for (const q of questions) imported.push(q);
+                  setImportProgress(progress);
               }
+          });
+          commitImported();
 
-              setImportText('');
-              alert(`Success! Imported ${newQuestions.length} MCQs and ${newTopicNotes.length} Notes.`);
-
-          } catch (error: any) {
-              alert("Import Failed: " + error.message);
-          } finally {
-              setIsContentLoading(false);
+          if (stats.imported === 0 && noteCount === 0) {
+              const reason = stats.duplicates > 0
+                  ? `All ${stats.duplicates} questions already exist.`
+                  : "No valid questions detected. Use Tab-Separated columns OR Vertical Blocks.";
+              throw new Error(reason);
           }
-      }, 100);
+
+          setImportText('');
+          let summary = allowNotes
+              ? `Success! Imported ${stats.imported} MCQs and ${noteCount} Notes.`
+              : `Success! ${stats.imported} questions imported.`;
+          if (stats.duplicates > 0) summary += `\n${stats.duplicates} duplicates skipped.`;
+          if (stats.skipped > 0) summary += `\n${stats.skipped} invalid rows skipped:\n${stats.errors.slice(0, 5).join('\n')}`;
+          alert(summary);
+      } catch (error: any) {
+          commitImported(); // Keep what was parsed before the failure
+          alert("Import Failed: " + error.message);
+      } finally {
+          setImportProgress(null);
+      }
   };
 
   // --- ACCESS REQUEST HANDLERS ---
@@ -2437,6 +2167,24 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
   return (
     <div className="pb-20 bg-slate-50 min-h-screen">
       
+      {/* BULK IMPORT PROGRESS */}
+      {importProgress && (
+          <div className="fixed bottom-4 right-4 z-[100] w-72 bg-white p-4 rounded-xl shadow-2xl border border-slate-200">
+              <p className="text-xs font-bold text-slate-700 mb-2 flex items-center gap-2">
+                  <Upload size={14} /> Importing Questions...
+              </p>
+              <div className="w-full h-2 bg-slate-100 rounded-full overflow-hidden mb-2">
+                  <div
+                      className="h-full bg-green-500 transition-all"
+                      style={{ width: `${importProgress.totalChars ? Math.round((importProgress.processedChars / importProgress.totalChars) * 100) : 0}%` }}
+                  />
+              </div>
+              <p className="text-[10px] text-slate-500">
+                  {importProgress.imported} added • {importProgress.duplicates} duplicates • {importProgress.skipped} invalid
+              </p>
+          </div>
+      )}
+
       {/* 1. DASHBOARD HOME */}
       {activeTab === 'DASHBOARD' && (
           <div className="bg-white p-6 rounded-3xl shadow-sm border border-slate-200 mb-6 animate-in fade-in">
@@ -2866,7 +2614,7 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
                                           const updated = [...(localSettings.featuredItems || []), newItem];
                                           setLocalSettings({...localSettings, featuredItems: updated});
                                           // Save immediately to preview
-                                          localStorage.setItem('nst_system_settings', JSON.stringify({...localSettings, featuredItems: updated}));
+                                          persistSettings({...localSettings, featuredItems: updated});
                                       }
                                   }}
                                   className="w-full p-2 border rounded-lg"
@@ -3832,7 +3580,7 @@ const AdminDashboardInner: React.FC<Props> = ({ onNavigate, settings, onUpdateSe
                                <button 
                                    onClick={async () => {
                                         if (!syllabusImportText.trim()) { alert("Paste content first."); return; }
-                                        const lines = syllabusImportText.split('\n').map(l => l.trim()).filter(l => l);
+                                        const lines = Array.from(readLines(syllabusImportText), r => r.line.trim()).filter(l => l);
                                         const newChapters = lines.map((title, idx) => ({
                                             id: `ch-${Date.now()}-${idx}`,
                                             title: title,
@@ -7414,6 +7162,7 @@ Capital of India?       Mumbai  Delhi   Kolkata Chennai 2       Delhi is the cap
                               try {
                                   localStorage.clear();
                                   await storage.clear();
+                                  await clearContent();
                                   alert("✅ Cache Cleared!");
                                   window.location.reload();
                               } catch(e) {
@@ -7915,6 +7664,19 @@ Capital of India?       Mumbai  Delhi   Kolkata Chennai 2       Delhi is the cap
                                   </p>
                               </div>
                           </div>
+                          {platformSummary && platformSummary.totalAttempts > 0 && (
+                              <div className="mt-3 bg-white p-3 rounded-xl border border-slate-100 shadow-sm">
+                                  <p className="text-[10px] font-bold text-slate-400 uppercase mb-1">Platform (Last 30 Days)</p>
+                                  <p className="text-xs text-slate-600">
+                                      <span className="font-black text-slate-800">{platformSummary.avgScore}%</span> avg over {platformSummary.totalAttempts} analyses • {platformSummary.lowScoreRate}% below 50%
+                                  </p>
+                                  {platformSummary.weakChapters.length > 0 && (
+                                      <p className="text-[10px] text-red-500 mt-1 truncate">
+                                          Weakest: {platformSummary.weakChapters.slice(0, 3).map(c => `${c.name} (${c.avgScore}%)`).join(', ')}
+                                      </p>
+                                  )}
+                              </div>
+                          )}
                       </div>
 
                       {/* 1. MCQ RESULTS */}
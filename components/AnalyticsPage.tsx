@@ -1,8 +1,9 @@
 
-import React, { useState } from 'react';
-import { User, MCQResult, PerformanceTag, SystemSettings } from '../types';
+import React, { useState, useEffect } from 'react';
+import { User, MCQResult, PerformanceTag, SystemSettings, AnalysisSummary } from '../types';
 import { BarChart, Clock, Calendar, BookOpen, TrendingUp, AlertTriangle, CheckCircle, XCircle, FileText, BrainCircuit } from 'lucide-react';
 import { MarksheetCard } from './MarksheetCard';
+import { getAnalysisSummary } from '../firebase';
 
 interface Props {
   user: User;
@@ -15,6 +16,12 @@ export const AnalyticsPage: React.FC<Props> = ({ user, onBack, settings, onNavig
   const [selectedResult, setSelectedResult] = useState<MCQResult | null>(null);
   const [selectedQuestions, setSelectedQuestions] = useState<any[]>([]);
   const [initialView, setInitialView] = useState<'ANALYSIS' | 'RECOMMEND' | undefined>(undefined);
+  const [platformSummary, setPlatformSummary] = useState<AnalysisSummary | null>(null);
+
+  // Platform-wide benchmark: 7 precomputed daily aggregate docs
+  useEffect(() => {
+      getAnalysisSummary('DAILY', 7).then(setPlatformSummary);
+  }, []);
 
   const historyRaw = user.mcqHistory || [];
   
@@ -57,6 +64,18 @@ export const AnalyticsPage: React.FC<Props> = ({ user, onBack, settings, onNavig
   const totalTime = history.reduce((acc, curr) => acc + curr.totalTimeSeconds, 0);
   const avgTimePerQ = totalQuestions > 0 ? (totalTime / totalQuestions).toFixed(1) : '0';
 
+  // Per-subject average for comparison with the platform
+  const subjectScores: Record<string, { sum: number, count: number }> = {};
+  history.forEach(h => {
+      if (!h.subjectName || h.totalQuestions <= 0) return;
+      if (!subjectScores[h.subjectName]) subjectScores[h.subjectName] = { sum: 0, count: 0 };
+      subjectScores[h.subjectName].sum += (h.correctCount / h.totalQuestions) * 100;
+      subjectScores[h.subjectName].count++;
+  });
+  const subjectComparison = (platformSummary?.subjects || [])
+      .filter(s => subjectScores[s.name])
+      .map(s => ({ name: s.name, platform: s.avgScore, mine: Math.round(subjectScores[s.name].sum / subjectScores[s.name].count) }));
+
   // Topic Analysis
   const topicStats: Record<string, { total: number, correct: number }> = user.topicStrength || {};
 
@@ -131,6 +150,31 @@ export const AnalyticsPage: React.FC<Props> = ({ user, onBack, settings, onNavig
                 </div>
             </div>
 
+            {/* YOU VS PLATFORM (Precomputed aggregates) */}
+            {platformSummary && platformSummary.totalAttempts > 0 && (
+                <div className="bg-white p-5 rounded-2xl border border-slate-200 shadow-sm">
+                    <h3 className="font-bold text-slate-800 mb-1 flex items-center gap-2">
+                        <BarChart size={18} className="text-indigo-500" /> You vs All Students
+                    </h3>
+                    <p className="text-[10px] text-slate-400 font-bold uppercase mb-4">
+                        Last 7 Days • {platformSummary.totalAttempts} Analyses • Avg {platformSummary.avgScore}%
+                    </p>
+                    {subjectComparison.length === 0 ? (
+                        <p className="text-slate-400 text-[10px] italic">Take tests to compare with other students.</p>
+                    ) : (
+                        <div className="space-y-2">
+                            {subjectComparison.map(s => (
+                                <div key={s.name} className="flex justify-between items-center bg-slate-50 p-2 rounded-lg border border-slate-100">
+                                    <span className="text-[11px] font-bold text-slate-700 truncate flex-1 mr-2">{s.name}</span>
+                                    <span className={`text-[10px] font-black mr-2 ${s.mine >= s.platform ? 'text-green-600' : 'text-red-600'}`}>You {s.mine}%</span>
+                                    <span className="text-[10px] font-bold text-slate-400">Avg {s.platform}%</span>
+                                </div>
+                            ))}
+                        </div>
+                    )}
+                </div>
+            )}
+
             {/* PERFORMANCE TREND (Professional Progress Bars) */}
             <div className="bg-white p-5 rounded-2xl border border-slate-200 shadow-sm">
                 <h3 className="font-bold text-slate-800 mb-4 flex items-center gap-2">
@@ -37,11 +37,8 @@ export const AudioPlaylistView: React.FC<Props> = ({
       const streamKey = (classLevel === '11' || classLevel === '12') && stream ? `-${stream}` : '';
       const key = `nst_content_${board}_${classLevel}${streamKey}_${subject.name}_${chapter.id}`;
       
-      let data = await getChapterData(key);
-      if (!data) {
-          const stored = localStorage.getItem(key);
-          if (stored) data = JSON.parse(stored);
-      }
+      // Playlists live in the meta record (falls back to the offline cache itself)
+      const data = await getChapterData(key, []);
       
       if (data) {
           // STRICT MODE SEPARATION
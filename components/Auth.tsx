@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { User, Board, ClassLevel, Stream, SystemSettings, RecoveryRequest } from '../types';
 import { ADMIN_EMAIL } from '../constants';
 import { saveUserToLive, auth, getUserByEmail, rtdb, getUserData } from '../firebase';
+import { getCachedSettings } from '../utils/settingsStore';
 import { ref, set } from "firebase/database";
 import { createUserWithEmailAndPassword, signInWithEmailAndPassword, setPersistence, browserLocalPersistence, signInAnonymously } from 'firebase/auth';
 import { UserPlus, LogIn, Lock, User as UserIcon, Phone, Mail, ShieldCheck, ArrowRight, School, GraduationCap, Layers, KeyRound, Copy, Check, AlertTriangle, XCircle, MessageCircle, Send, RefreshCcw, ShieldAlert, HelpCircle } from 'lucide-react';
@@ -55,8 +56,8 @@ export const Auth: React.FC<Props> = ({ onLogin, logActivity }) => {
   const [timeLeft, setTimeLeft] = useState<number>(0);
 
   useEffect(() => {
-      const s = localStorage.getItem('nst_system_settings');
-      if (s) setSettings(JSON.parse(s));
+      const s = getCachedSettings();
+      if (s) setSettings(s as SystemSettings);
   }, []);
 
   // Timer Effect
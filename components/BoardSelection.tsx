@@ -2,6 +2,7 @@
 import React from 'react';
 import { Board, SystemSettings } from '../types';
 import { Landmark, Building2, ArrowLeft, Briefcase, GraduationCap, BookOpen } from 'lucide-react';
+import { getCachedSettings } from '../utils/settingsStore';
 
 interface Props {
   onSelect: (board: Board) => void;
@@ -12,9 +13,8 @@ export const BoardSelection: React.FC<Props> = ({ onSelect, onBack }) => {
   const [allowedBoards, setAllowedBoards] = React.useState<Board[]>(['CBSE', 'BSEB', 'COMPETITION']);
 
   React.useEffect(() => {
-      const s = localStorage.getItem('nst_system_settings');
-      if (s) {
-          const settings = JSON.parse(s) as SystemSettings;
+      const settings = getCachedSettings();
+      if (settings) {
           if (settings.allowedBoards && settings.allowedBoards.length > 0) {
               setAllowedBoards(settings.allowedBoards);
           }
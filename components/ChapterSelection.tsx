@@ -2,6 +2,7 @@ import React from 'react';
 import { Chapter, Subject, ClassLevel, User, SystemSettings } from '../types';
 import { BookOpen, ChevronRight, Lock, CheckCircle, PlayCircle, Clock, AlertCircle } from 'lucide-react';
 import { getChapterData } from '../firebase';
+import { getCachedSettings } from '../utils/settingsStore';
 
 interface Props {
   chapters: Chapter[];
@@ -30,10 +31,7 @@ export const ChapterSelection: React.FC<Props> = ({
   // Or better, let's just read from localStorage here as a fallback since App.tsx might not be passing it down yet
   let settings: SystemSettings | null = propSettings || null;
   if (!settings) {
-      try {
-          const s = localStorage.getItem('nst_system_settings');
-          if (s) settings = JSON.parse(s);
-      } catch(e){}
+      settings = getCachedSettings() as SystemSettings | null;
   }
 
   // Default to SEQUENTIAL if not set, or respect the toggle (enableMcqUnlockRestriction is legacy but we keep it sync)
@@ -55,14 +53,8 @@ export const ChapterSelection: React.FC<Props> = ({
           await Promise.all(chapters.map(async (ch) => {
               const streamKey = (classLevel === '11' || classLevel === '12') && user.stream ? `-${user.stream}` : '';
               const key = `nst_content_${user.board || 'CBSE'}_${classLevel}${streamKey}_${subject.name}_${ch.id}`;
-              let data = await getChapterData(key);
-              // Fallback to local storage
-              if (!data) {
-                  try {
-                      const local = localStorage.getItem(key);
-                      if (local) data = JSON.parse(local);
-                  } catch(e){}
-              }
+              // Links/playlists are meta; MCQs are needed for the count check (falls back to the offline cache itself)
+              const data = await getChapterData(key, ['mcq']);
 
               if (data && (
                   (data.videoPlaylist && data.videoPlaylist.length > 0) || 
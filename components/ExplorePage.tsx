@@ -3,7 +3,7 @@ import { User, SystemSettings, WeeklyTest, Challenge20, StudentTab } from '../ty
 import { BannerCarousel } from './BannerCarousel';
 import { Sparkles, BrainCircuit, Rocket, Zap, ArrowRight, Crown, Headphones, FileText, CheckCircle, Video as VideoIcon, MessageCircle, Lock, Layout, Star } from 'lucide-react';
 import { SpeakButton } from './SpeakButton';
-import { generateMorningInsight } from '../services/morningInsight';
+import { getTodaysInsight } from '../services/morningInsight';
 import { getActiveChallenges } from '../services/questionBank';
 
 interface Props {
@@ -57,39 +57,12 @@ export const ExplorePage: React.FC<Props> = ({ user, settings, onTabChange, onSt
         return () => clearInterval(interval);
     }, [settings?.specialDiscountEvent]);
 
-    // --- MORNING INSIGHT ---
+    // --- MORNING INSIGHT (published once a day by the admin client into settings) ---
     useEffect(() => {
-        const loadMorningInsight = async () => {
-            const now = new Date();
-            // Check Setting (Default: TRUE)
-            if (settings?.showMorningInsight !== false && now.getHours() >= 6) {
-                const today = now.toDateString();
-                const savedBanner = localStorage.getItem('nst_morning_banner');
-                if (savedBanner) {
-                    const parsed = JSON.parse(savedBanner);
-                    if (parsed.date === today) {
-                        setMorningBanner(parsed);
-                        return;
-                    }
-                }
-                const isGen = localStorage.getItem(`nst_insight_gen_${today}`);
-                if (!isGen) {
-                     const logs = JSON.parse(localStorage.getItem('nst_universal_analysis_logs') || '[]');
-                     if (logs.length > 0) {
-                         try {
-                             await generateMorningInsight(logs, settings, (banner) => {
-                                 localStorage.setItem('nst_morning_banner', JSON.stringify(banner));
-                                 setMorningBanner(banner);
-                             });
-                         } catch(e) {}
-                     }
-                }
-            } else {
-                setMorningBanner(null);
-            }
-        };
-        loadMorningInsight();
-    }, [settings]);
+        // Check Setting (Default: TRUE)
+        const visible = settings?.showMorningInsight !== false && new Date().getHours() >= 6;
+        setMorningBanner(visible ? getTodaysInsight(settings) : null);
+    }, [settings?.showMorningInsight, settings?.morningInsight]);
 
     // --- BANNER RENDERING HELPERS ---
     const renderSimpleBanner = (
@@ -1,16 +1,31 @@
-
 import React, { useState, useEffect } from 'react';
-import { LeaderboardEntry, User, SystemSettings } from '../types';
+import { LeaderboardEntry, LeaderboardAggregate, LeaderboardMember, LeaderboardPeriod, User, SystemSettings } from '../types';
 import { Trophy, Medal } from 'lucide-react';
+import { subscribeToLeaderboard, getLeaderboardMember } from '../firebase';
+import { getRankBucket } from '../utils/leaderboard';
 
 interface Props {
   user: User;
   settings?: SystemSettings;
 }
 
+const PERIOD_LABELS: Record<LeaderboardPeriod, string> = {
+    DAILY: 'Today',
+    WEEKLY: 'This Week',
+    MONTHLY: 'This Month',
+    ALL_TIME: 'All Time'
+};
+
 export const Leaderboard: React.FC<Props> = ({ user, settings }) => {
-    const [entries, setEntries] = useState<LeaderboardEntry[]>([]);
+    const [period, setPeriod] = useState<LeaderboardPeriod>('WEEKLY');
+    const [aggregate, setAggregate] = useState<LeaderboardAggregate | null>(null);
+    const [member, setMember] = useState<LeaderboardMember | null>(null);
+    const [localEntries, setLocalEntries] = useState<LeaderboardEntry[]>([]);
 
+    const board = user.board || 'CBSE';
+    const classLevel = user.classLevel || '10';
+
+    // Offline fallback: legacy local leaderboard
     useEffect(() => {
         const stored = localStorage.getItem('nst_leaderboard');
         if (stored) {
@@ -19,7 +34,7 @@ export const Leaderboard: React.FC<Props> = ({ user, settings }) => {
                 if (Array.isArray(data)) {
                     // Sort by Score DESC, then Date DESC
                     const sorted = data.sort((a, b) => b.score - a.score || new Date(b.date).getTime() - new Date(a.date).getTime());
-                    setEntries(sorted);
+                    setLocalEntries(sorted);
                 }
             } catch (e) {
                 console.error("Failed to load leaderboard", e);
@@ -29,11 +44,53 @@ export const Leaderboard: React.FC<Props> = ({ user, settings }) => {
         }
     }, []);
 
+    // One small pre-aggregated doc per board/class/period (already sorted top-K)
+    useEffect(() => {
+        setAggregate(null);
+        setMember(null);
+        const unsubscribe = subscribeToLeaderboard(board, classLevel, period, setAggregate);
+        getLeaderboardMember(board, classLevel, period, user.id).then(setMember);
+        return () => unsubscribe();
+    }, [board, classLevel, period, user.id]);
+
+    // Own member doc is read once per period; if the user is in the top-K the
+    // live aggregate already carries their latest best score
+    const ownTopEntry = aggregate?.top.find(e => e.userId === user.id);
+    const ownMember: LeaderboardMember | null = ownTopEntry
+        ? { userId: user.id, best: ownTopEntry.score, bucket: member?.bucket ?? 0, date: ownTopEntry.date }
+        : member;
+
+    const entries = aggregate ? aggregate.top : localEntries;
+    const rank = aggregate ? getRankBucket(aggregate, ownMember) : null;
+
     return (
         <div className="animate-in fade-in slide-in-from-bottom-4">
             <h3 className="text-2xl font-black text-slate-800 mb-6 flex items-center gap-3">
                 <Trophy className="text-yellow-500" /> Challenge Leaderboard
             </h3>
+
+            <div className="flex gap-2 mb-4 overflow-x-auto">
+                {(Object.keys(PERIOD_LABELS) as LeaderboardPeriod[]).map(p => (
+                    <button
+                        key={p}
+                        onClick={() => setPeriod(p)}
+                        className={`px-3 py-1.5 rounded-lg text-xs font-bold whitespace-nowrap ${period === p ? 'bg-slate-800 text-white' : 'bg-white text-slate-600 border border-slate-200'}`}
+                    >
+                        {PERIOD_LABELS[p]}
+                    </button>
+                ))}
+            </div>
+
+            {rank && (
+                <div className="bg-blue-50 border border-blue-100 rounded-xl p-3 mb-4 flex items-center justify-between">
+                    <p className="text-sm font-bold text-blue-800">
+                        Your Rank: #{rank.from}{rank.to > rank.from ? `–${rank.to}` : ''}
+                    </p>
+                    <p className="text-xs font-bold text-blue-600">
+                        Top {rank.percentile}% of {aggregate!.participants} • Best {ownMember!.best}%
+                    </p>
+                </div>
+            )}
             
             <div className="bg-white rounded-2xl shadow-sm border border-slate-200 overflow-hidden">
                 <div className="overflow-x-auto">
@@ -65,7 +122,7 @@ export const Leaderboard: React.FC<Props> = ({ user, settings }) => {
                                         {entry.userName}
                                     </td>
                                     <td className="p-4 text-sm text-slate-500">{entry.topic}</td>
-                                    <td className="p-4 text-right font-black text-blue-600">{entry.score} pts</td>
+                                    <td className="p-4 text-right font-black text-blue-600">{entry.score}{aggregate ? '%' : ' pts'}</td>
                                 </tr>
                             ))}
                         </tbody>
@@ -388,7 +388,8 @@ export const MarksheetCard: React.FC<Props> = ({ result, user, settings, onClose
               totalQuestions: result.totalQuestions,
               userPrompt: `Analysis for ${result.totalQuestions} Questions. Score: ${result.score}`, 
               aiResponse: analysisText,
-              cost: skipCost ? 0 : cost
+              cost: skipCost ? 0 : cost,
+              topic: result.topic
           });
           
           await saveAiInteraction({
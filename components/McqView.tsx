@@ -4,6 +4,7 @@ import { Chapter, User, Subject, SystemSettings, MCQResult, PerformanceTag } fro
 import { CheckCircle, Lock, ArrowLeft, Crown, PlayCircle, HelpCircle, Trophy, Clock, BrainCircuit, FileText } from 'lucide-react';
 import { CustomAlert, CustomConfirm } from './CustomDialogs';
 import { getChapterData, saveUserToLive, saveUserHistory, savePublicActivity } from '../firebase';
+import { loadContent } from '../utils/contentStore';
 import { generateLocalAnalysis } from '../utils/analysisUtils';
 import { LessonView } from './LessonView'; 
 import { MarksheetCard } from './MarksheetCard';
@@ -60,14 +61,14 @@ export const McqView: React.FC<Props> = ({
                   new Promise((_, reject) => setTimeout(() => reject("timeout"), ms))
               ]);
           
-          data = await fetchWithTimeout(getChapterData(key), 2500);
+          data = await fetchWithTimeout(getChapterData(key, ['mcq', 'translations']), 2500);
       } catch (e) {
           console.warn("Firebase fetch timed out or failed, falling back to local storage.");
       }
 
       if (!data) {
-          const stored = localStorage.getItem(key);
-          if (stored) data = JSON.parse(stored);
+          // Offline cache: only the MCQ sections are read, never the notes HTML
+          data = await loadContent(key, ['mcq', 'translations']);
       }
 
       // Handle Empty Content
@@ -413,19 +414,8 @@ export const McqView: React.FC<Props> = ({
       history.push(newHistoryItem);
       localStorage.setItem('nst_user_history', JSON.stringify(history));
 
-      // Sync to Firebase (with Offline Fallback)
-      try {
-          if (navigator.onLine) {
-              saveUserHistory(user.id, newHistoryItem);
-          } else {
-              throw new Error("Offline");
-          }
-      } catch (e) {
-          console.log("Offline or Error saving history. Queuing for sync.");
-          const pending = JSON.parse(localStorage.getItem('nst_pending_sync_results') || '[]');
-          pending.push({ userId: user.id, data: newHistoryItem, type: 'HISTORY' });
-          localStorage.setItem('nst_pending_sync_results', JSON.stringify(pending));
-      }
+      // Sync to Firebase (queued and replayed on reconnect when offline)
+      saveUserHistory(user.id, newHistoryItem);
 
       if (leveledUp) {
           setAlertConfig({isOpen: true, title: "Level Up!", message: `🎉 Congratulations! You cleared ${threshold} MCQs.\n\n🔓 Next Chapter Unlocked!`});
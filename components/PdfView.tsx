@@ -158,11 +158,8 @@ export const PdfView: React.FC<Props> = ({
         const streamKey = (classLevel === '11' || classLevel === '12') && stream ? `-${stream}` : '';
         const key = `nst_content_${board}_${classLevel}${streamKey}_${subject.name}_${chapter.id}`;
         
-        let data = await getChapterData(key);
-        if (!data) {
-            const stored = localStorage.getItem(key);
-            if (stored) data = JSON.parse(stored);
-        }
+        // Falls back to the offline cache itself; MCQ sections aren't needed here
+        const data = await getChapterData(key, ['notes', 'translations']);
         setContentData(data || {});
       } catch (error) {
         console.error("Error loading PDF data:", error);
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { User, SystemSettings, MCQItem } from '../types';
 import { X, BookOpen, Zap, CheckCircle, AlertCircle, ChevronRight, Check, RotateCcw, Loader2 } from 'lucide-react';
 import { getChapterData, saveUserToLive } from '../firebase';
-import { storage } from '../utils/storage';
+import { loadContent as loadCachedContent, listContentKeys } from '../utils/contentStore';
 
 interface Props {
     user: User;
@@ -40,15 +40,15 @@ export const RevisionSession: React.FC<Props> = ({ user, settings, chapterId, su
 
                 // 1. Try Strict Key
                 const strictKey = `nst_content_${board}_${classLevel}${streamKey}_${subject}_${chapterId}`;
-                data = await storage.getItem(strictKey);
+                data = await loadCachedContent(strictKey);
 
                 // 2. If Failed, Search by Chapter ID (Robust Search)
                 if (!data) {
                     try {
-                        const allKeys = await storage.keys();
+                        const allKeys = await listContentKeys();
                         const matchKey = allKeys.find(k => k.includes(chapterId) && k.startsWith('nst_content_'));
                         if (matchKey) {
-                            data = await storage.getItem(matchKey);
+                            data = await loadCachedContent(matchKey);
                         }
                     } catch(e) { console.warn("Storage Scan failed", e); }
                 }
@@ -2,6 +2,7 @@
 import React from 'react';
 import { Stream, SystemSettings } from '../types';
 import { FlaskConical, TrendingUp, Palette } from 'lucide-react';
+import { getCachedSettings } from '../utils/settingsStore';
 
 interface Props {
   onSelect: (stream: Stream) => void;
@@ -12,9 +13,8 @@ export const StreamSelection: React.FC<Props> = ({ onSelect, onBack }) => {
   const [allowedStreams, setAllowedStreams] = React.useState<Stream[]>(['Science', 'Commerce', 'Arts']);
 
   React.useEffect(() => {
-      const s = localStorage.getItem('nst_system_settings');
-      if (s) {
-          const settings = JSON.parse(s) as SystemSettings;
+      const settings = getCachedSettings();
+      if (settings) {
           if (settings.allowedStreams && settings.allowedStreams.length > 0) {
               setAllowedStreams(settings.allowedStreams);
           }
@@ -2,12 +2,13 @@
 import React, { useState, useEffect } from 'react';
 import { User, Subject, StudentTab, SystemSettings, CreditPackage, WeeklyTest, Chapter, MCQItem, Challenge20 } from '../types';
 import { updateUserStatus, db, saveUserToLive, getChapterData, rtdb, saveAiInteraction, saveDemandRequest } from '../firebase';
+import { persistSettings, flushSettings } from '../utils/settingsStore';
 import { doc, onSnapshot } from 'firebase/firestore';
 import { ref, query, limitToLast, onValue } from 'firebase/database';
 import { getSubjectsList, DEFAULT_APP_FEATURES, ALL_APP_FEATURES } from '../constants';
 import { getActiveChallenges } from '../services/questionBank';
 import { generateDailyChallengeQuestions } from '../utils/challengeGenerator';
-import { generateMorningInsight } from '../services/morningInsight';
+import { getTodaysInsight } from '../services/morningInsight';
 import { RedeemSection } from './RedeemSection';
 import { PrizeList } from './PrizeList';
 import { Store } from './Store';
@@ -278,62 +279,11 @@ export const StudentDashboard: React.FC<Props> = ({ user, dailyStudySeconds, onS
   const [showDiscountBanner, setShowDiscountBanner] = useState(false);
   const [morningBanner, setMorningBanner] = useState<any>(null); // NEW: Morning Banner
 
-  // --- MORNING INSIGHT LOADER & AUTO-GENERATOR ---
+  // --- MORNING INSIGHT (published once a day by the admin client into settings) ---
   useEffect(() => {
-      const loadMorningInsight = async () => {
-          const now = new Date();
-          // Check if time is past 10 AM (Hour 10)
-          if (now.getHours() >= 10) {
-              const today = now.toDateString();
-              const savedBanner = localStorage.getItem('nst_morning_banner');
-              
-              if (savedBanner) {
-                  const parsed = JSON.parse(savedBanner);
-                  if (parsed.date === today) {
-                      setMorningBanner(parsed);
-                      return;
-                  }
-              }
-
-              // IF MISSING: Auto-Generate (Client-side automation)
-              // We allow any user to trigger this to ensure it happens
-              // Logic: Fetch logs -> Generate -> Save -> Display
-              // We check a 'generating' flag to prevent double hits
-              const isGen = localStorage.getItem(`nst_insight_gen_${today}`);
-              if (!isGen) {
-                  localStorage.setItem(`nst_insight_gen_${today}`, 'true'); // Lock
-                  try {
-                      console.log("Generating Morning Insight...");
-                      // Mock Logs if Universal Logs unavailable locally
-                      const logs = JSON.parse(localStorage.getItem('nst_universal_analysis_logs') || '[]');
-                      
-                      if (logs.length === 0) {
-                          // Skip generation if no data
-                          console.log("No logs for insight.");
-                          return;
-                      }
-
-                      await generateMorningInsight(
-                          logs, 
-                          settings, 
-                          (banner) => {
-                              localStorage.setItem('nst_morning_banner', JSON.stringify(banner));
-                              setMorningBanner(banner);
-                              // Sync to Firebase if Admin
-                              if (user.role === 'ADMIN') {
-                                  // Implementation details for firebase sync omitted for safety
-                              }
-                          }
-                      );
-                  } catch (e) {
-                      console.error("Insight Gen Failed", e);
-                      localStorage.removeItem(`nst_insight_gen_${today}`); // Unlock
-                  }
-              }
-          }
-      };
-      loadMorningInsight();
-  }, [user.role, settings]);
+      // Shown from 10 AM
+      setMorningBanner(new Date().getHours() >= 10 ? getTodaysInsight(settings) : null);
+  }, [settings?.morningInsight]);
 
   useEffect(() => {
      const evt = settings?.specialDiscountEvent;
@@ -483,7 +433,8 @@ export const StudentDashboard: React.FC<Props> = ({ user, dailyStudySeconds, onS
       // But StudentDashboard props doesn't have onUpdateSettings. 
       // We will write to localStorage directly as a quick fix for Admin convenience, ensuring AdminDashboard picks it up or we reload.
       const newSettings = { ...settings, dashboardLayout: newLayout };
-      localStorage.setItem('nst_system_settings', JSON.stringify(newSettings));
+      persistSettings(newSettings);
+      flushSettings(); // Reload below must see it
       
       // Also update Firebase if connected (best effort)
       saveUserToLive(user); // This saves USER, not settings. 
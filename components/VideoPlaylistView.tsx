@@ -92,11 +92,8 @@ export const VideoPlaylistView: React.FC<Props> = ({
           key = `nst_content_${board}_${classLevel}${streamKey}_${subject.name}_${chapter.id}`;
       }
       
-      let data = await getChapterData(key);
-      if (!data) {
-          const stored = localStorage.getItem(key);
-          if (stored) data = JSON.parse(stored);
-      }
+      // Playlists live in the meta record (falls back to the offline cache itself)
+      const data = await getChapterData(key, []);
       
       setContentData(data); // Store for AI Image
 
@@ -1,9 +1,17 @@
 import { initializeApp } from "firebase/app";
 import { getAnalytics } from "firebase/analytics";
-import { getFirestore, doc, setDoc, getDoc, collection, updateDoc, deleteDoc, onSnapshot, getDocs, query, where, limitToLast, orderBy, increment } from "firebase/firestore";
+import { getFirestore, doc, setDoc, getDoc, collection, collectionGroup, updateDoc, deleteDoc, onSnapshot, getDocs, query, where, limitToLast, orderBy, increment, runTransaction, deleteField } from "firebase/firestore";
 import { getDatabase, ref, set, get, onValue, update, remove, query as rtdbQuery, limitToLast as rtdbLimitToLast, orderByChild as rtdbOrderByChild } from "firebase/database";
 import { getAuth, onAuthStateChanged } from "firebase/auth";
 import { storage } from "./utils/storage";
+import { startSpan, approxBytes } from "./utils/perf";
+import { ContentSection, saveContent, loadContent, pickSections, clearContent } from "./utils/contentStore";
+import { LEADERBOARD_PERIODS, applyAttempt, createEmptyAggregate, getLeaderboardId, getLeaderboardShard, getLeaderboardShardId, mergeShards } from "./utils/leaderboard";
+import { SETTINGS_SECTIONS, splitSettings, hashSection, getSectionForKey, getCachedSettings, persistSettings, getAppliedSectionHashes, setAppliedSectionHashes } from "./utils/settingsStore";
+import { hashValue } from "./utils/hash";
+import { queueWrite, replayPendingWrites } from "./utils/syncQueue";
+import { AnalysisWindow, buildAggregateIncrements, getAnalysisShardId, getRecentWindowKeys, summarizeAggregates } from "./utils/analysisAggregates";
+import { AnalysisAggregateDoc, AnalysisSummary, LeaderboardAggregate, LeaderboardEntry, LeaderboardMember, LeaderboardPeriod } from "./types";
 
 // --- FIREBASE CONFIGURATION ---
 const firebaseConfig = {
@@ -69,6 +77,7 @@ export const resetAllContent = async () => {
     try {
         localStorage.clear(); // Clear standard local storage (Session, Settings, Cache)
         await storage.clear(); // Clear IndexedDB/LocalForage (Heavy Content)
+        await clearContent(); // Sectioned chapter cache
         console.log("✅ Local Data Cleared Successfully");
     } catch (localErr) {
         console.error("Local Clear Error (Non-Fatal):", localErr);
@@ -86,13 +95,16 @@ export const resetAllContent = async () => {
 
     // 3. Firestore Wipes (Iterative delete)
     try {
-        const collections = ['content_data', 'custom_syllabus', 'public_activity', 'ai_interactions', 'universal_analysis_logs'];
+        const collections = ['content_data', 'custom_syllabus', 'public_activity', 'live_results', 'ai_interactions', 'universal_analysis_logs', 'analytics_aggregates', 'leaderboards'];
         for (const colName of collections) {
           const q = query(collection(db, colName));
           const snapshot = await getDocs(q);
           const deletePromises = snapshot.docs.map(doc => deleteDoc(doc.ref));
           await Promise.all(deletePromises);
         }
+        // Deleting a leaderboard doc leaves its members subcollection behind
+        const members = await getDocs(collectionGroup(db, "members"));
+        await Promise.all(members.docs.map(doc => deleteDoc(doc.ref)));
         console.log("✅ Firestore Cleared Successfully");
     } catch (e: any) {
         console.error("Firestore Reset Error:", e);
@@ -116,8 +128,12 @@ export const resetAllContent = async () => {
 
 // 1. User Data Sync
 export const saveUserToLive = async (user: any) => {
+  const span = startSpan('saveUserToLive');
   try {
-    if (!user || !user.id) return;
+    if (!user || !user.id) {
+      span.end({ skipped: true });
+      return;
+    }
     
     // Sanitize data before saving
     const sanitizedUser = sanitizeForFirestore(user);
@@ -126,14 +142,16 @@ export const saveUserToLive = async (user: any) => {
     const promises = [];
     
     // 1. RTDB
-    promises.push(set(ref(rtdb, `users/${user.id}`), sanitizedUser).catch(e => console.error("RTDB Save Error:", e)));
+    promises.push(set(ref(rtdb, `users/${user.id}`), sanitizedUser).catch(e => { span.set({ rtdbError: true }); console.error("RTDB Save Error:", e); }));
     
     // 2. Firestore
-    promises.push(setDoc(doc(db, "users", user.id), sanitizedUser).catch(e => console.error("Firestore Save Error:", e)));
+    promises.push(setDoc(doc(db, "users", user.id), sanitizedUser).catch(e => { span.set({ firestoreError: true }); console.error("Firestore Save Error:", e); }));
 
     await Promise.all(promises);
+    span.end(() => ({ bytes: approxBytes(sanitizedUser) }));
   } catch (error) {
     console.error("Error saving user:", error);
+    span.end({ error: true });
   }
 };
 
@@ -197,28 +215,144 @@ export const getSystemSettings = async () => {
     }
 };
 
+// Writes only the sections (and within them only the keys) that changed since
+// the last save, then bumps their hashes in config/settings_manifest.
+const saveSettingsSections = async (settings: Record<string, any>) => {
+    const manifestRef = doc(db, "config", "settings_manifest");
+    const manifestSnap = await getDoc(manifestRef);
+    const previous = manifestSnap.exists() ? (manifestSnap.data().sections || {}) : {};
+    const sections = splitSettings(settings);
+    const updatedAt = new Date().toISOString();
+    const manifestUpdate: Record<string, any> = {};
+
+    await Promise.all(SETTINGS_SECTIONS.map(async (section) => {
+        const data = sections[section];
+        const { hash, keys } = hashSection(data);
+        const prev = previous[section];
+        if (prev && prev.hash === hash) return;
+
+        const prevKeys: Record<string, string> = prev?.keys || {};
+        const patch: Record<string, any> = {};
+        Object.keys(keys).forEach(k => { if (prevKeys[k] !== keys[k]) patch[k] = data[k]; });
+        Object.keys(prevKeys).forEach(k => { if (!(k in keys)) patch[k] = deleteField(); });
+
+        // mergeFields, not merge: a changed map-valued key must replace the old map, not deep-merge into it
+        await setDoc(doc(db, "settings_sections", section), patch, { mergeFields: Object.keys(patch) });
+        manifestUpdate[section] = { hash, keys, version: (prev?.version || 0) + 1, updatedAt };
+    }));
+
+    const changed = Object.keys(manifestUpdate);
+    if (changed.length > 0) {
+        await setDoc(manifestRef, { sections: manifestUpdate }, { mergeFields: changed.map(s => `sections.${s}`) });
+    }
+};
+
 export const saveSystemSettings = async (settings: any) => {
   try {
     const sanitizedSettings = sanitizeForFirestore(settings);
+    // Legacy full copies (older app builds and getSystemSettings read these)
     await set(ref(rtdb, 'system_settings'), sanitizedSettings);
     await setDoc(doc(db, "config", "system_settings"), sanitizedSettings);
+    await saveSettingsSections(sanitizedSettings);
   } catch (error) {
     console.error("Error saving settings:", error);
   }
 };
 
+// Writes just the given top-level keys, leaving the rest of the settings as the
+// server has them (no full-object overwrite from a possibly stale local copy).
+export const patchSystemSettings = async (patch: Record<string, any>) => {
+  try {
+    const sanitized = sanitizeForFirestore(patch);
+    const keys = Object.keys(sanitized);
+    if (keys.length === 0) return;
+    await update(ref(rtdb, 'system_settings'), sanitized);
+    await setDoc(doc(db, "config", "system_settings"), sanitized, { mergeFields: keys });
+
+    const manifestRef = doc(db, "config", "settings_manifest");
+    await runTransaction(db, async (tx) => {
+        const manifestSnap = await tx.get(manifestRef);
+        const updatedAt = new Date().toISOString();
+
+        if (!manifestSnap.exists()) {
+            // Not migrated yet: seed every section from the legacy doc, otherwise the
+            // new manifest would list only the patched section and clients would stop
+            // reading the legacy copy (and miss the rest of the settings)
+            const legacySnap = await tx.get(doc(db, "config", "system_settings"));
+            const sections = splitSettings({ ...(legacySnap.exists() ? legacySnap.data() : {}), ...sanitized });
+            const seeded: Record<string, any> = {};
+            SETTINGS_SECTIONS.forEach(section => {
+                const { hash, keys } = hashSection(sections[section]);
+                tx.set(doc(db, "settings_sections", section), sections[section]);
+                seeded[section] = { hash, keys, version: 1, updatedAt };
+            });
+            tx.set(manifestRef, { sections: seeded });
+            return;
+        }
+
+        const previous = manifestSnap.data().sections || {};
+        const sections = splitSettings(sanitized);
+        const manifestUpdate: Record<string, any> = {};
+
+        SETTINGS_SECTIONS.forEach(section => {
+            const data = sections[section];
+            if (Object.keys(data).length === 0) return;
+            const prev = previous[section];
+            // Section hash is derived from the per-key hashes, so only the patched keys need hashing
+            const sectionKeys = { ...(prev?.keys || {}), ...hashSection(data).keys };
+            tx.set(doc(db, "settings_sections", section), data, { mergeFields: Object.keys(data) });
+            manifestUpdate[section] = { hash: hashValue(sectionKeys), keys: sectionKeys, version: (prev?.version || 0) + 1, updatedAt };
+        });
+
+        const changed = Object.keys(manifestUpdate);
+        if (changed.length > 0) {
+            tx.set(manifestRef, { sections: manifestUpdate }, { mergeFields: changed.map(s => `sections.${s}`) });
+        }
+    });
+  } catch (error) {
+    console.error("Error patching settings:", error);
+  }
+};
+
 export const subscribeToSettings = (callback: (settings: any) => void) => {
-  // Listen to Firestore
-  return onSnapshot(doc(db, "config", "system_settings"), (docSnap) => {
-      if (docSnap.exists()) {
-          callback(docSnap.data());
-      } else {
-          // Fallback RTDB
-           onValue(ref(rtdb, 'system_settings'), (snap) => {
-               const data = snap.val();
-               if (data) callback(data);
-           }, { onlyOnce: true });
+  // Listen to the small manifest; fetch only sections whose hash changed
+  let queue = Promise.resolve();
+
+  const applySnapshot = async (manifestSnap: any) => {
+      if (!manifestSnap.exists()) {
+          // Not migrated yet: one-time read of the legacy single doc (no extra listener)
+          const legacy = await getSystemSettings();
+          if (legacy) {
+              persistSettings({ ...(getCachedSettings() || {}), ...legacy });
+              callback(legacy);
+          }
+          return;
       }
+
+      const manifest = manifestSnap.data().sections || {};
+      const applied = getAppliedSectionHashes();
+      const changed = Object.keys(manifest).filter(section => applied[section] !== manifest[section].hash);
+      if (changed.length === 0) return; // Nothing new for this client
+
+      const snaps = await Promise.all(changed.map(section => getDoc(doc(db, "settings_sections", section))));
+      const merged: Record<string, any> = { ...(getCachedSettings() || {}) };
+      changed.forEach((section, i) => {
+          const liveKeys = manifest[section].keys || {};
+          // Drop keys the admin removed from this section
+          Object.keys(merged).forEach(k => {
+              if (getSectionForKey(k) === section && !(k in liveKeys)) delete merged[k];
+          });
+          if (snaps[i].exists()) Object.assign(merged, snaps[i].data());
+          applied[section] = manifest[section].hash;
+      });
+
+      persistSettings(merged);
+      setAppliedSectionHashes(applied);
+      callback(merged);
+  };
+
+  return onSnapshot(doc(db, "config", "settings_manifest"), (manifestSnap) => {
+      queue = queue.then(() => applySnapshot(manifestSnap)).catch(e => console.error("Settings sync error:", e));
   });
 };
 
@@ -246,7 +380,7 @@ export const saveChapterData = async (key: string, data: any) => {
   try {
     const sanitizedData = sanitizeForFirestore(data);
     // Cache locally first for speed
-    await storage.setItem(key, sanitizedData);
+    await saveContent(key, sanitizedData);
     
     await set(ref(rtdb, `content_data/${key}`), sanitizedData);
     await setDoc(doc(db, "content_data", key), sanitizedData);
@@ -255,33 +389,44 @@ export const saveChapterData = async (key: string, data: any) => {
   }
 };
 
-export const getChapterData = async (key: string) => {
+/**
+ * Reads a chapter (Firestore, then RTDB, then the offline cache). Pass `sections`
+ * to get only meta + those sections back, e.g. ['mcq'] for the MCQ tab. The
+ * network paths still download the whole chapter doc; `sections` limits what is
+ * returned and, on the offline path, what is read and decompressed.
+ */
+export const getChapterData = async (key: string, sections: ContentSection[] | 'all' = 'all') => {
+    const span = startSpan('getChapterData');
     try {
         // 1. Try Firestore First (More Authoritative)
         const docSnap = await getDoc(doc(db, "content_data", key));
         if (docSnap.exists()) {
             const data = docSnap.data();
-            // Cache in storage for offline/speed
-            await storage.setItem(key, data);
-            return data;
+            // Cache for offline in the background (unchanged sections are skipped); don't hold up the caller
+            saveContent(key, data);
+            span.end(() => ({ source: 'firestore', bytes: approxBytes(data) }));
+            return pickSections(data, sections);
         }
 
         // 2. Try RTDB
         const snapshot = await get(ref(rtdb, `content_data/${key}`));
         if (snapshot.exists()) {
             const data = snapshot.val();
-            await storage.setItem(key, data);
-            return data;
+            saveContent(key, data);
+            span.end(() => ({ source: 'rtdb', bytes: approxBytes(data) }));
+            return pickSections(data, sections);
         }
         
         // 3. Last Resort: Storage
-        const stored = await storage.getItem(key);
+        const stored = await loadContent(key, sections);
+        span.end(() => ({ source: stored ? 'storage' : 'miss', cacheHit: !!stored, bytes: approxBytes(stored) }));
         if (stored) return stored;
         
         return null;
     } catch (error) {
         console.error("Error getting chapter data:", error);
-        const stored = await storage.getItem(key);
+        const stored = await loadContent(key, sections);
+        span.end({ error: true, source: stored ? 'storage' : 'miss', cacheHit: !!stored });
         if (stored) return stored;
         return null;
     }
@@ -321,23 +466,142 @@ export const subscribeToDrafts = (callback: (drafts: any[]) => void) => {
     });
 };
 
-export const saveTestResult = async (userId: string, attempt: any) => {
+// Context needed to fold an attempt into the board/class leaderboards
+export interface LeaderboardContext {
+    userName: string;
+    board: string;
+    classLevel: string;
+    percentage: number;
+    topic: string;
+    attemptedAt?: string; // ISO time of the attempt; picks the period docs, so a late replay lands in the right day/week
+}
+
+// Updates the DAILY/WEEKLY/MONTHLY/ALL_TIME aggregates for one attempt in a single
+// transaction: 4 shard reads + 4 member reads, regardless of total attempts. Only
+// this user's shard of each leaderboard is touched, so concurrent submits from a
+// board/class spread over LEADERBOARD_SHARDS docs instead of contending on one.
+const updateLeaderboards = async (userId: string, ctx: LeaderboardContext) => {
+    const now = ctx.attemptedAt ? new Date(ctx.attemptedAt) : new Date();
+    const entry: LeaderboardEntry = {
+        id: `${userId}_${now.getTime()}`,
+        userId,
+        userName: ctx.userName,
+        score: Math.round(ctx.percentage),
+        total: 100,
+        date: now.toISOString(),
+        topic: ctx.topic
+    };
+
+    const shard = getLeaderboardShard(userId);
+    await runTransaction(db, async (tx) => {
+        const targets = LEADERBOARD_PERIODS.map(period => {
+            const id = getLeaderboardId(ctx.board, ctx.classLevel, period, now);
+            return {
+                id,
+                period,
+                aggRef: doc(db, "leaderboards", getLeaderboardShardId(id, shard)),
+                memberRef: doc(db, "leaderboards", id, "members", userId)
+            };
+        });
+
+        // Firestore transactions require all reads before any write
+        const snaps = await Promise.all(targets.map(async t => ({
+            agg: await tx.get(t.aggRef),
+            member: await tx.get(t.memberRef)
+        })));
+
+        targets.forEach((t, i) => {
+            const current = snaps[i].agg.exists()
+                ? snaps[i].agg.data() as LeaderboardAggregate
+                : createEmptyAggregate(t.id, ctx.board, ctx.classLevel, t.period, shard);
+            const previous = snaps[i].member.exists() ? snaps[i].member.data() as LeaderboardMember : null;
+
+            const result = applyAttempt(current, previous, entry);
+            tx.set(t.aggRef, sanitizeForFirestore(result.aggregate));
+            if (result.member) tx.set(t.memberRef, result.member);
+        });
+    });
+};
+
+const writeTestResult = async (userId: string, attempt: any, docId: string, leaderboard?: LeaderboardContext) => {
+    await setDoc(doc(db, "users", userId, "test_results", docId), sanitizeForFirestore(attempt));
+
+    if (leaderboard) {
+        try {
+            await updateLeaderboards(userId, leaderboard);
+        } catch(e) { console.error("Error updating leaderboard:", e); }
+    }
+};
+
+// Offline or failed results are queued and replayed by syncPendingWrites()
+export const saveTestResult = async (userId: string, attempt: any, context?: LeaderboardContext) => {
+    const docId = `${attempt.testId}_${Date.now()}`;
+    // Stamp the attempt time now, not when a queued write is finally replayed
+    const leaderboard = context && { ...context, attemptedAt: context.attemptedAt || new Date().toISOString() };
+    if (!navigator.onLine) {
+        queueWrite({ type: 'TEST_RESULT', userId, data: attempt, docId, leaderboard });
+        return;
+    }
     try {
-        const docId = `${attempt.testId}_${Date.now()}`;
-        const sanitizedAttempt = sanitizeForFirestore(attempt);
-        await setDoc(doc(db, "users", userId, "test_results", docId), sanitizedAttempt);
-    } catch(e) { console.error(e); }
+        await writeTestResult(userId, attempt, docId, leaderboard);
+    } catch(e) {
+        console.error(e);
+        queueWrite({ type: 'TEST_RESULT', userId, data: attempt, docId, leaderboard });
+    }
+};
+
+export const subscribeToLeaderboard = (board: string, classLevel: string, period: LeaderboardPeriod, callback: (aggregate: LeaderboardAggregate | null) => void) => {
+    // All shard docs of this leaderboard carry its logical id
+    const id = getLeaderboardId(board, classLevel, period);
+    return onSnapshot(query(collection(db, "leaderboards"), where("id", "==", id)), (snapshot) => {
+        const shards = snapshot.docs
+            .map(d => d.data() as LeaderboardAggregate)
+            .filter(a => a.shard !== undefined);
+        callback(mergeShards(shards));
+    });
+};
+
+export const getLeaderboardMember = async (board: string, classLevel: string, period: LeaderboardPeriod, userId: string) => {
+    try {
+        const id = getLeaderboardId(board, classLevel, period);
+        const docSnap = await getDoc(doc(db, "leaderboards", id, "members", userId));
+        return docSnap.exists() ? docSnap.data() as LeaderboardMember : null;
+    } catch (e) { console.error("Error getting leaderboard rank:", e); return null; }
+};
+
+const writeUserHistory = async (userId: string, historyItem: any, docId: string) => {
+    // Save to subcollection "history" under the user
+    await setDoc(doc(db, "users", userId, "history", docId), sanitizeForFirestore(historyItem));
 };
 
 export const saveUserHistory = async (userId: string, historyItem: any) => {
+    const docId = `history_${historyItem.id || Date.now()}`;
+    if (!navigator.onLine) {
+        queueWrite({ type: 'HISTORY', userId, data: historyItem, docId });
+        return;
+    }
     try {
-        const docId = `history_${historyItem.id || Date.now()}`;
-        const sanitized = sanitizeForFirestore(historyItem);
-        // Save to subcollection "history" under the user
-        await setDoc(doc(db, "users", userId, "history", docId), sanitized);
-    } catch(e) { console.error("Error saving history:", e); }
+        await writeUserHistory(userId, historyItem, docId);
+    } catch(e) {
+        console.error("Error saving history:", e);
+        queueWrite({ type: 'HISTORY', userId, data: historyItem, docId });
+    }
 };
 
+// Replays writes queued while offline; returns how many were synced
+export const syncPendingWrites = () => replayPendingWrites(async (write) => {
+    if (write.type === 'TEST_RESULT') {
+        // Writes queued by older builds carry no attempt time: the queue time is the closest
+        const leaderboard = write.leaderboard && {
+            ...write.leaderboard,
+            attemptedAt: write.leaderboard.attemptedAt || new Date(write.queuedAt || Date.now()).toISOString()
+        };
+        await writeTestResult(write.userId, write.data, write.docId || `${write.data.testId}_${write.queuedAt || Date.now()}`, leaderboard);
+    } else {
+        await writeUserHistory(write.userId, write.data, write.docId || `history_${write.data.id || Date.now()}`);
+    }
+});
+
 export const updateUserStatus = async (userId: string, time: number) => {
      try {
         const userRef = ref(rtdb, `users/${userId}`);
@@ -381,6 +645,11 @@ export const getCustomSyllabus = async (key: string) => {
 };
 
 // 6. Public Activity Feed (Live Results)
+const LIVE_FEED_SIZE = 50;
+// Each activity rewrites one random feed shard, so concurrent submits contend on
+// 1/N of the writes; readers merge the N small shard docs
+const LIVE_FEED_SHARDS = 4;
+
 export const savePublicActivity = async (activity: any) => {
     try {
         const sanitized = sanitizeForFirestore(activity);
@@ -393,23 +662,55 @@ export const savePublicActivity = async (activity: any) => {
         
         // Firestore (Auto-delete old via index policy if needed, or just keep)
         await setDoc(doc(db, "public_activity", docId), sanitized);
+
+        // Pre-reduced feed shard: clients subscribe to these instead of the raw rows
+        await runTransaction(db, async (tx) => {
+            const feedRef = doc(db, "live_results", `feed_s${Math.floor(Math.random() * LIVE_FEED_SHARDS)}`);
+            const feedSnap = await tx.get(feedRef);
+            const feed = feedSnap.exists() ? feedSnap.data() : { recent: [], count: 0 };
+            const recent = [sanitized, ...(feed.recent || []).filter((a: any) => a.id !== sanitized.id)].slice(0, LIVE_FEED_SIZE);
+            tx.set(feedRef, { recent, count: (feed.count || 0) + 1, updatedAt: new Date().toISOString() });
+        });
     } catch (e) { console.error("Error saving public activity:", e); }
 };
 
+const byTimestampDesc = (a: any, b: any) => new Date(b.timestamp).getTime() - new Date(a.timestamp).getTime();
+
+// Live feed merges the feed shards (each keeps its newest LIVE_FEED_SIZE, so the
+// merged newest LIVE_FEED_SIZE is exact). Falls back to the RTDB stream until the
+// first shard exists.
 export const subscribeToPublicActivity = (callback: (activities: any[]) => void) => {
-    // Switch to RTDB for true realtime performance
-    const q = rtdbQuery(ref(rtdb, "public_activity"), rtdbLimitToLast(50));
-    return onValue(q, (snapshot) => {
-        const data = snapshot.val();
-        if (data) {
-            const items = Object.values(data);
-            // Sort by timestamp desc
-            items.sort((a: any, b: any) => new Date(b.timestamp).getTime() - new Date(a.timestamp).getTime());
-            callback(items);
-        } else {
-            callback([]);
+    let unsubscribeFallback: (() => void) | null = null;
+    const stopFallback = () => {
+        if (unsubscribeFallback) { unsubscribeFallback(); unsubscribeFallback = null; }
+    };
+
+    const unsubscribeFeed = onSnapshot(collection(db, "live_results"), (snapshot) => {
+        const shards = snapshot.docs.filter(d => d.id.startsWith('feed_s'));
+        if (shards.length > 0) {
+            stopFallback();
+            const items = shards.flatMap(d => d.data().recent || []);
+            items.sort(byTimestampDesc);
+            callback(items.slice(0, LIVE_FEED_SIZE));
+        } else if (!unsubscribeFallback) {
+            const q = rtdbQuery(ref(rtdb, "public_activity"), rtdbLimitToLast(LIVE_FEED_SIZE));
+            unsubscribeFallback = onValue(q, (rtdbSnap) => {
+                const data = rtdbSnap.val();
+                if (data) {
+                    const items = Object.values(data);
+                    items.sort(byTimestampDesc);
+                    callback(items);
+                } else {
+                    callback([]);
+                }
+            });
         }
     });
+
+    return () => {
+        unsubscribeFeed();
+        stopFallback();
+    };
 };
 
 // 7. Universal Analysis Logs
@@ -419,6 +720,32 @@ export const saveUniversalAnalysis = async (log: any) => {
         await set(ref(rtdb, `universal_analysis_logs/${log.id}`), sanitized);
         await setDoc(doc(db, "universal_analysis_logs", log.id), sanitized);
     } catch (e) { console.error("Error saving analysis log:", e); }
+
+    // Rolling hourly + daily counters (increment-only, no read needed), on a random shard of each window
+    try {
+        const windows: AnalysisWindow[] = ['HOURLY', 'DAILY'];
+        await Promise.all(windows.map(w => {
+            const payload = buildAggregateIncrements(log, w);
+            return setDoc(doc(db, "analytics_aggregates", getAnalysisShardId(payload.windowKey)), payload, { merge: true });
+        }));
+    } catch (e) { console.error("Error updating analysis aggregates:", e); }
+};
+
+// Summary over the last `count` hourly/daily windows: reads at most `count` x ANALYSIS_SHARDS small docs
+export const getAnalysisSummary = async (window: AnalysisWindow, count: number): Promise<AnalysisSummary | null> => {
+    try {
+        const keys = getRecentWindowKeys(window, count);
+        const chunks: string[][] = [];
+        for (let i = 0; i < keys.length; i += 30) chunks.push(keys.slice(i, i + 30)); // 'in' takes up to 30 values
+        const snaps = await Promise.all(chunks.map(chunk =>
+            getDocs(query(collection(db, "analytics_aggregates"), where("windowKey", "in", chunk)))
+        ));
+        const docs = snaps.flatMap(s => s.docs.map(d => d.data() as AnalysisAggregateDoc));
+        return summarizeAggregates(docs);
+    } catch (e) {
+        console.error("Error getting analysis summary:", e);
+        return null;
+    }
 };
 
 export const subscribeToUniversalAnalysis = (callback: (logs: any[]) => void) => {
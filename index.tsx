@@ -3,6 +3,7 @@ import ReactDOM from 'react-dom/client';
 import App from './App';
 import './index.css';
 import { ErrorBoundary } from './components/ErrorBoundary';
+import { registerServiceWorker } from './utils/serviceWorker';
 
 const rootElement = document.getElementById('root');
 if (!rootElement) {
@@ -17,3 +18,5 @@ root.render(
     </ErrorBoundary>
   </React.StrictMode>
 );
+
+registerServiceWorker();
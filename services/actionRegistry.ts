@@ -4,6 +4,7 @@ import {
     rtdb, 
     saveUserToLive, 
     saveSystemSettings, 
+    patchSystemSettings,
     saveChapterData, 
     saveUniversalAnalysis,
     saveAiInteraction,
@@ -32,6 +33,8 @@ import {
 } from "firebase/firestore";
 import { User, SystemSettings, WeeklyTest, MCQItem, InboxMessage, SubscriptionHistoryEntry, ClassLevel, Board, Challenge20 } from '../types';
 import { fetchChapters, fetchLessonContent } from './groq';
+import { McqPool, getMcqPool, getPoolChapters, loadPoolQuestions } from '../utils/challengeGenerator';
+import pLimit from 'p-limit';
 
 // --- HELPER: GET ALL USERS (ONCE) ---
 const getAllUsers = async (): Promise<User[]> => {
@@ -319,33 +322,79 @@ const updateSystemSettings = async (updates: Partial<SystemSettings>) => {
     }
 };
 
-const publishDailyChallenge = async (board: Board, classLevel: ClassLevel) => {
-    const settings = await getSettings();
-    if (!settings) throw new Error("Settings not found");
+const DAILY_CHALLENGE_QUESTIONS = 10;
+const DAILY_CHALLENGE_CONCURRENCY = 4; // AI fallbacks run at most this many at once
+
+const getDailyChallengeId = (board: Board, classLevel: ClassLevel) =>
+    `daily-${board}-${classLevel}-${new Date().toISOString().split('T')[0]}`;
 
+const sampleQuestions = (questions: MCQItem[], count: number): MCQItem[] => {
+    const copy = [...questions];
+    for (let i = copy.length - 1; i > 0; i--) {
+        const j = Math.floor(Math.random() * (i + 1));
+        [copy[i], copy[j]] = [copy[j], copy[i]];
+    }
+    return copy.slice(0, count);
+};
+
+const createDailyChallenge = (board: Board, classLevel: ClassLevel, subjectName: string, chapterTitle: string, questions: MCQItem[]): Challenge20 => ({
+    id: getDailyChallengeId(board, classLevel),
+    title: `Daily Challenge: ${chapterTitle}`,
+    description: `Subject: ${subjectName}`,
+    questions,
+    createdAt: new Date().toISOString(),
+    expiryDate: new Date(Date.now() + 24 * 60 * 60 * 1000).toISOString(),
+    type: 'DAILY_CHALLENGE',
+    classLevel: classLevel,
+    isAutoGenerated: true,
+    isActive: true,
+    durationMinutes: 15
+});
+
+// Builds (does not save) one board/class challenge. Questions come from the
+// shared MCQ pool when the class has enough cached content (no chapter list
+// needed), otherwise from AI.
+const buildDailyChallenge = async (board: Board, classLevel: ClassLevel, pool?: McqPool): Promise<{ challenge: Challenge20, source: 'POOL' | 'AI' }> => {
     // 1. Determine Subjects
     const isScienceStream = classLevel === '11' || classLevel === '12';
+    const stream = isScienceStream ? 'Science' : null;
     // Simplified subject selection for daily challenge
     const subject = isScienceStream ? { name: 'Physics', id: 'physics', icon: '', color: '' } : { name: 'Science', id: 'science', icon: '', color: '' };
-    
-    // 2. Fetch Chapters
-    const chapters = await fetchChapters(board, classLevel, isScienceStream ? 'Science' : null, subject, 'English');
+
+    // 2. Cached questions: chapters of this board/class/subject with enough MCQs
+    if (pool) {
+        const prefix = `nst_content_${board}_${classLevel}${stream ? `-${stream}` : ''}_${subject.name}_`;
+        const candidates = getPoolChapters(pool, prefix).filter(c => c.questionCount >= DAILY_CHALLENGE_QUESTIONS);
+        if (candidates.length > 0) {
+            const picked = candidates[Math.floor(Math.random() * candidates.length)];
+            const questions = await loadPoolQuestions(picked);
+            if (questions.length >= DAILY_CHALLENGE_QUESTIONS) {
+                return {
+                    source: 'POOL',
+                    challenge: createDailyChallenge(board, classLevel, subject.name, picked.title || subject.name, sampleQuestions(questions, DAILY_CHALLENGE_QUESTIONS))
+                };
+            }
+        }
+    }
+
+    // 3a. Fetch Chapters (only needed for AI generation)
+    const chapters = await fetchChapters(board, classLevel, stream, subject, 'English');
     if (chapters.length === 0) throw new Error("No chapters found");
 
     const randomChapter = chapters[Math.floor(Math.random() * chapters.length)];
 
-    // 3. Generate 10 Questions
+    // 3b. Generate 10 Questions
     const content = await fetchLessonContent(
         board, 
         classLevel, 
-        isScienceStream ? 'Science' : null, 
+        stream, 
         subject, 
         randomChapter, 
         'English', 
         'MCQ_SIMPLE', 
         0, 
         true, 
-        10, 
+        DAILY_CHALLENGE_QUESTIONS, 
         "", 
         true, 
         'SCHOOL', 
@@ -358,27 +407,69 @@ const publishDailyChallenge = async (board: Board, classLevel: ClassLevel) => {
         throw new Error("Failed to generate Daily Challenge questions");
     }
 
-    const challenge: Challenge20 = {
-        id: `daily-${board}-${classLevel}-${new Date().toISOString().split('T')[0]}`,
-        title: `Daily Challenge: ${randomChapter.title}`,
-        description: `Subject: ${subject.name}`,
-        questions: content.mcqData,
-        createdAt: new Date().toISOString(),
-        expiryDate: new Date(Date.now() + 24 * 60 * 60 * 1000).toISOString(),
-        type: 'DAILY_CHALLENGE',
-        classLevel: classLevel,
-        isAutoGenerated: true,
-        isActive: true,
-        durationMinutes: 15
-    };
+    return { source: 'AI', challenge: createDailyChallenge(board, classLevel, subject.name, randomChapter.title, content.mcqData) };
+};
+
+// Appends challenges in ONE write; a re-run on the same day replaces its own entries.
+// Settings are re-read right before the write and only `dailyChallenges` is patched,
+// so edits made while the challenges were generating aren't overwritten.
+const saveDailyChallenges = async (challenges: Challenge20[]) => {
+    const settings = await getSettings();
+    if (!settings) throw new Error("Settings not found");
+    const ids = new Set(challenges.map(c => c.id));
+    const updatedChallenges = [...(settings.dailyChallenges || []).filter(c => !ids.has(c.id)), ...challenges];
+    await patchSystemSettings({ dailyChallenges: updatedChallenges });
+};
 
-    const updatedChallenges = [...(settings.dailyChallenges || []), challenge];
-    // Keep only last 7 days? Or just append. Append for now.
-    await saveSystemSettings({ ...settings, dailyChallenges: updatedChallenges });
+const publishDailyChallenge = async (board: Board, classLevel: ClassLevel) => {
+    const { challenge } = await buildDailyChallenge(board, classLevel, await getMcqPool());
+    await saveDailyChallenges([challenge]);
 
     return `Daily Challenge published for ${board} Class ${classLevel}`;
 };
 
+/**
+ * Nightly pipeline: one pool build, all board/class challenges built
+ * concurrently (bounded), then one settings read + a single patch of
+ * dailyChallenges. Logs per-step timings.
+ */
+const publishDailyChallenges = async (
+    targets: { board: Board, classLevel: ClassLevel }[],
+    onLog: (msg: string) => void = () => {}
+): Promise<{ published: number, failed: number }> => {
+    const t0 = performance.now();
+    const ms = (since: number) => `${Math.round(performance.now() - since)} ms`;
+
+    let t = performance.now();
+    const pool = await getMcqPool();
+    onLog(`⏱️ MCQ pool ready in ${ms(t)} (${pool.chapters.length} chapters, ${pool.questionCount} questions)`);
+
+    t = performance.now();
+    const limit = pLimit(DAILY_CHALLENGE_CONCURRENCY);
+    const results = await Promise.all(targets.map(({ board, classLevel }) => limit(async () => {
+        const started = performance.now();
+        try {
+            const { challenge, source } = await buildDailyChallenge(board, classLevel, pool);
+            onLog(`✅ ${board} Class ${classLevel}: ${challenge.questions.length} Qs from ${source === 'POOL' ? 'cache' : 'AI'} in ${ms(started)}`);
+            return challenge;
+        } catch (e: any) {
+            onLog(`❌ Failed Challenge ${board} Class ${classLevel}: ${e.message} (${ms(started)})`);
+            return null;
+        }
+    })));
+    const challenges = results.filter((c): c is Challenge20 => !!c);
+    onLog(`⏱️ Generated ${challenges.length}/${targets.length} challenges in ${ms(t)}`);
+
+    if (challenges.length > 0) {
+        t = performance.now();
+        await saveDailyChallenges(challenges);
+        onLog(`⏱️ Saved ${challenges.length} challenges in one write in ${ms(t)}`);
+    }
+
+    onLog(`⏱️ Total ${ms(t0)}`);
+    return { published: challenges.length, failed: targets.length - challenges.length };
+};
+
 // --- REGISTRY MAP ---
 export const ActionRegistry = {
     deleteUser,
@@ -392,7 +483,8 @@ export const ActionRegistry = {
     scanUsers,
     getRecentLogs,
     updateSystemSettings,
-    publishDailyChallenge
+    publishDailyChallenge,
+    publishDailyChallenges
 };
 
 // --- TOOL DEFINITIONS (JSON SCHEMA) ---
@@ -4,7 +4,9 @@ import { fetchChapters, fetchLessonContent } from "./groq";
 import { getChapterData, saveChapterData, saveAiInteraction } from "../firebase";
 import { ActionRegistry } from "./actionRegistry";
 import pLimit from 'p-limit';
-import { storage } from "../utils/storage";
+import { loadContent } from "../utils/contentStore";
+import { getCachedSettings } from "../utils/settingsStore";
+import { publishMorningInsight } from "./morningInsight";
 
 const AUTO_PILOT_PROMPT = `
 STRICT PROFESSIONAL GUIDEBOOK MODE
@@ -100,20 +102,14 @@ export const runAutoPilot = async (
                         for (const chapter of chapters) {
                              classTasks.push(limit(async () => {
                                  // Check Safety Lock (Live Check inside loop)
-                                 try {
-                                     const currentSettingsStr = localStorage.getItem('nst_system_settings');
-                                     if (currentSettingsStr) {
-                                         const currentSettings = JSON.parse(currentSettingsStr);
-                                         if (currentSettings.aiSafetyLock) return; // Silent abort
-                                     }
-                                 } catch(e) {}
+                                 if (getCachedSettings()?.aiSafetyLock) return; // Silent abort
 
                                  // Check existence
                                  const streamKey = (classLevel === '11' || classLevel === '12') && stream ? `-${stream}` : '';
                                  const contentKey = `nst_content_${board}_${classLevel}${streamKey}_${subject.name}_${chapter.id}`;
                                  // Check Storage first (lighter than Firebase)
-                                 const stored = await storage.getItem(contentKey);
-                                 const existing = stored || await getChapterData(contentKey);
+                                 const stored = await loadContent(contentKey, ['notes']);
+                                 const existing = stored || await getChapterData(contentKey, ['notes']);
                                  
                                  const mode = classLevel === 'COMPETITION' ? 'COMPETITION' : 'SCHOOL';
                                  const notesKey = mode === 'SCHOOL' ? 'schoolPremiumNotesHtml' : 'competitionPremiumNotesHtml';
@@ -244,18 +240,12 @@ export const runCommandMode = async (
 
         const tasks = chapters.map(chapter => limit(async () => {
              // Check Safety Lock (Live)
-             try {
-                 const currentSettingsStr = localStorage.getItem('nst_system_settings');
-                 if (currentSettingsStr) {
-                     const currentSettings = JSON.parse(currentSettingsStr);
-                     if (currentSettings.aiSafetyLock) return; // Silent abort
-                 }
-             } catch(e) {}
+             if (getCachedSettings()?.aiSafetyLock) return; // Silent abort
 
              const streamKey = (target.classLevel === '11' || target.classLevel === '12') && target.stream ? `-${target.stream}` : '';
              const contentKey = `nst_content_${target.board}_${target.classLevel}${streamKey}_${target.subject.name}_${chapter.id}`;
-             const stored = await storage.getItem(contentKey);
-             const existing = stored || await getChapterData(contentKey);
+             const stored = await loadContent(contentKey, ['notes']);
+             const existing = stored || await getChapterData(contentKey, ['notes']);
              
              // Check if Premium Notes missing
              const mode = target.classLevel === 'COMPETITION' ? 'COMPETITION' : 'SCHOOL';
@@ -339,22 +329,32 @@ export const runCommandMode = async (
 };
 
 export const runDailyChallengesLoop = async (
-    onLog: (msg: string) => void
+    onLog: (msg: string) => void,
+    settings: Partial<SystemSettings> | null = getCachedSettings()
 ): Promise<void> => {
     onLog("🏆 Starting Daily Challenge Auto-Pilot...");
     
     const boards: Board[] = ['CBSE', 'BSEB'];
     const classes: ClassLevel[] = ['6', '7', '8', '9', '10', '11', '12'];
-    
-    for (const board of boards) {
-        for (const classLevel of classes) {
-             try {
-                 onLog(`⚡ Generating Challenge for ${board} Class ${classLevel}...`);
-                 await ActionRegistry.publishDailyChallenge(board, classLevel);
-                 onLog(`✅ Challenge Published: ${board} Class ${classLevel}`);
-             } catch (e: any) {
-                 onLog(`❌ Failed Challenge ${board} Class ${classLevel}: ${e.message}`);
-             }
+    const targets = boards.flatMap(board => classes.map(classLevel => ({ board, classLevel })));
+
+    if (settings?.isAutoPilotEnabled) {
+        try {
+            const { published, failed } = await ActionRegistry.publishDailyChallenges(targets, onLog);
+            onLog(`✅ Challenges Published: ${published}${failed ? `, ${failed} failed` : ''}`);
+        } catch (e: any) {
+            onLog(`❌ Daily Challenge Cycle Failed: ${e.message}`);
+        }
+    } else {
+        onLog("⏸️ Challenges skipped (Auto-Pilot is off)");
+    }
+
+    // Platform-wide morning banner, from the last 24h of analysis aggregates
+    if (settings?.showMorningInsight !== false) {
+        try {
+            onLog(`🌅 ${await publishMorningInsight(settings)}`);
+        } catch (e: any) {
+            onLog(`❌ Morning Insight Failed: ${e.message}`);
         }
     }
     onLog("🏁 Daily Challenge Cycle Complete.");
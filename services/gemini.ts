@@ -4,6 +4,7 @@ import { STATIC_SYLLABUS } from "../constants";
 import { getChapterData, getCustomSyllabus, getSecureKeys, incrementApiUsage, getApiUsage, rtdb } from "../firebase";
 import { ref, get } from "firebase/database";
 import { storage } from "../utils/storage";
+import { getCachedSettings } from "../utils/settingsStore";
 
 let currentKeyIndex = 0; // GLOBAL ROTATION INDEX
 
@@ -43,9 +44,8 @@ const getAvailableKeys = async (): Promise<string[]> => {
 
     // 2. Try System Settings (LocalStorage)
     try {
-        const storedSettings = localStorage.getItem('nst_system_settings');
-        if (storedSettings) {
-            const parsed = JSON.parse(storedSettings) as SystemSettings;
+        const parsed = getCachedSettings() as SystemSettings | null;
+        if (parsed) {
             if (parsed.geminiApiKeys && Array.isArray(parsed.geminiApiKeys)) {
                 parsed.geminiApiKeys.forEach(k => {
                     if(k && typeof k === 'string' && k.trim()) {
@@ -214,8 +214,7 @@ export const executeWithRotation = async <T>(
     try {
         const usage = await getApiUsage();
         if (usage) {
-            const settingsStr = localStorage.getItem('nst_system_settings');
-            const settings = settingsStr ? JSON.parse(settingsStr) : {};
+            const settings: any = getCachedSettings() || {};
             const pilotRatio = settings.aiPilotRatio || 80;
             const dailyLimit = settings.aiDailyLimitPerKey || 1500;
             
@@ -364,8 +363,8 @@ const getAdminContent = async (
     const key = `nst_content_${board}_${classLevel}${streamKey}_${subject.name}_${chapterId}`;
     
     try {
-        let parsed = await getChapterData(key);
-        if (!parsed) parsed = await storage.getItem(key);
+        const isMcq = type === 'MCQ_SIMPLE' || type === 'MCQ_ANALYSIS';
+        const parsed = await getChapterData(key, isMcq ? ['mcq', 'translations'] : 'all');
 
         if (parsed) {
             if (type === 'PDF_FREE' || type === 'NOTES_SIMPLE') {
@@ -521,8 +520,8 @@ export const fetchChapters = async (
 
   let modelName = "gemini-1.5-flash";
   try {
-      const s = localStorage.getItem('nst_system_settings');
-      if (s) { const p = JSON.parse(s); if(p.aiModel) modelName = p.aiModel; }
+      const p = getCachedSettings();
+      if (p?.aiModel) modelName = p.aiModel;
   } catch(e){}
 
   const prompt = `List 15 standard chapters for ${classLevel === 'COMPETITION' ? 'Competitive Exam' : `Class ${classLevel}`} ${stream ? stream : ''} Subject: ${subject.name} (${board}). Return JSON array: [{"title": "...", "description": "..."}].`;
@@ -586,9 +585,8 @@ export const fetchLessonContent = async (
   let promptMCQ = "";
 
   try {
-      const stored = localStorage.getItem('nst_system_settings');
-      if (stored) {
-          const s = JSON.parse(stored) as SystemSettings;
+      const s = getCachedSettings() as SystemSettings | null;
+      if (s) {
           if (s.aiInstruction) customInstruction = `IMPORTANT INSTRUCTION: ${s.aiInstruction}`;
           if (s.aiModel) modelName = s.aiModel;
           
@@ -4,14 +4,20 @@ import { STATIC_SYLLABUS } from "../constants";
 import { getChapterData, getCustomSyllabus, incrementApiUsage, getApiUsage, rtdb, getSystemSettings } from "../firebase";
 import { ref, get } from "firebase/database";
 import { storage } from "../utils/storage";
+import { getCachedSettings } from "../utils/settingsStore";
+import { startSpan, traceAsync, perfCount } from "../utils/perf";
 
 // GROQ API CALL HELPER
 export const callGroqApi = async (messages: any[], model: string = "llama-3.1-8b-instant") => {
+    const span = startSpan('callGroqApi');
     // Validate model (Gemini models are not supported on Groq)
     let modelToUse = model;
 
     try {
-        const settings = await getSystemSettings();
+        // Shared parsed instance (kept live by subscribeToSettings); network only on a cold cache
+        const cachedSettings = getCachedSettings();
+        span.set({ settingsCacheHit: !!cachedSettings });
+        const settings = cachedSettings || await getSystemSettings();
         if (settings?.aiModel) {
             modelToUse = settings.aiModel;
         }
@@ -30,24 +36,33 @@ export const callGroqApi = async (messages: any[], model: string = "llama-3.1-8b
     }
 
     // Proxy call to server
-    const response = await fetch("/api/groq", {
-        method: "POST",
-        headers: {
-            "Content-Type": "application/json"
-        },
-        body: JSON.stringify({
-            model: modelToUse,
-            messages: messages
-        })
+    const body = JSON.stringify({
+        model: modelToUse,
+        messages: messages
     });
+    try {
+        const response = await fetch("/api/groq", {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json"
+            },
+            body
+        });
+
+        if (!response.ok) {
+            const errorText = await response.text();
+            span.end({ error: true, status: String(response.status) });
+            throw new Error(`Groq API Error: ${response.status} - ${errorText}`);
+        }
 
-    if (!response.ok) {
-        const errorText = await response.text();
-        throw new Error(`Groq API Error: ${response.status} - ${errorText}`);
+        const data = await response.json();
+        const content = data.choices[0].message.content;
+        span.end(() => ({ bytesOut: body.length, bytes: content?.length || 0 }));
+        return content;
+    } catch (e) {
+        span.end({ error: true }); // Network failure or bad body; no-op if already ended
+        throw e;
     }
-
-    const data = await response.json();
-    return data.choices[0].message.content;
 };
 
 // NEW: Tool Support
@@ -79,53 +94,69 @@ export const callGroqApiStream = async (messages: any[], onChunk: (text: string)
     let safeModel = model;
     if (!safeModel || safeModel.includes("gemini")) safeModel = "llama-3.1-8b-instant";
 
-    const response = await fetch("/api/groq", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ model: safeModel, messages, stream: true })
-    });
-
-    if (!response.ok) throw new Error("Groq API Stream Error");
-    if (!response.body) throw new Error("No response body");
-
-    const reader = response.body.getReader();
-    const decoder = new TextDecoder();
-    let accumulated = "";
-
-    while (true) {
-        const { done, value } = await reader.read();
-        if (done) break;
-        const chunk = decoder.decode(value, { stream: true });
-        const lines = chunk.split('\n');
-        for (const line of lines) {
-            if (line.startsWith('data: ')) {
-                const jsonStr = line.slice(6);
-                if (jsonStr.trim() === '[DONE]') return accumulated;
-                try {
-                    const json = JSON.parse(jsonStr);
-                    const content = json.choices?.[0]?.delta?.content || "";
-                    if (content) {
-                        accumulated += content;
-                        onChunk(accumulated);
+    const span = startSpan('callGroqApiStream');
+    const streamStart = performance.now();
+    let bytes = 0;
+    let chunks = 0;
+    try {
+        const response = await fetch("/api/groq", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ model: safeModel, messages, stream: true })
+        });
+
+        if (!response.ok || !response.body) span.end({ error: true, status: String(response.status) });
+        if (!response.ok) throw new Error("Groq API Stream Error");
+        if (!response.body) throw new Error("No response body");
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let accumulated = "";
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            if (chunks++ === 0) span.set({ firstChunkMs: performance.now() - streamStart });
+            bytes += value.byteLength;
+            const chunk = decoder.decode(value, { stream: true });
+            const lines = chunk.split('\n');
+            for (const line of lines) {
+                if (line.startsWith('data: ')) {
+                    const jsonStr = line.slice(6);
+                    if (jsonStr.trim() === '[DONE]') {
+                        span.end({ bytes, chunks });
+                        return accumulated;
                     }
-                } catch (e) {}
+                    try {
+                        const json = JSON.parse(jsonStr);
+                        const content = json.choices?.[0]?.delta?.content || "";
+                        if (content) {
+                            accumulated += content;
+                            onChunk(accumulated);
+                        }
+                    } catch (e) {}
+                }
             }
         }
+        span.end({ bytes, chunks });
+        return accumulated;
+    } catch (e) {
+        span.end({ error: true, bytes, chunks }); // Fetch or stream read failed; no-op if already ended
+        throw e;
     }
-    return accumulated;
 };
 
 export const executeWithRotation = async <T>(
     operation: () => Promise<T>,
     usageType: 'PILOT' | 'STUDENT' = 'STUDENT'
 ): Promise<T> => {
+    const span = startSpan('executeWithRotation', { usageType });
     
     // QUOTA CHECK
     try {
         const usage = await getApiUsage();
         if (usage) {
-            const settingsStr = localStorage.getItem('nst_system_settings');
-            const settings = settingsStr ? JSON.parse(settingsStr) : {};
+            const settings: any = getCachedSettings() || {};
             const pilotRatio = settings.aiPilotRatio || 80;
             const dailyLimit = settings.aiDailyLimitPerKey || 1500;
             
@@ -142,7 +173,10 @@ export const executeWithRotation = async <T>(
             }
         }
     } catch(e: any) {
-        if (e.message && e.message.includes("Quota Exceeded")) throw e;
+        if (e.message && e.message.includes("Quota Exceeded")) {
+            span.end({ quotaExceeded: true });
+            throw e;
+        }
     }
 
     // RETRY LOGIC
@@ -154,6 +188,7 @@ export const executeWithRotation = async <T>(
             // TRACK USAGE (Global, using index 0)
             incrementApiUsage(0, usageType);
 
+            span.end({ retries: i });
             return result;
         } catch (error: any) {
             const msg = error?.message || "";
@@ -161,6 +196,7 @@ export const executeWithRotation = async <T>(
             console.warn(`Attempt ${i + 1} failed: ${msg}`);
             
             if (i === MAX_RETRIES) {
+                span.end({ retries: i, error: true });
                 // If 429 or server error, the server might be busy or keys exhausted
                 if (msg.includes("429") || msg.includes("500") || msg.includes("503")) {
                      throw new Error("AI services are currently busy. Please try again later.");
@@ -264,13 +300,10 @@ const getAdminContent = async (
     const key = `nst_content_${board}_${classLevel}${streamKey}_${subject.name}_${chapterId}`;
     
     try {
-        // FETCH FROM FIREBASE FIRST
-        let parsed = await getChapterData(key);
-        
-        if (!parsed) {
-            // Fallback to Storage (for Admin's offline view)
-            parsed = await storage.getItem(key);
-        }
+        // FETCH FROM FIREBASE FIRST (falls back to the offline cache for Admin's offline view).
+        // MCQ lookups only get meta + MCQ sections back (the offline cache never decompresses the notes).
+        const isMcq = type === 'MCQ_SIMPLE' || type === 'MCQ_ANALYSIS';
+        const parsed = await getChapterData(key, isMcq ? ['mcq', 'translations'] : 'all');
 
         if (parsed) {
             // ... (Logic copied from gemini.ts mostly unchanged as it deals with data retrieval)
@@ -433,8 +466,8 @@ export const fetchChapters = async (
 
   let modelName = "llama-3.1-8b-instant";
   try {
-      const s = localStorage.getItem('nst_system_settings');
-      if (s) { const p = JSON.parse(s); if(p.aiModel) modelName = p.aiModel; }
+      const p = getCachedSettings();
+      if (p?.aiModel) modelName = p.aiModel;
   } catch(e){}
 
   const prompt = `List 15 standard chapters for ${classLevel === 'COMPETITION' ? 'Competitive Exam' : `Class ${classLevel}`} ${stream ? stream : ''} Subject: ${subject.name} (${board}). Return JSON array: [{"title": "...", "description": "..."}].`;
@@ -470,7 +503,7 @@ const processTemplate = (template: string, replacements: Record<string, string>)
 };
 
 // --- MAIN CONTENT FUNCTION (UPDATED FOR GROQ) ---
-export const fetchLessonContent = async (
+const generateLessonContent = async (
   board: Board,
   classLevel: ClassLevel,
   stream: Stream | null,
@@ -497,9 +530,8 @@ export const fetchLessonContent = async (
   let promptMCQ = "";
 
   try {
-      const stored = localStorage.getItem('nst_system_settings');
-      if (stored) {
-          const s = JSON.parse(stored) as SystemSettings;
+      const s = getCachedSettings() as SystemSettings | null;
+      if (s) {
           if (s.aiInstruction) customInstruction = `IMPORTANT INSTRUCTION: ${s.aiInstruction}`;
           if (s.aiModel) modelName = s.aiModel; // Allow override, but default is Llama3
           
@@ -530,6 +562,7 @@ export const fetchLessonContent = async (
   if (!forceRegenerate) {
       const adminContent = await getAdminContent(board, classLevel, stream, subject, chapter.id, type, syllabusMode);
       if (adminContent) {
+          perfCount('fetchLessonContent.cacheHit');
           return {
               ...adminContent,
               title: chapter.title, 
@@ -861,6 +894,14 @@ export const fetchLessonContent = async (
   };
 };
 
+// Traced entry point; the span covers the admin-content lookup and any AI generation
+export const fetchLessonContent = (...args: Parameters<typeof generateLessonContent>): Promise<LessonContent> =>
+  traceAsync('fetchLessonContent', async (span) => {
+      const content = await generateLessonContent(...args);
+      span.set({ type: args[6], comingSoon: !!content.isComingSoon, bytes: content.content?.length || 0 });
+      return content;
+  });
+
 export const generateTestPaper = async (topics: any, count: number, language: Language): Promise<MCQItem[]> => {
     return []; // Placeholder
 };
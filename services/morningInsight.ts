@@ -1,31 +1,32 @@
-import { UniversalAnalysisLog } from '../types';
+import { MorningInsight } from '../types';
 import { executeWithRotation, translateToHindi, callGroqApi } from './groq';
-import { saveSystemSettings } from '../firebase';
+import { patchSystemSettings, getAnalysisSummary } from '../firebase';
 
-export const generateMorningInsight = async (logs: UniversalAnalysisLog[], settings: any, onSave: (banner: any) => void): Promise<string> => {
-    // 1. Filter Logs (Last 24 Hours)
-    const now = new Date();
-    const yesterday = new Date(now.getTime() - 24 * 60 * 60 * 1000);
-    
-    const recentLogs = logs.filter(l => new Date(l.date) > yesterday);
-    
-    if (recentLogs.length === 0) return "No recent data for analysis.";
+// The banner is platform-wide: the daily auto-pilot loop (runDailyChallengesLoop)
+// generates it once a day and stores it in settings.morningInsight. Students only
+// read it from settings.
+export const generateMorningInsight = async (onSave: (banner: MorningInsight) => void | Promise<void>): Promise<string> => {
+    // 1. Last 24 Hours = 24 hourly aggregate docs (covers all traffic, not a sample)
+    const stats = await getAnalysisSummary('HOURLY', 24);
 
-    // 2. Prepare Data for AI
-    // We limit to 50 samples to avoid token overflow
-    const samples = recentLogs.slice(0, 50).map(l => ({
-        subject: l.subject,
-        chapter: l.chapter,
-        score: `${l.score}/${l.totalQuestions}`,
-        mistakes: l.aiResponse ? "Yes" : "No" // We don't have exact mistake text in list, just AI response presence
-    }));
+    if (!stats || stats.totalAttempts === 0) return "No recent data for analysis.";
+
+    // 2. Prepare Data for AI (compact, fixed-size regardless of traffic)
+    const samples = {
+        attempts: stats.totalAttempts,
+        averageScore: `${stats.avgScore}%`,
+        below50Percent: `${stats.lowScoreRate}%`,
+        subjects: stats.subjects.slice(0, 10).map(s => ({ subject: s.name, attempts: s.attempts, avg: `${s.avgScore}%` })),
+        weakestChapters: stats.weakChapters.map(c => ({ chapter: c.name, attempts: c.attempts, avg: `${c.avgScore}%`, below50: `${c.lowRate}%` })),
+        weakestTopics: stats.weakTopics.map(t => ({ topic: t.name, attempts: t.attempts, avg: `${t.avgScore}%` }))
+    };
 
     const prompt = `
     You are an AI Mentor for students.
-    Based on the recent activity logs below, identify common patterns or struggle areas.
+    Based on the aggregated activity of the last 24 hours below, identify common patterns or struggle areas.
     Create a "Morning Insight Banner" content.
     
-    LOGS:
+    STATS:
     ${JSON.stringify(samples)}
     
     OUTPUT FORMAT (JSON):
@@ -54,7 +55,7 @@ export const generateMorningInsight = async (logs: UniversalAnalysisLog[], setti
         bannerData.id = `insight-${Date.now()}`;
 
         // Save
-        onSave(bannerData);
+        await onSave(bannerData);
         
         return "Morning Insight Generated Successfully!";
     } catch (e: any) {
@@ -62,3 +63,15 @@ export const generateMorningInsight = async (logs: UniversalAnalysisLog[], setti
         throw new Error("Failed to generate insight.");
     }
 };
+
+// Today's banner from settings, or null if it hasn't been published yet
+export const getTodaysInsight = (settings: any): MorningInsight | null => {
+    const banner = settings?.morningInsight;
+    return banner && banner.date === new Date().toDateString() ? banner : null;
+};
+
+// Generate today's banner once and patch only settings.morningInsight
+export const publishMorningInsight = async (settings: any): Promise<string> => {
+    if (getTodaysInsight(settings)) return "Morning Insight already published today.";
+    return generateMorningInsight((banner) => patchSystemSettings({ morningInsight: banner }));
+};
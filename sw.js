@@ -0,0 +1,117 @@
+// Service worker: serves the hashed app shell from a precache and runtime-caches
+// CDN assets (fonts, KaTeX CSS, the PDF worker, Tailwind), so a repeat visit
+// starts without waiting on the network and the app still opens offline.
+// This file is a template: the precacheManifest() plugin in vite.config.ts fills
+// in the build id and shell URLs and emits it as /sw.js. Registered by
+// utils/serviceWorker.ts in production builds only.
+
+const PRECACHE = self.__PRECACHE_MANIFEST__ || { build: 'dev', urls: ['/'] };
+
+const SHELL_CACHE = `nst-shell-${PRECACHE.build}`;
+const ASSET_CACHE = 'nst-assets';   // Lazy-loaded hashed chunks
+const CDN_CACHE = 'nst-cdn';
+const MAX_ASSET_ENTRIES = 60;
+const MAX_CDN_ENTRIES = 40;
+
+// Versioned third-party files never change: cache-first
+const CDN_CACHE_FIRST = [
+  /^https:\/\/fonts\.gstatic\.com\//,
+  /^https:\/\/cdn\.jsdelivr\.net\/npm\/katex@/,
+  /^https:\/\/unpkg\.com\/pdfjs-dist@/,
+];
+
+// Unversioned URLs: serve the cached copy, refresh it in the background
+const CDN_REVALIDATE = [
+  /^https:\/\/fonts\.googleapis\.com\/css/,
+  /^https:\/\/cdn\.tailwindcss\.com\//,
+];
+
+const isCacheable = (response) => response && (response.ok || response.type === 'opaque');
+
+const trimCache = async (cacheName, maxEntries) => {
+  const cache = await caches.open(cacheName);
+  const keys = await cache.keys();
+  // Cache keys are kept in insertion order: drop the oldest
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - maxEntries)).map(k => cache.delete(k)));
+};
+
+const cacheFirst = async (request, cacheName, maxEntries) => {
+  const cached = await caches.match(request);
+  if (cached) return cached;
+  const response = await fetch(request);
+  if (isCacheable(response)) {
+    const cache = await caches.open(cacheName);
+    await cache.put(request, response.clone());
+    trimCache(cacheName, maxEntries);
+  }
+  return response;
+};
+
+const staleWhileRevalidate = async (request, cacheName, maxEntries) => {
+  const cached = await caches.match(request);
+  const refresh = fetch(request).then(async response => {
+    if (isCacheable(response)) {
+      const cache = await caches.open(cacheName);
+      await cache.put(request, response.clone());
+      trimCache(cacheName, maxEntries);
+    }
+    return response;
+  });
+  if (cached) {
+    refresh.catch(() => {});
+    return cached;
+  }
+  return refresh;
+};
+
+// The SPA has one document: any navigation gets the precached shell of this build
+const serveShell = async (request) => {
+  const cache = await caches.open(SHELL_CACHE);
+  const shell = await cache.match('/');
+  if (shell) return shell;
+  return fetch(request);
+};
+
+self.addEventListener('install', (event) => {
+  event.waitUntil(
+    caches.open(SHELL_CACHE)
+      .then(cache => cache.addAll(PRECACHE.urls))
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil((async () => {
+    const names = await caches.keys();
+    await Promise.all(names
+      .filter(name => name.startsWith('nst-shell-') && name !== SHELL_CACHE)
+      .map(name => caches.delete(name)));
+    await self.clients.claim();
+  })());
+});
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  if (request.method !== 'GET') return;
+  const url = new URL(request.url);
+
+  if (request.mode === 'navigate' && url.origin === self.location.origin) {
+    event.respondWith(serveShell(request));
+    return;
+  }
+
+  if (url.origin === self.location.origin) {
+    if (url.pathname.startsWith('/api/')) return;
+    if (url.pathname.startsWith('/assets/')) {
+      event.respondWith(cacheFirst(request, ASSET_CACHE, MAX_ASSET_ENTRIES));
+    }
+    return;
+  }
+
+  // Firebase, AI APIs and everything else go straight to the network
+  if (CDN_CACHE_FIRST.some(re => re.test(request.url))) {
+    event.respondWith(cacheFirst(request, CDN_CACHE, MAX_CDN_ENTRIES));
+  } else if (CDN_REVALIDATE.some(re => re.test(request.url))) {
+    event.respondWith(staleWhileRevalidate(request, CDN_CACHE, MAX_CDN_ENTRIES));
+  }
+});
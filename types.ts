@@ -404,6 +404,7 @@ export interface SystemSettings {
   };
   // EXPLORE PAGE CONFIG
   showMorningInsight?: boolean; // NEW: Toggle Morning Banner
+  morningInsight?: MorningInsight; // Today's banner, generated once by the admin client
   showAiPromo?: boolean; // NEW: Toggle AI Banner
   showChallengesBanner?: boolean; // NEW: Toggle Live Challenges
   exploreBanners?: ExploreBanner[]; // NEW: Dynamic Explore Banners
@@ -757,6 +758,52 @@ export interface UniversalAnalysisLog {
   userPrompt: string; // The data sent to AI
   aiResponse: string; // The analysis
   cost: number;
+  topic?: string;
+}
+
+export interface MorningInsight {
+  id: string;
+  date: string; // Date.toDateString() of the day it was generated
+  title: string;
+  wisdom: string;
+  commonTrap: string;
+  proTip: string;
+  motivation: string;
+  weakTopicFocus: string;
+}
+
+// Rolling counters (Firestore: analytics_aggregates/{windowKey}_s{shard}, summed by readers)
+export interface AnalysisCounter {
+  count: number;
+  scoreSum: number; // Sum of percentages
+  low: number; // Attempts under 50%
+  hist: Record<string, number>; // b0..b9 -> attempts per 10% band
+}
+
+export interface AnalysisAggregateDoc {
+  window: 'HOURLY' | 'DAILY';
+  windowKey: string;
+  totals: AnalysisCounter;
+  subjects?: Record<string, AnalysisCounter>;
+  chapters?: Record<string, AnalysisCounter>; // "Subject::Chapter"
+  topics?: Record<string, AnalysisCounter>;
+}
+
+export interface AnalysisSummaryRow {
+  name: string;
+  attempts: number;
+  avgScore: number;
+  lowRate: number;
+}
+
+export interface AnalysisSummary {
+  totalAttempts: number;
+  avgScore: number;
+  lowScoreRate: number;
+  histogram: number[];
+  subjects: AnalysisSummaryRow[];
+  weakChapters: AnalysisSummaryRow[];
+  weakTopics: AnalysisSummaryRow[];
 }
 
 export interface LeaderboardEntry {
@@ -769,6 +816,30 @@ export interface LeaderboardEntry {
     topic: string;
 }
 
+export type LeaderboardPeriod = 'DAILY' | 'WEEKLY' | 'MONTHLY' | 'ALL_TIME';
+
+// Incrementally maintained per board/class/period doc (Firestore: leaderboards/{id})
+export interface LeaderboardAggregate {
+    id: string; // Logical leaderboard id (same on every shard doc)
+    shard?: number; // Set on shard docs; absent on merged aggregates
+    board: string;
+    classLevel: string;
+    period: LeaderboardPeriod;
+    top: LeaderboardEntry[]; // Best score per user, top-K only
+    buckets: number[]; // Users per 10% score band (index 0 = 0-9%)
+    participants: number;
+    attempts: number;
+    updatedAt: string;
+}
+
+// A user's best score within one leaderboard (leaderboards/{id}/members/{userId})
+export interface LeaderboardMember {
+    userId: string;
+    best: number;
+    bucket: number;
+    date: string;
+}
+
 export interface ActivityLogEntry {
   id: string;
   userId: string;
@@ -0,0 +1,122 @@
+import { increment } from 'firebase/firestore';
+import { UniversalAnalysisLog, AnalysisAggregateDoc, AnalysisCounter, AnalysisSummary } from '../types';
+
+// Rolling counters for universal analysis logs. Every saved log is folded into
+// one hourly and one daily window with field increments, so readers fetch a
+// fixed number of small docs instead of raw logs. Each window is split into
+// ANALYSIS_SHARDS docs (analytics_aggregates/{windowKey}_s{n}); a write lands on
+// a random shard so concurrent students don't all contend on one doc, and
+// readers sum the shards.
+
+export type AnalysisWindow = 'HOURLY' | 'DAILY';
+
+export const ANALYSIS_SHARDS = 4;
+
+const HIST_BUCKETS = 10; // 0-9%, 10-19% ... 90-100%
+const WEAK_THRESHOLD = 50; // % below which an attempt counts as "low"
+
+const pad = (n: number) => String(n).padStart(2, '0');
+
+export const getWindowKey = (window: AnalysisWindow, date: Date = new Date()): string => {
+    const day = date.toISOString().split('T')[0];
+    return window === 'HOURLY' ? `h_${day}T${pad(date.getUTCHours())}` : `d_${day}`;
+};
+
+export const getAnalysisShardId = (windowKey: string, shard: number = Math.floor(Math.random() * ANALYSIS_SHARDS)) =>
+    `${windowKey}_s${shard}`;
+
+// Keys of the `count` most recent windows ending at `date` (newest first)
+export const getRecentWindowKeys = (window: AnalysisWindow, count: number, date: Date = new Date()): string[] => {
+    const step = window === 'HOURLY' ? 3600000 : 86400000;
+    return Array.from({ length: count }, (_, i) => getWindowKey(window, new Date(date.getTime() - i * step)));
+};
+
+const percentageOf = (log: Pick<UniversalAnalysisLog, 'score' | 'totalQuestions'>) =>
+    log.totalQuestions > 0 ? Math.max(0, Math.min(100, (log.score / log.totalQuestions) * 100)) : 0;
+
+// Map keys become Firestore field names; keep them free of path separators
+const safeKey = (s: string | undefined) => (s || 'Unknown').replace(/[.\/\[\]*`~]/g, '_').trim() || 'Unknown';
+
+const counterIncrement = (pct: number) => ({
+    count: increment(1),
+    scoreSum: increment(Math.round(pct)),
+    low: increment(pct < WEAK_THRESHOLD ? 1 : 0),
+    hist: { [`b${Math.min(HIST_BUCKETS - 1, Math.floor(pct / 10))}`]: increment(1) }
+});
+
+/**
+ * Increment payload for setDoc(..., { merge: true }). Nested objects merge,
+ * so one write updates the totals plus the subject, chapter and topic counters.
+ */
+export const buildAggregateIncrements = (log: UniversalAnalysisLog, window: AnalysisWindow) => {
+    const pct = percentageOf(log);
+    const subject = safeKey(log.subject);
+    const payload: any = {
+        window,
+        windowKey: getWindowKey(window, new Date(log.date)),
+        totals: counterIncrement(pct),
+        subjects: { [subject]: counterIncrement(pct) },
+        chapters: { [`${subject}::${safeKey(log.chapter)}`]: counterIncrement(pct) }
+    };
+    if (log.topic) payload.topics = { [safeKey(log.topic)]: counterIncrement(pct) };
+    return payload;
+};
+
+const emptyCounter = (): AnalysisCounter => ({ count: 0, scoreSum: 0, low: 0, hist: {} });
+
+const addCounter = (into: AnalysisCounter, from?: AnalysisCounter) => {
+    if (!from) return;
+    into.count += from.count || 0;
+    into.scoreSum += from.scoreSum || 0;
+    into.low += from.low || 0;
+    Object.entries(from.hist || {}).forEach(([b, n]) => {
+        into.hist[b] = (into.hist[b] || 0) + (n || 0);
+    });
+};
+
+const mergeGroup = (into: Record<string, AnalysisCounter>, from?: Record<string, AnalysisCounter>) => {
+    Object.entries(from || {}).forEach(([key, c]) => {
+        if (!into[key]) into[key] = emptyCounter();
+        addCounter(into[key], c);
+    });
+};
+
+const toRows = (group: Record<string, AnalysisCounter>, minCount: number) =>
+    Object.entries(group)
+        .filter(([, c]) => c.count >= minCount)
+        .map(([name, c]) => ({
+            name: name.replace('::', ' - '),
+            attempts: c.count,
+            avgScore: Math.round(c.scoreSum / c.count),
+            lowRate: Math.round((c.low / c.count) * 100)
+        }));
+
+/**
+ * Folds a set of window (shard) docs into one summary. Cost depends only on the number
+ * of docs and distinct subjects/chapters, never on how many logs were saved.
+ */
+export const summarizeAggregates = (docs: AnalysisAggregateDoc[], minCount: number = 3): AnalysisSummary => {
+    const totals = emptyCounter();
+    const subjects: Record<string, AnalysisCounter> = {};
+    const chapters: Record<string, AnalysisCounter> = {};
+    const topics: Record<string, AnalysisCounter> = {};
+
+    docs.forEach(d => {
+        addCounter(totals, d.totals);
+        mergeGroup(subjects, d.subjects);
+        mergeGroup(chapters, d.chapters);
+        mergeGroup(topics, d.topics);
+    });
+
+    const byWeakest = (a: { avgScore: number }, b: { avgScore: number }) => a.avgScore - b.avgScore;
+
+    return {
+        totalAttempts: totals.count,
+        avgScore: totals.count ? Math.round(totals.scoreSum / totals.count) : 0,
+        lowScoreRate: totals.count ? Math.round((totals.low / totals.count) * 100) : 0,
+        histogram: Array.from({ length: HIST_BUCKETS }, (_, i) => totals.hist[`b${i}`] || 0),
+        subjects: toRows(subjects, 1).sort((a, b) => b.attempts - a.attempts),
+        weakChapters: toRows(chapters, minCount).sort(byWeakest).slice(0, 10),
+        weakTopics: toRows(topics, minCount).sort(byWeakest).slice(0, 10)
+    };
+};
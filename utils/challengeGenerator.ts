@@ -1,5 +1,105 @@
 import { ClassLevel, Board, Stream, MCQItem, SystemSettings } from '../types';
 import { getSubjectsList } from '../constants';
+import { listContentKeys, loadContent, getContentVersion } from './contentStore';
+import pLimit from 'p-limit';
+
+// --- SHARED MCQ POOL ---
+// An index of every cached chapter that has MCQs (key, chapter id, subject and
+// question count), built once and keyed by prefix and chapter id. It holds no
+// questions: callers load just the chapters they pick with loadPoolQuestions().
+// Rebuilt lazily whenever the content store changes (getContentVersion).
+
+export interface PoolChapter {
+    key: string;        // nst_content_{board}_{class}{stream}_{subject}_{chapterId}
+    chapterId: string;
+    subject: string;    // Normalised (Math / Science / Social Science / as stored)
+    title?: string;     // Only if the cached chapter carries one
+    questionCount: number;
+}
+
+export interface McqPool {
+    version: number;
+    chapters: PoolChapter[];
+    byChapterId: Record<string, PoolChapter[]>;
+    byPrefix: Record<string, PoolChapter[]>; // Memoised getPoolChapters() lookups
+    questionCount: number;
+}
+
+const POOL_BUILD_CONCURRENCY = 4; // Chapters decompressed at once while indexing
+let poolPromise: Promise<McqPool> | null = null;
+let poolVersion = -1;
+
+const normalizeSubject = (name: string): string => {
+    if (name.includes('Math')) return 'Math';
+    if (name.includes('Science') && !name.includes('Social')) return 'Science';
+    if (name.includes('Social')) return 'Social Science';
+    return name;
+};
+
+const mcqsOf = (content: any): MCQItem[] => [...(content?.manualMcqData || []), ...(content?.weeklyTestMcqData || [])];
+
+const buildMcqPool = async (version: number): Promise<McqPool> => {
+    const keys = (await listContentKeys()).filter(k => k.startsWith('nst_content_'));
+    const limit = pLimit(POOL_BUILD_CONCURRENCY);
+    const loaded = await Promise.all(keys.map(key => limit(async () => {
+        try {
+            // Meta + MCQs only; the notes HTML is never decompressed here
+            const content = await loadContent(key, ['mcq']);
+            const questionCount = content ? mcqsOf(content).length : 0;
+            if (questionCount === 0) return null;
+            const parts = key.split('_');
+            return {
+                key,
+                chapterId: parts[parts.length - 1],
+                subject: normalizeSubject(content.subjectName || 'General'),
+                title: content.chapterTitle || content.title,
+                questionCount
+            } as PoolChapter;
+        } catch (e) {
+            return null;
+        }
+    })));
+
+    const chapters = loaded.filter((c): c is PoolChapter => !!c);
+    const byChapterId: Record<string, PoolChapter[]> = {};
+    chapters.forEach(c => {
+        (byChapterId[c.chapterId] = byChapterId[c.chapterId] || []).push(c);
+    });
+    return {
+        version,
+        chapters,
+        byChapterId,
+        byPrefix: {},
+        questionCount: chapters.reduce((sum, c) => sum + c.questionCount, 0)
+    };
+};
+
+// Builds the pool on first use or after cached content changed; concurrent callers share the same build
+export const getMcqPool = (forceRebuild: boolean = false): Promise<McqPool> => {
+    const version = getContentVersion();
+    if (forceRebuild || !poolPromise || poolVersion !== version) {
+        poolVersion = version;
+        poolPromise = buildMcqPool(version).catch(e => {
+            poolPromise = null;
+            throw e;
+        });
+    }
+    return poolPromise;
+};
+
+export const getPoolChapters = (pool: McqPool, prefix: string): PoolChapter[] => {
+    if (!pool.byPrefix[prefix]) pool.byPrefix[prefix] = pool.chapters.filter(c => c.key.startsWith(prefix));
+    return pool.byPrefix[prefix];
+};
+
+// A fresh array of one pool chapter's MCQs (safe to shuffle in place)
+export const loadPoolQuestions = async (chapter: PoolChapter): Promise<MCQItem[]> => {
+    try {
+        return mcqsOf(await loadContent(chapter.key, ['mcq']));
+    } catch (e) {
+        return [];
+    }
+};
 
 export const generateDailyChallengeQuestions = async (
     classLevel: ClassLevel,
@@ -53,76 +153,48 @@ export const generateDailyChallengeQuestions = async (
         subjects.forEach(s => targetSubjects.add(s.name));
     }
 
-    // 2. Determine Source Keys (Manual vs Auto)
-    let sourceChapterKeys: string[] = [];
+    // 2. Determine Source Chapters (Manual vs Auto) from the shared pool
+    const mcqPool = await getMcqPool();
+    let sourceChapters: PoolChapter[] = [];
     
     if (settings.dailyChallengeConfig?.mode === 'MANUAL' && settings.dailyChallengeConfig.selectedChapterIds?.length) {
         // MANUAL MODE
-        const selectedIds = new Set(settings.dailyChallengeConfig.selectedChapterIds);
-        for (let i = 0; i < localStorage.length; i++) {
-            const key = localStorage.key(i);
-            if (key && key.startsWith('nst_content_')) {
-                const parts = key.split('_');
-                const chId = parts[parts.length - 1];
-                if (selectedIds.has(chId)) sourceChapterKeys.push(key);
-            }
-        }
+        sourceChapters = settings.dailyChallengeConfig.selectedChapterIds.flatMap(id => mcqPool.byChapterId[id] || []);
     } else {
         // AUTO MODE
         const streamKey = (classLevel === '11' || classLevel === '12') ? `-${stream}` : '';
         const expectedPrefix = `nst_content_${board}_${classLevel}${streamKey}`;
 
-        for (let i = 0; i < localStorage.length; i++) {
-            const key = localStorage.key(i);
-            if (key && key.startsWith(expectedPrefix)) {
-                // Check if subject matches
-                let isTarget = false;
-                for (const sub of targetSubjects) {
-                    if (key.includes(`_${sub}_`)) {
-                        isTarget = true;
-                        break;
-                    }
-                }
-                // If Weekly, allow ALL subjects if they have content
-                if (!isDaily && !isTarget) isTarget = true; 
-
-                if (isTarget) sourceChapterKeys.push(key);
+        sourceChapters = getPoolChapters(mcqPool, expectedPrefix).filter(ch => {
+            // If Weekly, allow ALL subjects if they have content
+            if (!isDaily) return true;
+            for (const sub of targetSubjects) {
+                if (ch.key.includes(`_${sub}_`)) return true;
             }
-        }
+            return false;
+        });
     }
 
     // 3. Aggregate Questions By Subject
     const questionsBySubject: Record<string, MCQItem[]> = {};
     const usedQuestions = new Set<string>();
 
-    for (const key of sourceChapterKeys) {
-        try {
-            const stored = localStorage.getItem(key);
-            if (!stored) continue;
-            
-            const content = JSON.parse(stored);
-            let subjectName = content.subjectName || "General";
-            
-            // Normalize Subject Names
-            if (subjectName.includes('Math')) subjectName = 'Math';
-            else if (subjectName.includes('Science') && !subjectName.includes('Social')) subjectName = 'Science';
-            else if (subjectName.includes('Social')) subjectName = 'Social Science';
+    // Only the source chapters' MCQs are loaded, not the whole pool
+    const sourceQuestions = await Promise.all(sourceChapters.map(loadPoolQuestions));
+    sourceChapters.forEach((ch, i) => {
+        if (!questionsBySubject[ch.subject]) {
+            questionsBySubject[ch.subject] = [];
+        }
 
-            if (!questionsBySubject[subjectName]) {
-                questionsBySubject[subjectName] = [];
+        // Fresh per-call arrays: the selection below shuffles them in place
+        const pool = questionsBySubject[ch.subject];
+        sourceQuestions[i].forEach((q: MCQItem) => {
+            if (!usedQuestions.has(q.question)) {
+                pool.push(q);
+                usedQuestions.add(q.question);
             }
-
-            const pool = questionsBySubject[subjectName];
-            const allQs = [...(content.manualMcqData || []), ...(content.weeklyTestMcqData || [])];
-
-            allQs.forEach((q: MCQItem) => {
-                if (!usedQuestions.has(q.question)) {
-                    pool.push(q);
-                    usedQuestions.add(q.question);
-                }
-            });
-        } catch (e) {}
-    }
+        });
+    });
 
     // 4. Selection Logic
     let finalQuestions: MCQItem[] = [];
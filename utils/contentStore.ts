@@ -0,0 +1,368 @@
+import localforage from 'localforage';
+import { storage } from './storage';
+import { fnv1a } from './hash';
+import { startSpan } from './perf';
+
+// Offline cache for chapter content (nst_content_* keys). Each chapter is split
+// into a small always-loaded meta record plus separately loadable sections, each
+// gzip-compressed where CompressionStream exists. An LRU index tracks the bytes
+// and last use of every chapter so the cache can be trimmed to a device budget.
+// Every index/quota mutation runs through one promise chain (withIndex), so
+// concurrent saves, evictions and touches never interleave.
+
+export type ContentSection = 'notes' | 'mcq' | 'translations';
+
+export const CONTENT_SECTIONS: ContentSection[] = ['notes', 'mcq', 'translations'];
+
+interface StoredSection {
+    enc: 'gzip' | 'json';
+    data: ArrayBuffer | string;
+}
+
+interface IndexEntry {
+    bytes: number;
+    lastUsed: number;
+    // Stored parts (meta + sections) with a content hash, so unchanged parts aren't rewritten
+    parts: Partial<Record<ContentSection | 'meta', { hash: string, bytes: number }>>;
+}
+
+const INDEX_KEY = 'nst_content_index';
+const INDEX_SAVE_DELAY_MS = 1000;
+const MIN_BUDGET_BYTES = 20 * 1024 * 1024;
+const MAX_BUDGET_BYTES = 200 * 1024 * 1024;
+const BUDGET_SHARE_OF_QUOTA = 0.1;
+const LOW_MEMORY_BUDGET_BYTES = 40 * 1024 * 1024; // deviceMemory <= 2 GB
+
+const MCQ_KEYS = new Set(['manualMcqData', 'weeklyTestMcqData', 'customMcq', 'mcqData']);
+const NOTES_KEY_REGEX = /html|notes|noteslots|premiumslots|htmlmodules/i;
+
+const contentDb = localforage.createInstance({ name: 'nst_storage', storeName: 'content_sections' });
+
+let index: Record<string, IndexEntry> | null = null;
+let indexLoad: Promise<Record<string, IndexEntry>> | null = null;
+let indexQueue: Promise<unknown> = Promise.resolve();
+let version = 0; // Bumped whenever cached chapter content is added, changed or removed
+let indexTimer: ReturnType<typeof setTimeout> | null = null;
+let budget: number | null = null;
+
+export const getSectionForContentKey = (field: string): ContentSection | 'meta' => {
+    if (field.endsWith('_HI')) return 'translations';
+    if (MCQ_KEYS.has(field)) return 'mcq';
+    if (field === 'content' || NOTES_KEY_REGEX.test(field)) return 'notes';
+    return 'meta';
+};
+
+export const splitContent = (data: Record<string, any>): Record<ContentSection | 'meta', Record<string, any>> => {
+    const parts = { meta: {}, notes: {}, mcq: {}, translations: {} } as Record<ContentSection | 'meta', Record<string, any>>;
+    Object.entries(data).forEach(([field, value]) => {
+        if (value !== undefined) parts[getSectionForContentKey(field)][field] = value;
+    });
+    return parts;
+};
+
+// --- COMPRESSION ---
+
+const canCompress = () => typeof CompressionStream !== 'undefined' && typeof DecompressionStream !== 'undefined';
+
+const encode = async (json: string): Promise<StoredSection> => {
+    if (!canCompress()) return { enc: 'json', data: json };
+    try {
+        const stream = new Blob([json]).stream().pipeThrough(new CompressionStream('gzip'));
+        return { enc: 'gzip', data: await new Response(stream).arrayBuffer() };
+    } catch (e) {
+        return { enc: 'json', data: json };
+    }
+};
+
+const decode = async (stored: StoredSection): Promise<any> => {
+    if (stored.enc === 'json') return JSON.parse(stored.data as string);
+    const stream = new Blob([stored.data as ArrayBuffer]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return JSON.parse(await new Response(stream).text());
+};
+
+const sizeOf = (stored: StoredSection) =>
+    typeof stored.data === 'string' ? stored.data.length : stored.data.byteLength;
+
+const partKey = (key: string, part: ContentSection | 'meta') => `${key}::${part}`;
+
+// --- LRU INDEX ---
+
+// Resolves once the index is usable; on first run that is after the legacy migration finished
+const loadIndex = (): Promise<Record<string, IndexEntry>> => {
+    if (index) return Promise.resolve(index);
+    if (!indexLoad) {
+        indexLoad = contentDb.getItem<Record<string, IndexEntry>>(INDEX_KEY)
+            .catch(() => null)
+            .then(async stored => {
+                if (stored) return (index = stored);
+                // First run of the sectioned store: pull in everything older builds cached,
+                // into a private index that is only published once complete
+                const migrated: Record<string, IndexEntry> = {};
+                await migrateAllLegacy(migrated);
+                index = migrated;
+                scheduleIndexSave();
+                return index;
+            });
+    }
+    return indexLoad;
+};
+
+// Runs fn with the loaded index after every earlier index/quota update has finished
+const withIndex = <T>(fn: (idx: Record<string, IndexEntry>) => Promise<T> | T): Promise<T> => {
+    const run = indexQueue.then(loadIndex).then(fn);
+    indexQueue = run.catch(() => {});
+    return run;
+};
+
+const scheduleIndexSave = () => {
+    if (indexTimer) clearTimeout(indexTimer);
+    indexTimer = setTimeout(() => {
+        indexTimer = null;
+        if (index) contentDb.setItem(INDEX_KEY, index).catch(e => console.error("Failed to save content index", e));
+    }, INDEX_SAVE_DELAY_MS);
+};
+
+// Share of the origin quota given to chapter content, smaller on low-memory phones
+const getBudget = async (): Promise<number> => {
+    if (budget !== null) return budget;
+    let bytes = MAX_BUDGET_BYTES;
+    try {
+        const estimate = await navigator.storage?.estimate?.();
+        if (estimate?.quota) bytes = estimate.quota * BUDGET_SHARE_OF_QUOTA;
+    } catch (e) {}
+    const deviceMemory = (navigator as any).deviceMemory;
+    if (deviceMemory && deviceMemory <= 2) bytes = Math.min(bytes, LOW_MEMORY_BUDGET_BYTES);
+    budget = Math.max(MIN_BUDGET_BYTES, Math.min(MAX_BUDGET_BYTES, bytes));
+    return budget;
+};
+
+const removeParts = (key: string) =>
+    Promise.all((['meta', ...CONTENT_SECTIONS] as const).map(p => contentDb.removeItem(partKey(key, p)).catch(() => {})));
+
+// Evicts least-recently-studied chapters until at least `bytes` are freed; caller holds the index
+const freeSpace = async (idx: Record<string, IndexEntry>, keep: string | undefined, bytes: number): Promise<string[]> => {
+    const evicted: string[] = [];
+    let freed = 0;
+    const oldestFirst = Object.entries(idx)
+        .filter(([k]) => k !== keep)
+        .sort((a, b) => a[1].lastUsed - b[1].lastUsed);
+    for (const [k, entry] of oldestFirst) {
+        if (freed >= bytes) break;
+        await removeParts(k);
+        delete idx[k];
+        freed += entry.bytes;
+        evicted.push(k);
+    }
+    if (evicted.length) {
+        version++;
+        scheduleIndexSave();
+    }
+    return evicted;
+};
+
+// Evicts least-recently-studied chapters until the cache fits the budget; caller holds the index
+const enforceQuota = async (idx: Record<string, IndexEntry>, keep?: string, extraBytes: number = 0): Promise<string[]> => {
+    const limit = await getBudget();
+    const total = extraBytes + Object.values(idx).reduce((sum, e) => sum + e.bytes, 0);
+    return total <= limit ? [] : freeSpace(idx, keep, total - limit);
+};
+
+// IndexedDB reports QuotaExceededError; the localStorage driver reports code 22 (1014 on old Firefox)
+const isQuotaError = (e: any): boolean =>
+    !!e && (e.name === 'QuotaExceededError' || e.name === 'NS_ERROR_DOM_QUOTA_REACHED' || e.code === 22 || e.code === 1014);
+
+/**
+ * Evicts least-recently-studied chapters until the cache fits the budget.
+ * `keep` is never evicted (the chapter being written right now).
+ */
+export const enforceContentQuota = (keep?: string, extraBytes: number = 0): Promise<string[]> =>
+    withIndex(idx => enforceQuota(idx, keep, extraBytes));
+
+// Writes the changed parts of one chapter and its index entry; caller holds the index
+const saveInto = async (idx: Record<string, IndexEntry>, key: string, data: any): Promise<void> => {
+    const span = startSpan('contentStore.save');
+    try {
+        const prev = idx[key]?.parts || {};
+        const parts = splitContent(data);
+        const stored: IndexEntry['parts'] = {};
+        let written = 0;
+
+        for (const part of ['meta', ...CONTENT_SECTIONS] as const) {
+            const fields = parts[part];
+            if (part !== 'meta' && Object.keys(fields).length === 0) {
+                if (prev[part]) {
+                    await contentDb.removeItem(partKey(key, part));
+                    version++;
+                }
+                continue;
+            }
+            const json = JSON.stringify(fields);
+            const hash = `${fnv1a(json)}:${json.length}`;
+            if (prev[part]?.hash === hash) {
+                stored[part] = prev[part];
+                continue;
+            }
+            const record = await encode(json);
+            const size = sizeOf(record);
+            await enforceQuota(idx, key, size);
+            try {
+                await contentDb.setItem(partKey(key, part), record);
+            } catch (e) {
+                if (!isQuotaError(e)) throw e;
+                // Quota hit despite the budget (other site data grew): free room for this part and retry once
+                await freeSpace(idx, key, size);
+                await contentDb.setItem(partKey(key, part), record);
+            }
+            stored[part] = { hash, bytes: size };
+            written += size;
+            version++;
+        }
+
+        const bytes = Object.values(stored).reduce((sum, p) => sum + (p?.bytes || 0), 0);
+        idx[key] = { bytes, lastUsed: Date.now(), parts: stored };
+        scheduleIndexSave();
+        span.end({ bytes: written, cacheHit: written === 0 });
+    } catch (e) {
+        console.error(`Error caching content ${key}:`, e);
+        span.end({ error: true });
+    }
+};
+
+// --- PUBLIC API ---
+
+export const saveContent = async (key: string, data: any): Promise<void> => {
+    if (!data || typeof data !== 'object') return;
+    await withIndex(idx => saveInto(idx, key, data));
+};
+
+// Moves a chapter cached by older builds (whole object in localforage or localStorage) into the sectioned store
+const migrateLegacy = async (idx: Record<string, IndexEntry>, key: string): Promise<any | null> => {
+    let legacy: any = await storage.getItem(key);
+    if (legacy) {
+        await storage.removeItem(key);
+    } else {
+        try {
+            const raw = localStorage.getItem(key);
+            if (raw) {
+                legacy = JSON.parse(raw);
+                localStorage.removeItem(key);
+            }
+        } catch (e) {}
+    }
+    if (!legacy || typeof legacy !== 'object') return null;
+    await saveInto(idx, key, legacy);
+    return legacy;
+};
+
+const migrateAllLegacy = async (idx: Record<string, IndexEntry>) => {
+    const keys = new Set((await storage.keys()).filter(k => k.startsWith('nst_content_')));
+    try {
+        for (let i = 0; i < localStorage.length; i++) {
+            const k = localStorage.key(i);
+            if (k && k.startsWith('nst_content_')) keys.add(k);
+        }
+    } catch (e) {}
+    for (const k of keys) await migrateLegacy(idx, k);
+};
+
+export const pickSections = (data: any, sections: ContentSection[] | 'all') => {
+    if (!data || sections === 'all') return data;
+    const out: Record<string, any> = {};
+    Object.entries(data).forEach(([field, value]) => {
+        const part = getSectionForContentKey(field);
+        if (part === 'meta' || sections.includes(part)) out[field] = value;
+    });
+    return out;
+};
+
+/**
+ * Loads a cached chapter: meta plus only the requested sections (e.g. ['mcq'] for
+ * the MCQ tab, so the notes HTML is never read or decompressed). Returns null on miss.
+ */
+export const loadContent = async (key: string, sections: ContentSection[] | 'all' = 'all'): Promise<any | null> => {
+    const span = startSpan('contentStore.load');
+    try {
+        const idx = await loadIndex();
+        if (!idx[key]) {
+            span.end({ source: 'miss' });
+            return null;
+        }
+
+        const wanted = sections === 'all' ? CONTENT_SECTIONS : sections;
+        const parts = await Promise.all(
+            (['meta', ...wanted] as const)
+                .filter(p => idx[key].parts[p])
+                .map(async p => {
+                    const stored = await contentDb.getItem<StoredSection>(partKey(key, p));
+                    return stored ? decode(stored) : (p === 'meta' ? null : {});
+                })
+        );
+        const entry = idx[key];
+        if (!parts[0]) {
+            // Index points at evicted/cleared data (unless a save replaced the entry meanwhile)
+            withIndex(current => {
+                if (current[key] === entry) {
+                    delete current[key];
+                    version++;
+                    scheduleIndexSave();
+                }
+            });
+            span.end({ source: 'miss' });
+            return null;
+        }
+
+        // Touch in the background; the read itself doesn't wait on queued saves
+        withIndex(current => {
+            if (current[key]) {
+                current[key].lastUsed = Date.now();
+                scheduleIndexSave();
+            }
+        });
+        span.end({ cacheHit: true, source: 'sections' });
+        return Object.assign({}, ...parts);
+    } catch (e) {
+        console.error(`Error reading content ${key}:`, e);
+        span.end({ error: true });
+        return null;
+    }
+};
+
+export const removeContent = (key: string): Promise<void> =>
+    withIndex(async idx => {
+        await removeParts(key);
+        delete idx[key];
+        version++;
+        scheduleIndexSave();
+    });
+
+// Changes whenever cached content changes; derived caches (e.g. the MCQ pool) compare it to know when to rebuild
+export const getContentVersion = (): number => version;
+
+// Keys of all cached chapters (replaces scanning localStorage for nst_content_*)
+export const listContentKeys = async (): Promise<string[]> => Object.keys(await loadIndex());
+
+export const getContentUsage = async (): Promise<{ chapters: number, bytes: number, budget: number }> => {
+    const idx = await loadIndex();
+    return {
+        chapters: Object.keys(idx).length,
+        bytes: Object.values(idx).reduce((sum, e) => sum + e.bytes, 0),
+        budget: await getBudget()
+    };
+};
+
+export const clearContent = (): Promise<void> =>
+    withIndex(async idx => {
+        await contentDb.clear();
+        Object.keys(idx).forEach(k => delete idx[k]);
+        version++;
+    });
+
+if (typeof window !== 'undefined') {
+    window.addEventListener('pagehide', () => {
+        if (indexTimer && index) {
+            clearTimeout(indexTimer);
+            indexTimer = null;
+            contentDb.setItem(INDEX_KEY, index);
+        }
+    });
+}
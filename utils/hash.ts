@@ -0,0 +1,19 @@
+// FNV-1a (32 bit). Cheap, stable across sessions, and good enough for change
+// detection and dedupe keys (not for security).
+export const fnv1a = (str: string): string => {
+    let h = 0x811c9dc5;
+    for (let i = 0; i < str.length; i++) {
+        h ^= str.charCodeAt(i);
+        h = Math.imul(h, 0x01000193);
+    }
+    return (h >>> 0).toString(16).padStart(8, '0');
+};
+
+// JSON.stringify with sorted object keys, so equal values always hash the same
+export const stableStringify = (value: any): string => {
+    if (value === null || typeof value !== 'object') return JSON.stringify(value) ?? 'null';
+    if (Array.isArray(value)) return `[${value.map(stableStringify).join(',')}]`;
+    return `{${Object.keys(value).sort().filter(k => value[k] !== undefined).map(k => `${JSON.stringify(k)}:${stableStringify(value[k])}`).join(',')}}`;
+};
+
+export const hashValue = (value: any): string => fnv1a(stableStringify(value));
@@ -0,0 +1,145 @@
+import { LeaderboardEntry, LeaderboardAggregate, LeaderboardMember, LeaderboardPeriod } from '../types';
+import { fnv1a } from './hash';
+
+// Pure helpers for the incrementally maintained leaderboard documents.
+// firebase.ts applies them inside a transaction on every challenge/weekly test
+// submit. Each leaderboard is split into LEADERBOARD_SHARDS shard docs (a user
+// always writes the same shard), so concurrent submits contend on 1/N of the
+// load; a client reads the N small shard docs (+ its own member doc) and merges
+// them, no matter how many attempts exist.
+
+export const LEADERBOARD_TOP_K = 50;
+export const LEADERBOARD_BUCKETS = 10; // 0-9%, 10-19% ... 90-100%
+export const LEADERBOARD_PERIODS: LeaderboardPeriod[] = ['DAILY', 'WEEKLY', 'MONTHLY', 'ALL_TIME'];
+export const LEADERBOARD_SHARDS = 8;
+
+const pad = (n: number) => String(n).padStart(2, '0');
+
+// ISO-8601 week number (weeks start Monday, week 1 contains Jan 4th)
+const isoWeek = (d: Date): string => {
+    const t = new Date(Date.UTC(d.getUTCFullYear(), d.getUTCMonth(), d.getUTCDate()));
+    const day = t.getUTCDay() || 7;
+    t.setUTCDate(t.getUTCDate() + 4 - day);
+    const yearStart = new Date(Date.UTC(t.getUTCFullYear(), 0, 1));
+    const week = Math.ceil(((t.getTime() - yearStart.getTime()) / 86400000 + 1) / 7);
+    return `${t.getUTCFullYear()}-W${pad(week)}`;
+};
+
+export const getPeriodKey = (period: LeaderboardPeriod, date: Date = new Date()): string => {
+    switch (period) {
+        case 'DAILY': return `d_${date.toISOString().split('T')[0]}`;
+        case 'WEEKLY': return `w_${isoWeek(date)}`;
+        case 'MONTHLY': return `m_${date.getUTCFullYear()}-${pad(date.getUTCMonth() + 1)}`;
+        default: return 'all';
+    }
+};
+
+// Doc id under the `leaderboards` collection, e.g. "CBSE_10_w_2026-W42"
+export const getLeaderboardId = (board: string, classLevel: string, period: LeaderboardPeriod, date: Date = new Date()): string =>
+    `${board}_${classLevel}_${getPeriodKey(period, date)}`;
+
+// Stable per user, so a user's best score only ever lives in one shard
+export const getLeaderboardShard = (userId: string): number =>
+    parseInt(fnv1a(userId), 16) % LEADERBOARD_SHARDS;
+
+// Shard doc id under `leaderboards`, e.g. "CBSE_10_w_2026-W42_s3"
+export const getLeaderboardShardId = (leaderboardId: string, shard: number): string =>
+    `${leaderboardId}_s${shard}`;
+
+export const getScoreBucket = (percentage: number): number =>
+    Math.max(0, Math.min(LEADERBOARD_BUCKETS - 1, Math.floor(percentage / (100 / LEADERBOARD_BUCKETS))));
+
+export const createEmptyAggregate = (id: string, board: string, classLevel: string, period: LeaderboardPeriod, shard?: number): LeaderboardAggregate => ({
+    id,
+    ...(shard !== undefined ? { shard } : {}),
+    board,
+    classLevel,
+    period,
+    top: [],
+    buckets: new Array(LEADERBOARD_BUCKETS).fill(0),
+    participants: 0,
+    attempts: 0,
+    updatedAt: new Date().toISOString()
+});
+
+// Score DESC, then Date DESC (same order the old client-side sort used)
+const compareEntries = (a: LeaderboardEntry, b: LeaderboardEntry) =>
+    b.score - a.score || new Date(b.date).getTime() - new Date(a.date).getTime();
+
+/**
+ * Folds one attempt into an aggregate. Only a user's best score counts, so the
+ * previous member record is needed to move them between histogram buckets.
+ * Returns the new aggregate and member docs; `member` is null when the attempt
+ * did not beat the user's best (nothing to write for them).
+ */
+export const applyAttempt = (
+    aggregate: LeaderboardAggregate,
+    previous: LeaderboardMember | null,
+    entry: LeaderboardEntry
+): { aggregate: LeaderboardAggregate, member: LeaderboardMember | null } => {
+    const next: LeaderboardAggregate = {
+        ...aggregate,
+        buckets: [...aggregate.buckets],
+        attempts: aggregate.attempts + 1,
+        updatedAt: entry.date
+    };
+
+    if (previous && previous.best >= entry.score) {
+        return { aggregate: next, member: null };
+    }
+
+    const bucket = getScoreBucket(entry.score);
+    if (previous) {
+        next.buckets[previous.bucket] = Math.max(0, next.buckets[previous.bucket] - 1);
+    } else {
+        next.participants = aggregate.participants + 1;
+    }
+    next.buckets[bucket]++;
+
+    const lowest = aggregate.top[aggregate.top.length - 1];
+    const qualifies = aggregate.top.length < LEADERBOARD_TOP_K || !lowest || compareEntries(entry, lowest) < 0;
+    if (qualifies) {
+        next.top = [...aggregate.top.filter(e => e.userId !== entry.userId), entry]
+            .sort(compareEntries)
+            .slice(0, LEADERBOARD_TOP_K);
+    }
+
+    return { aggregate: next, member: { userId: entry.userId, best: entry.score, bucket, date: entry.date } };
+};
+
+/**
+ * Combines the shard docs of one leaderboard into a single aggregate. Users never
+ * span shards, so the merged top-K and histogram are exact.
+ */
+export const mergeShards = (shards: LeaderboardAggregate[]): LeaderboardAggregate | null => {
+    if (shards.length === 0) return null;
+    const { id, board, classLevel, period } = shards[0];
+    const merged = createEmptyAggregate(id, board, classLevel, period);
+    merged.updatedAt = '';
+    shards.forEach(s => {
+        merged.top.push(...s.top);
+        s.buckets.forEach((n, i) => { merged.buckets[i] += n; });
+        merged.participants += s.participants;
+        merged.attempts += s.attempts;
+        if (s.updatedAt > merged.updatedAt) merged.updatedAt = s.updatedAt;
+    });
+    merged.top = merged.top.sort(compareEntries).slice(0, LEADERBOARD_TOP_K);
+    return merged;
+};
+
+/**
+ * Rank range for a user derived from the histogram: everyone in higher buckets is
+ * ahead, and the user is somewhere inside their own bucket. Exact rank is used
+ * when the user is in the top-K list.
+ */
+export const getRankBucket = (aggregate: LeaderboardAggregate, member: LeaderboardMember | null) => {
+    if (!member) return null;
+    const exact = aggregate.top.findIndex(e => e.userId === member.userId);
+    if (exact !== -1) {
+        return { from: exact + 1, to: exact + 1, percentile: Math.max(1, Math.ceil(((exact + 1) / Math.max(1, aggregate.participants)) * 100)) };
+    }
+    const ahead = aggregate.buckets.slice(member.bucket + 1).reduce((sum, n) => sum + n, 0);
+    const from = ahead + 1;
+    const to = ahead + Math.max(1, aggregate.buckets[member.bucket]);
+    return { from, to, percentile: Math.max(1, Math.ceil((to / Math.max(1, aggregate.participants)) * 100)) };
+};
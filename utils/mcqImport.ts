@@ -0,0 +1,80 @@
+import { MCQItem } from '../types';
+import { McqImportParser, ImportedNote, ImportStats, ImportFormat, hashMcq } from './mcqImportParser';
+
+export type { ImportedNote, ImportStats } from './mcqImportParser';
+
+const DEFAULT_CHUNK_SIZE = 500;
+
+interface RunImportOptions {
+    allowNotes: boolean;
+    existing?: MCQItem[]; // Questions already in the editor; duplicates of these are dropped
+    chunkSize?: number;
+    onNotes?: (notes: ImportedNote[]) => void;
+    onChunk: (questions: MCQItem[], stats: ImportStats) => void;
+}
+
+interface ImportResult {
+    stats: ImportStats;
+    format: ImportFormat;
+}
+
+const createWorker = (): Worker | null => {
+    if (typeof Worker === 'undefined') return null;
+    try {
+        return new Worker(new URL('./mcqImport.worker.ts', import.meta.url), { type: 'module' });
+    } catch (e) {
+        console.warn("Import worker unavailable, parsing on main thread:", e);
+        return null;
+    }
+};
+
+// Main-thread fallback: same parser, but yields to the event loop between chunks
+const runInline = async (text: string, opts: RunImportOptions, existingHashes: string[]): Promise<ImportResult> => {
+    const parser = new McqImportParser(text, { allowNotes: opts.allowNotes, existingHashes });
+    if (parser.notes.length > 0 && opts.onNotes) opts.onNotes(parser.notes);
+    while (true) {
+        const batch = parser.next(opts.chunkSize || DEFAULT_CHUNK_SIZE);
+        opts.onChunk(batch.questions, { ...parser.stats });
+        if (batch.done) break;
+        await new Promise(resolve => setTimeout(resolve, 0));
+    }
+    return { stats: parser.stats, format: parser.format };
+};
+
+/**
+ * Parses pasted Sheets/Excel/plain text in a Web Worker and streams the result back
+ * in chunks. Questions whose hash matches an existing (or earlier imported) question
+ * are skipped.
+ */
+export const runMcqImport = (text: string, opts: RunImportOptions): Promise<ImportResult> => {
+    const existingHashes = (opts.existing || []).map(hashMcq);
+    const worker = createWorker();
+    if (!worker) return runInline(text, opts, existingHashes);
+
+    return new Promise((resolve, reject) => {
+        worker.onmessage = (e: MessageEvent<any>) => {
+            const msg = e.data;
+            if (msg.type === 'NOTES') {
+                opts.onNotes?.(msg.notes);
+            } else if (msg.type === 'CHUNK') {
+                opts.onChunk(msg.questions, msg.stats);
+            } else if (msg.type === 'DONE') {
+                worker.terminate();
+                resolve({ stats: msg.stats, format: msg.format });
+            } else if (msg.type === 'ERROR') {
+                worker.terminate();
+                reject(new Error(msg.message));
+            }
+        };
+        worker.onerror = (e) => {
+            worker.terminate();
+            reject(new Error(e.message || 'Import worker crashed'));
+        };
+        worker.postMessage({
+            type: 'START',
+            text,
+            options: { allowNotes: opts.allowNotes, existingHashes },
+            chunkSize: opts.chunkSize || DEFAULT_CHUNK_SIZE
+        });
+    });
+};
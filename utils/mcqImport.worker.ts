@@ -0,0 +1,22 @@
+import { McqImportParser, ImportOptions } from './mcqImportParser';
+
+// Messages: main -> worker { type: 'START', text, options, chunkSize }
+//           worker -> main { type: 'NOTES' | 'CHUNK' | 'DONE' | 'ERROR', ... }
+
+self.onmessage = (e: MessageEvent<{ type: 'START', text: string, options: ImportOptions, chunkSize: number }>) => {
+    if (e.data.type !== 'START') return;
+    try {
+        const parser = new McqImportParser(e.data.text, e.data.options);
+        if (parser.notes.length > 0) {
+            self.postMessage({ type: 'NOTES', notes: parser.notes });
+        }
+        while (true) {
+            const batch = parser.next(e.data.chunkSize);
+            self.postMessage({ type: 'CHUNK', questions: batch.questions, stats: parser.stats });
+            if (batch.done) break;
+        }
+        self.postMessage({ type: 'DONE', stats: parser.stats, format: parser.format });
+    } catch (err: any) {
+        self.postMessage({ type: 'ERROR', message: err?.message || String(err) });
+    }
+};
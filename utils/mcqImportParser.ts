@@ -0,0 +1,295 @@
+import { MCQItem } from '../types';
+import { fnv1a } from './hash';
+
+// Shared by the import worker and the main-thread fallback. Nothing here may touch
+// the DOM, React state or storage: it only turns pasted text into MCQItems.
+
+export const QUESTION_START_REGEX = /^(\*\*)?(Q\s*\d+[.:)]?|\d+[.:)]|Question\s*\d+[.:)]?)(\*\*)?\s*/i;
+const ANSWER_LINE_REGEX = /^(Answer|Ans|Correct|उत्तर)\s*[:\s-]*\s*/i;
+const TOPIC_TAG_REGEX = /^<TOPIC:\s*(.*?)>/i;
+const NOTE_REGEX = /<NOTE:\s*(.*?)>([\s\S]*?)<\/NOTE>/gi;
+const ANSWER_LETTER_MAP: Record<string, number> = { 'A': 0, 'B': 1, 'C': 2, 'D': 3 };
+
+// Max skipped-row messages kept; a 50k paste with a broken column must not build a 50k list
+const MAX_REPORTED_ERRORS = 50;
+
+export type ImportFormat = 'TSV' | 'VERTICAL';
+
+export interface ImportOptions {
+    allowNotes: boolean;      // Extract <NOTE: x>..</NOTE> blocks and honour <TOPIC: x> tags
+    existingHashes?: string[]; // Hashes of questions already in the editor (for dedupe)
+}
+
+export interface ImportedNote {
+    id: string;
+    title: string;
+    topic: string;
+    content: string;
+    isPremium: boolean;
+}
+
+export interface ImportStats {
+    processedChars: number;
+    totalChars: number;
+    imported: number;
+    skipped: number;
+    duplicates: number;
+    errors: string[];
+}
+
+export interface ImportBatch {
+    questions: MCQItem[];
+    done: boolean;
+}
+
+// Hash of the normalised question + options; used to drop duplicates
+export const hashMcq = (q: Pick<MCQItem, 'question' | 'options'>): string =>
+    fnv1a([q.question, ...(q.options || [])]
+        .map(s => (s || '').toLowerCase().replace(/\s+/g, ' ').trim())
+        .join('|'));
+
+export const looksLikeQuestionBlock = (lines: string[], index: number): boolean => {
+    // Check if line index + 5 (Answer line) exists
+    if (index + 5 >= lines.length) return false;
+    // Remove Markdown Bolding (**Answer**) if present
+    const cleanAnsLine = lines[index + 5].replace(/^\*\*|\*\*$/g, '');
+    return ANSWER_LINE_REGEX.test(cleanAnsLine);
+};
+
+// Yields non-blank lines without materialising the whole split() array. Lines are
+// NOT trimmed: leading/trailing tabs are empty TSV cells and must keep their column.
+export function* readLines(text: string, from: number = 0): Generator<{ line: string, end: number }> {
+    let pos = from;
+    while (pos < text.length) {
+        let next = text.indexOf('\n', pos);
+        if (next === -1) next = text.length;
+        const line = text.slice(pos, next).replace(/\r$/, '');
+        pos = next + 1;
+        if (line.trim()) yield { line, end: Math.min(pos, text.length) };
+    }
+}
+
+export const extractNotes = (text: string): { notes: ImportedNote[], remaining: string } => {
+    const notes: ImportedNote[] = [];
+    let match;
+    NOTE_REGEX.lastIndex = 0;
+    while ((match = NOTE_REGEX.exec(text)) !== null) {
+        const topicName = match[1].trim();
+        const noteContent = match[2].trim();
+        if (topicName && noteContent) {
+            notes.push({
+                id: `note-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`,
+                title: `Note: ${topicName}`,
+                topic: topicName,
+                content: noteContent,
+                isPremium: false // Default to Free HTML
+            });
+        }
+    }
+    return { notes, remaining: text.replace(NOTE_REGEX, '') };
+};
+
+const parseAnswer = (raw: string): number => {
+    let ansIdx = parseInt(raw) - 1;
+    if (isNaN(ansIdx)) {
+        const mapped = ANSWER_LETTER_MAP[raw.charAt(0).toUpperCase()];
+        ansIdx = mapped !== undefined ? mapped : -1;
+    }
+    // Default to A if invalid
+    return (ansIdx >= 0 && ansIdx <= 3) ? ansIdx : 0;
+};
+
+const cleanExplanation = (raw: string): { explanation: string, topic: string } => {
+    let explanation = raw.trim()
+        .replace(/^\*\*/, '')
+        .replace(/^(Explanation|Exp|व्याख्या)\s*[:\s-]*(\*\*)?\s*/i, '')
+        .replace(/^\*\*/, '')
+        .trim();
+
+    let topic = '';
+    const topicMatch = explanation.match(/Topic:\s*(.*)/i);
+    if (topicMatch) {
+        topic = topicMatch[1].trim();
+        explanation = explanation.replace(/Topic:\s*.*$/im, '').trim();
+    }
+    return { explanation, topic };
+};
+
+/**
+ * Incremental parser. Call next(n) repeatedly; each call parses at most n questions
+ * from where the previous call stopped, so the caller controls chunk size and can
+ * post progress between chunks.
+ */
+export class McqImportParser {
+    readonly format: ImportFormat;
+    readonly notes: ImportedNote[];
+    readonly stats: ImportStats;
+
+    private text: string;
+    private lines: Generator<{ line: string, end: number }>;
+    private window: string[] = []; // Look-ahead buffer for vertical blocks
+    private ends: number[] = [];
+    private exhausted = false;
+    private rowNumber = 0;
+    private currentTopic = '';
+    private seen: Set<string>;
+    private allowNotes: boolean;
+
+    constructor(rawText: string, options: ImportOptions) {
+        // Not trimmed: a leading tab is the (empty) question cell of the first row
+        let text = rawText;
+        this.allowNotes = options.allowNotes;
+        this.notes = [];
+        if (options.allowNotes) {
+            const extracted = extractNotes(text);
+            this.notes = extracted.notes;
+            text = extracted.remaining;
+        }
+        this.text = text;
+        this.format = text.includes('\t') ? 'TSV' : 'VERTICAL';
+        this.lines = readLines(text);
+        this.seen = new Set(options.existingHashes || []);
+        this.stats = { processedChars: 0, totalChars: text.length, imported: 0, skipped: 0, duplicates: 0, errors: [] };
+    }
+
+    next(maxQuestions: number): ImportBatch {
+        const questions: MCQItem[] = [];
+        while (questions.length < maxQuestions) {
+            const q = this.format === 'TSV' ? this.nextRow() : this.nextBlock();
+            if (q === undefined) break;
+            if (q === null) continue;
+
+            const hash = hashMcq(q);
+            if (this.seen.has(hash)) {
+                this.stats.duplicates++;
+                continue;
+            }
+            this.seen.add(hash);
+            this.stats.imported++;
+            questions.push(q);
+        }
+        const done = this.exhausted && this.window.length === 0;
+        if (done) this.stats.processedChars = this.stats.totalChars;
+        return { questions, done };
+    }
+
+    private reject(reason: string) {
+        this.stats.skipped++;
+        if (this.stats.errors.length < MAX_REPORTED_ERRORS) {
+            this.stats.errors.push(`Row ${this.rowNumber}: ${reason}`);
+        }
+    }
+
+    // Fill the look-ahead buffer to at least `size` lines (or until input ends)
+    private fill(size: number): void {
+        while (!this.exhausted && this.window.length < size) {
+            const r = this.lines.next();
+            if (r.done) { this.exhausted = true; break; }
+            // TSV rows keep their edge tabs; cells are trimmed individually in nextRow()
+            this.window.push(this.format === 'TSV' ? r.value.line : r.value.line.trim());
+            this.ends.push(r.value.end);
+        }
+    }
+
+    private consume(count: number): void {
+        this.window.splice(0, count);
+        const ends = this.ends.splice(0, count);
+        if (ends.length) this.stats.processedChars = ends[ends.length - 1];
+        this.rowNumber += count;
+    }
+
+    // MODE A: Tab-Separated (Excel/Sheets/Copy-Paste). undefined = end of input, null = rejected row
+    private nextRow(): MCQItem | null | undefined {
+        this.fill(1);
+        if (this.window.length === 0) return undefined;
+        const row = this.window[0];
+        this.consume(1);
+
+        let cols = row.split('\t');
+        // Handle mixed CSV fallback
+        if (cols.length < 3 && row.includes(',')) cols = row.split(',');
+        cols = cols.map(c => c.trim());
+
+        // Flexible Column Check (Min: Q + 4 Opts + Ans = 6)
+        if (cols.length < 6) {
+            this.reject(`expected at least 6 columns, found ${cols.length}`);
+            return null;
+        }
+        if (!cols[0]) {
+            this.reject('empty question');
+            return null;
+        }
+        if (cols.slice(1, 5).some(o => !o)) {
+            this.reject('empty option');
+            return null;
+        }
+
+        return {
+            question: cols[0],
+            options: [cols[1], cols[2], cols[3], cols[4]],
+            correctAnswer: parseAnswer(cols[5]),
+            explanation: cols[6] || '',
+            topic: cols.length > 7 ? cols[7] : '' // Topic in 8th column (Index 7)
+        };
+    }
+
+    private isBoundary(index: number): boolean {
+        const line = this.window[index];
+        if (this.allowNotes && TOPIC_TAG_REGEX.test(line)) return true;
+        this.fill(index + 6);
+        return QUESTION_START_REGEX.test(line) || looksLikeQuestionBlock(this.window, index);
+    }
+
+    // MODE B: Vertical Block Format (Q, 4 options, Answer line, optional multi-line explanation)
+    private nextBlock(): MCQItem | null | undefined {
+        while (true) {
+            this.fill(6);
+            if (this.window.length === 0) return undefined;
+            const line = this.window[0];
+
+            if (this.allowNotes) {
+                const topicTagMatch = line.match(TOPIC_TAG_REGEX);
+                if (topicTagMatch) {
+                    this.currentTopic = topicTagMatch[1].trim();
+                    this.consume(1);
+                    continue;
+                }
+            }
+
+            if (!(QUESTION_START_REGEX.test(line) || looksLikeQuestionBlock(this.window, 0))) {
+                this.consume(1);
+                continue;
+            }
+
+            // Needs at least Q + 4 Options + Ans = 6 lines
+            if (this.window.length < 6) {
+                this.reject('incomplete question block at end of input');
+                this.consume(this.window.length);
+                return null;
+            }
+
+            // Clean Question Text (Remove Markdown ** if present)
+            const question = line.replace(/^\*\*|\*\*$/g, '');
+            const options = this.window.slice(1, 5);
+            const ansRaw = this.window[5].replace(/^\*\*|\*\*$/g, '').replace(ANSWER_LINE_REGEX, '').trim();
+
+            // Explanation runs until the next question or topic tag
+            let end = 6;
+            while (true) {
+                this.fill(end + 1);
+                if (end >= this.window.length || this.isBoundary(end)) break;
+                end++;
+            }
+            const { explanation, topic } = cleanExplanation(this.window.slice(6, end).join('\n'));
+            this.consume(end);
+
+            return {
+                question,
+                options,
+                correctAnswer: parseAnswer(ansRaw),
+                explanation,
+                topic: topic || this.currentTopic
+            };
+        }
+    }
+}
@@ -0,0 +1,224 @@
+// Opt-in tracing for the app's hot paths (content reads, AI calls, storage).
+// Disabled by default: startSpan() returns a shared no-op span and the counter /
+// histogram helpers return after one boolean check, so instrumented code costs
+// nothing in production. Enable with localStorage 'nst_perf' = '1', or by setting
+// window.__NST_PERF__ = true before the app loads (Playwright add_init_script;
+// window.__NST_PERF_FLOW__ = 'startup' also opens a flow at module load).
+// Results are read through window.__nstPerf.snapshot().
+
+export type PerfAttrs = Record<string, string | number | boolean | undefined>;
+
+export interface PerfSpan {
+    set: (attrs: PerfAttrs) => void;
+    // attrs may be a thunk so expensive values (e.g. byte sizes) are computed after the clock stops
+    end: (attrs?: PerfAttrs | (() => PerfAttrs)) => void;
+}
+
+export interface PerfHistogramSummary {
+    count: number;
+    sum: number;
+    min: number;
+    max: number;
+    avg: number;
+    p50: number;
+    p95: number;
+}
+
+export interface PerfFlowProfile {
+    wallMs: number;
+    counters: Record<string, number>;
+    histograms: Record<string, PerfHistogramSummary>;
+}
+
+export interface PerfSnapshot {
+    enabled: boolean;
+    flows: Record<string, PerfFlowProfile>;
+    spans: { name: string, flow: string, start: number, duration: number, attrs: PerfAttrs }[];
+}
+
+const FLAG_KEY = 'nst_perf';
+const DEFAULT_FLOW = 'default';
+const MAX_SPANS = 500;     // Raw span ring buffer (for debugging a single slow call)
+const MAX_SAMPLES = 1000;  // Per histogram; count/sum/min/max stay exact past this
+
+interface Histogram { count: number, sum: number, min: number, max: number, samples: number[] }
+interface FlowState { start: number, end: number | null, counters: Record<string, number>, histograms: Record<string, Histogram> }
+
+let enabled = false;
+let currentFlow = DEFAULT_FLOW;
+let flows: Record<string, FlowState> = {};
+let spans: PerfSnapshot['spans'] = [];
+
+const now = () => (typeof performance !== 'undefined' ? performance.now() : Date.now());
+
+const NOOP_SPAN: PerfSpan = { set: () => {}, end: () => {} };
+
+const flowState = (name: string): FlowState => {
+    if (!flows[name]) flows[name] = { start: now(), end: null, counters: {}, histograms: {} };
+    return flows[name];
+};
+
+const addCount = (name: string, by: number) => {
+    const counters = flowState(currentFlow).counters;
+    counters[name] = (counters[name] || 0) + by;
+};
+
+const addSample = (name: string, value: number) => {
+    const histograms = flowState(currentFlow).histograms;
+    const h = histograms[name] || (histograms[name] = { count: 0, sum: 0, min: Infinity, max: -Infinity, samples: [] });
+    h.count++;
+    h.sum += value;
+    if (value < h.min) h.min = value;
+    if (value > h.max) h.max = value;
+    if (h.samples.length < MAX_SAMPLES) h.samples.push(value);
+};
+
+export const isPerfEnabled = () => enabled;
+
+export const perfCount = (name: string, by: number = 1) => {
+    if (!enabled) return;
+    addCount(name, by);
+};
+
+export const perfObserve = (name: string, value: number) => {
+    if (!enabled) return;
+    addSample(name, value);
+};
+
+/**
+ * Times one call. On end(): `<name>` gets the duration (ms) and `<name>.calls` is
+ * bumped; numeric attrs go to `<name>.<attr>` histograms (bytes, retries), true
+ * booleans to `<name>.<attr>` counters (cacheHit, error) and strings to
+ * `<name>.<attr>:<value>` counters (e.g. getChapterData.source:firestore).
+ */
+export const startSpan = (name: string, attrs?: PerfAttrs): PerfSpan => {
+    if (!enabled) return NOOP_SPAN;
+    const flow = currentFlow;
+    const start = now();
+    const collected: PerfAttrs = { ...attrs };
+    let ended = false;
+
+    return {
+        set: (more) => { Object.assign(collected, more); },
+        end: (more) => {
+            if (ended || !enabled) return;
+            ended = true;
+            const duration = now() - start;
+            if (more) Object.assign(collected, typeof more === 'function' ? more() : more);
+
+            // Attribute to the flow the span started in, even if another began meanwhile
+            const active = currentFlow;
+            currentFlow = flow;
+            addCount(`${name}.calls`, 1);
+            addSample(name, duration);
+            Object.entries(collected).forEach(([key, value]) => {
+                if (typeof value === 'number') addSample(`${name}.${key}`, value);
+                else if (value === true) addCount(`${name}.${key}`, 1);
+                else if (typeof value === 'string') addCount(`${name}.${key}:${value}`, 1);
+            });
+            currentFlow = active;
+
+            spans.push({ name, flow, start, duration, attrs: collected });
+            if (spans.length > MAX_SPANS) spans.shift();
+        }
+    };
+};
+
+export const traceAsync = async <T>(name: string, fn: (span: PerfSpan) => Promise<T>, attrs?: PerfAttrs): Promise<T> => {
+    if (!enabled) return fn(NOOP_SPAN);
+    const span = startSpan(name, attrs);
+    try {
+        const result = await fn(span);
+        span.end();
+        return result;
+    } catch (e) {
+        span.end({ error: true });
+        throw e;
+    }
+};
+
+// Rough serialized size; only call inside a span thunk or behind isPerfEnabled()
+export const approxBytes = (value: any): number => {
+    if (value === null || value === undefined) return 0;
+    if (typeof value === 'string') return value.length;
+    try {
+        return JSON.stringify(value).length;
+    } catch (e) {
+        return 0;
+    }
+};
+
+// --- FLOWS ---
+// A flow groups everything recorded between beginFlow() and endFlow(), e.g.
+// "startup" or "open_chapter", so a harness can budget each user journey.
+
+export const beginFlow = (name: string) => {
+    if (!enabled) return;
+    currentFlow = name;
+    flows[name] = { start: now(), end: null, counters: {}, histograms: {} };
+};
+
+export const endFlow = () => {
+    if (!enabled) return;
+    flowState(currentFlow).end = now();
+    currentFlow = DEFAULT_FLOW;
+};
+
+const percentile = (sorted: number[], p: number) =>
+    sorted.length ? sorted[Math.min(sorted.length - 1, Math.ceil(sorted.length * p) - 1)] : 0;
+
+const round = (n: number) => Math.round(n * 100) / 100;
+
+export const getPerfSnapshot = (): PerfSnapshot => {
+    const out: Record<string, PerfFlowProfile> = {};
+    Object.entries(flows).forEach(([name, f]) => {
+        const histograms: Record<string, PerfHistogramSummary> = {};
+        Object.entries(f.histograms).forEach(([key, h]) => {
+            const sorted = [...h.samples].sort((a, b) => a - b);
+            histograms[key] = {
+                count: h.count,
+                sum: round(h.sum),
+                min: round(h.min),
+                max: round(h.max),
+                avg: round(h.sum / h.count),
+                p50: round(percentile(sorted, 0.5)),
+                p95: round(percentile(sorted, 0.95))
+            };
+        });
+        out[name] = { wallMs: round((f.end ?? now()) - f.start), counters: { ...f.counters }, histograms };
+    });
+    return { enabled, flows: out, spans: [...spans] };
+};
+
+export const resetPerf = () => {
+    flows = {};
+    spans = [];
+    currentFlow = DEFAULT_FLOW;
+};
+
+export const setPerfEnabled = (on: boolean) => {
+    enabled = on;
+    try {
+        if (on) localStorage.setItem(FLAG_KEY, '1');
+        else localStorage.removeItem(FLAG_KEY);
+    } catch (e) {}
+};
+
+if (typeof window !== 'undefined') {
+    try {
+        enabled = (window as any).__NST_PERF__ === true || localStorage.getItem(FLAG_KEY) === '1';
+    } catch (e) {}
+    // Lets a harness attribute everything from module load onwards to one flow (e.g. "startup")
+    if (typeof (window as any).__NST_PERF_FLOW__ === 'string') beginFlow((window as any).__NST_PERF_FLOW__);
+
+    // Hook for the Playwright verify_* scripts
+    (window as any).__nstPerf = {
+        enable: () => setPerfEnabled(true),
+        disable: () => setPerfEnabled(false),
+        isEnabled: isPerfEnabled,
+        reset: resetPerf,
+        beginFlow,
+        endFlow,
+        snapshot: getPerfSnapshot
+    };
+}
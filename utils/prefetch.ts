@@ -0,0 +1,65 @@
+import { Chapter } from '../types';
+import { getChapterData } from '../firebase';
+import { listContentKeys } from './contentStore';
+
+// Warms the offline content cache with the chapters a student is likely to open
+// next (the ones after the current chapter in the subject's list), during idle
+// time, so the next lesson opens from the cache on a flaky connection.
+
+const PREFETCH_COUNT = 2;
+const IDLE_TIMEOUT_MS = 5000;
+
+const inFlight = new Set<string>();
+
+const canPrefetch = () => {
+    if (!navigator.onLine) return false;
+    // Respect Data Saver
+    return !(navigator as any).connection?.saveData;
+};
+
+const onIdle = (fn: () => void): (() => void) => {
+    if ('requestIdleCallback' in window) {
+        const id = window.requestIdleCallback(fn, { timeout: IDLE_TIMEOUT_MS });
+        return () => window.cancelIdleCallback(id);
+    }
+    const id = setTimeout(fn, IDLE_TIMEOUT_MS / 2);
+    return () => clearTimeout(id);
+};
+
+/**
+ * Schedules an idle-time fetch of the next `count` chapters after `currentChapterId`
+ * (or the first ones when nothing is open yet) that are not cached already.
+ * Returns a cancel function (for a useEffect cleanup).
+ */
+export const prefetchNextChapters = (
+    chapters: Chapter[],
+    currentChapterId: string | null,
+    keyFor: (chapter: Chapter) => string,
+    count: number = PREFETCH_COUNT
+): (() => void) => {
+    if (chapters.length === 0 || !canPrefetch()) return () => {};
+    const start = currentChapterId ? chapters.findIndex(c => c.id === currentChapterId) + 1 : 0;
+    const next = chapters.slice(start, start + count);
+    if (next.length === 0) return () => {};
+
+    let cancelled = false;
+    const cancelIdle = onIdle(async () => {
+        const cached = new Set(await listContentKeys());
+        for (const chapter of next) {
+            const key = keyFor(chapter);
+            if (cancelled || !canPrefetch()) return;
+            if (cached.has(key) || inFlight.has(key)) continue;
+            inFlight.add(key);
+            try {
+                // getChapterData stores what it fetches in the content cache
+                await getChapterData(key);
+            } finally {
+                inFlight.delete(key);
+            }
+        }
+    });
+    return () => {
+        cancelled = true;
+        cancelIdle();
+    };
+};
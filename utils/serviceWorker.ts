@@ -0,0 +1,10 @@
+// Registers the app-shell service worker (sw.js, emitted by vite.config.ts).
+// Production builds only: `process.env.ENABLE_SW` is "false" under the dev server.
+
+export const registerServiceWorker = () => {
+    if (process.env.ENABLE_SW !== 'true' || !('serviceWorker' in navigator)) return;
+    // After load, so installing the precache doesn't compete with the first render
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('/sw.js').catch(e => console.error("Service worker registration failed", e));
+    });
+};
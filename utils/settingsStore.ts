@@ -0,0 +1,106 @@
+import { SystemSettings } from '../types';
+import { hashValue } from './hash';
+
+// Single parsed copy of the system settings shared across the app, plus the
+// section split used by the Firestore sync. Callers read getCachedSettings()
+// instead of JSON.parse(localStorage.getItem('nst_system_settings')) and write
+// through persistSettings(), which debounces the localStorage write.
+
+const STORAGE_KEY = 'nst_system_settings';
+const HASHES_KEY = 'nst_settings_section_hashes';
+const PERSIST_DELAY_MS = 300;
+
+let cached: Partial<SystemSettings> | null | undefined; // undefined = not parsed yet
+let persistTimer: ReturnType<typeof setTimeout> | null = null;
+
+export const getCachedSettings = (): Partial<SystemSettings> | null => {
+    if (cached === undefined) {
+        try {
+            const stored = localStorage.getItem(STORAGE_KEY);
+            cached = stored ? JSON.parse(stored) : null;
+        } catch (e) {
+            console.error("Failed to parse cached settings", e);
+            cached = null;
+        }
+    }
+    return cached;
+};
+
+export const flushSettings = () => {
+    if (persistTimer) {
+        clearTimeout(persistTimer);
+        persistTimer = null;
+    }
+    if (cached) localStorage.setItem(STORAGE_KEY, JSON.stringify(cached));
+};
+
+export const persistSettings = (settings: Partial<SystemSettings>) => {
+    cached = settings;
+    if (persistTimer) clearTimeout(persistTimer);
+    persistTimer = setTimeout(flushSettings, PERSIST_DELAY_MS);
+};
+
+if (typeof window !== 'undefined') {
+    // Don't lose a pending write when the tab goes away
+    window.addEventListener('pagehide', flushSettings);
+    // Another tab wrote new settings: re-parse lazily on next read
+    window.addEventListener('storage', (e) => {
+        if (e.key === STORAGE_KEY) cached = undefined;
+    });
+}
+
+// --- SECTIONS ---
+// Each section is a separate Firestore doc with its own hash, so a toggle in
+// one section doesn't make every client re-download the others.
+
+export type SettingsSection = 'plans' | 'featured' | 'tests' | 'rewards' | 'visibility' | 'ai' | 'core';
+
+const SECTION_KEYS: Record<Exclude<SettingsSection, 'core' | 'ai'>, string[]> = {
+    plans: ['subscriptionPlans', 'packages', 'storeFeatures', 'specialDiscountEvent', 'featureAccess', 'featureCosts', 'featureBadges', 'tierPermissions', 'isPaymentEnabled', 'upiId', 'upiName', 'qrCodeUrl', 'paymentInstructions', 'paymentNumbers', 'paymentDisabledMessage'],
+    featured: ['featuredItems', 'exploreBanners', 'bannerConfig', 'startupAd', 'featurePopup', 'threeTierPopupConfig', 'marqueeLines', 'liveMessage1', 'liveMessage2', 'noticeText'],
+    tests: ['weeklyTests', 'dailyChallenges', 'dailyChallengeConfig', 'prizeRules'],
+    rewards: ['engagementRewards', 'wheelRewards', 'dailyReward', 'signupBonus', 'loginBonusConfig'],
+    visibility: ['hiddenSubjects', 'hiddenClasses', 'hiddenChapters', 'contentVisibility', 'hiddenFeatures', 'allowedClasses', 'allowedBoards', 'allowedStreams', 'dashboardLayout', 'appFeatures', 'areTopicNotesHiddenGlobally']
+};
+
+export const SETTINGS_SECTIONS: SettingsSection[] = ['plans', 'featured', 'tests', 'rewards', 'visibility', 'ai', 'core'];
+
+const KEY_TO_SECTION: Record<string, SettingsSection> = {};
+Object.entries(SECTION_KEYS).forEach(([section, keys]) => {
+    keys.forEach(k => { KEY_TO_SECTION[k] = section as SettingsSection; });
+});
+
+export const getSectionForKey = (key: string): SettingsSection => {
+    if (KEY_TO_SECTION[key]) return KEY_TO_SECTION[key];
+    if (key.startsWith('aiPrompt') || key === 'aiInstruction' || key === 'aiNotesPrompt') return 'ai';
+    return 'core';
+};
+
+export const splitSettings = (settings: Record<string, any>): Record<SettingsSection, Record<string, any>> => {
+    const sections = {} as Record<SettingsSection, Record<string, any>>;
+    SETTINGS_SECTIONS.forEach(s => { sections[s] = {}; });
+    Object.entries(settings).forEach(([key, value]) => {
+        if (value !== undefined) sections[getSectionForKey(key)][key] = value;
+    });
+    return sections;
+};
+
+// Per-key hashes for one section; the section hash is derived from them
+export const hashSection = (data: Record<string, any>): { hash: string, keys: Record<string, string> } => {
+    const keys: Record<string, string> = {};
+    Object.keys(data).forEach(k => { keys[k] = hashValue(data[k]); });
+    return { hash: hashValue(keys), keys };
+};
+
+// Last section hashes this client has applied (so unchanged sections are skipped)
+export const getAppliedSectionHashes = (): Record<string, string> => {
+    try {
+        return JSON.parse(localStorage.getItem(HASHES_KEY) || '{}');
+    } catch (e) {
+        return {};
+    }
+};
+
+export const setAppliedSectionHashes = (hashes: Record<string, string>) => {
+    localStorage.setItem(HASHES_KEY, JSON.stringify(hashes));
+};
@@ -1,4 +1,5 @@
 import localforage from 'localforage';
+import { startSpan } from './perf';
 
 localforage.config({
   name: 'nst_storage'
@@ -6,19 +7,26 @@ localforage.config({
 
 export const storage = {
   getItem: async <T = any>(key: string): Promise<T | null> => {
+    const span = startSpan('storage.getItem');
     try {
-      return await localforage.getItem<T>(key);
+      const value = await localforage.getItem<T>(key);
+      span.end({ cacheHit: value !== null });
+      return value;
     } catch (err) {
       console.error(`Error reading ${key} from localforage:`, err);
+      span.end({ error: true });
       return null;
     }
   },
 
   setItem: async (key: string, value: any): Promise<void> => {
+    const span = startSpan('storage.setItem');
     try {
       await localforage.setItem(key, value);
+      span.end();
     } catch (err) {
       console.error(`Error writing ${key} to localforage:`, err);
+      span.end({ error: true });
     }
   },
 
@@ -30,6 +38,15 @@ export const storage = {
     }
   },
 
+  keys: async (): Promise<string[]> => {
+    try {
+      return await localforage.keys();
+    } catch (err) {
+      console.error('Error listing localforage keys:', err);
+      return [];
+    }
+  },
+
   clear: async (): Promise<void> => {
     try {
       await localforage.clear();
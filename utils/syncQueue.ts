@@ -0,0 +1,71 @@
+import type { LeaderboardContext } from '../firebase';
+
+// Student writes made offline (or that failed) wait here and are replayed on
+// reconnect. Uses the localStorage key older builds queued history under, so
+// anything they left behind is replayed too.
+
+export type PendingWriteType = 'HISTORY' | 'TEST_RESULT';
+
+export interface PendingWrite {
+    type: PendingWriteType;
+    userId: string;
+    data: any;
+    docId?: string;      // Fixed at queue time so a replay rewrites the same doc
+    leaderboard?: LeaderboardContext;
+    queuedAt?: number;
+}
+
+const QUEUE_KEY = 'nst_pending_sync_results';
+const MAX_PENDING = 200;
+
+export const getPendingWrites = (): PendingWrite[] => {
+    try {
+        const pending = JSON.parse(localStorage.getItem(QUEUE_KEY) || '[]');
+        return Array.isArray(pending) ? pending : [];
+    } catch (e) {
+        return [];
+    }
+};
+
+const setPendingWrites = (pending: PendingWrite[]) => {
+    try {
+        if (pending.length) localStorage.setItem(QUEUE_KEY, JSON.stringify(pending));
+        else localStorage.removeItem(QUEUE_KEY);
+    } catch (e) {
+        console.error("Failed to persist pending writes", e);
+    }
+};
+
+export const queueWrite = (write: PendingWrite) => {
+    const pending = [...getPendingWrites(), { ...write, queuedAt: Date.now() }];
+    setPendingWrites(pending.slice(-MAX_PENDING));
+};
+
+let replaying: Promise<number> | null = null;
+
+/**
+ * Sends every queued write through `send`, oldest first. Writes that fail stay
+ * queued for the next reconnect. Returns how many were synced.
+ */
+export const replayPendingWrites = (send: (write: PendingWrite) => Promise<void>): Promise<number> => {
+    if (replaying) return replaying;
+    replaying = (async () => {
+        // Take the whole queue; anything queued while replaying lands in a fresh one
+        const pending = getPendingWrites();
+        if (pending.length === 0) return 0;
+        setPendingWrites([]);
+
+        const failed: PendingWrite[] = [];
+        for (const write of pending) {
+            try {
+                await send(write);
+            } catch (e) {
+                console.error(`Replay of queued ${write.type} failed`, e);
+                failed.push(write);
+            }
+        }
+        if (failed.length) setPendingWrites([...failed, ...getPendingWrites()].slice(-MAX_PENDING));
+        return pending.length - failed.length;
+    })().finally(() => { replaying = null; });
+    return replaying;
+};
@@ -1,27 +1,45 @@
 
+// Voices load asynchronously on most browsers. They are read once, then kept
+// fresh from 'voiceschanged' instead of re-queried on every speakText() call.
+const VOICES_TIMEOUT_MS = 2000;
+let cachedVoices: SpeechSynthesisVoice[] = [];
+let voicesLoading: Promise<SpeechSynthesisVoice[]> | null = null;
+let listeningForVoices = false;
+
+const refreshVoices = () => {
+    cachedVoices = window.speechSynthesis.getVoices();
+};
+
 export const getAvailableVoices = (): Promise<SpeechSynthesisVoice[]> => {
     if (!('speechSynthesis' in window)) {
         return Promise.resolve([]);
     }
-    
-    return new Promise((resolve) => {
-        let voices = window.speechSynthesis.getVoices();
-        if (voices.length > 0) {
-            resolve(voices);
-            return;
-        }
-        
-        // Voices might load asynchronously
-        window.speechSynthesis.onvoiceschanged = () => {
-            voices = window.speechSynthesis.getVoices();
-            resolve(voices);
-        };
-        
-        // Fallback timeout in case onvoiceschanged never fires
-        setTimeout(() => {
-             resolve(window.speechSynthesis.getVoices());
-        }, 2000);
-    });
+
+    if (!listeningForVoices) {
+        listeningForVoices = true;
+        window.speechSynthesis.addEventListener('voiceschanged', refreshVoices);
+        refreshVoices();
+    }
+    if (cachedVoices.length > 0) {
+        return Promise.resolve(cachedVoices);
+    }
+
+    if (!voicesLoading) {
+        voicesLoading = new Promise((resolve) => {
+            let timer: ReturnType<typeof setTimeout>;
+            const finish = () => {
+                window.speechSynthesis.removeEventListener('voiceschanged', finish);
+                clearTimeout(timer);
+                voicesLoading = null;
+                refreshVoices();
+                resolve(cachedVoices);
+            };
+            window.speechSynthesis.addEventListener('voiceschanged', finish);
+            // Fallback in case voiceschanged never fires (the next call tries again)
+            timer = setTimeout(finish, VOICES_TIMEOUT_MS);
+        });
+    }
+    return voicesLoading;
 };
 
 export const getCategorizedVoices = async () => {
@@ -1,39 +1,58 @@
-import { TextMapping } from "../types"; // Assuming types might be needed, but will define locally if not
-
-interface Chunk {
-    text: string;
+// Read-aloud with word highlighting for rendered lessons (LessonView, PdfView).
+// The spoken text, its text-node offsets and sentence boundaries are indexed once
+// per rendered lesson (cached per container until its DOM changes), each
+// boundary event is a binary search into that index, and the highlight is drawn
+// without touching the lesson DOM (CSS Custom Highlight API, or an overlay box).
+// Speech is fed as short sentence chunks with a few utterances queued ahead, so
+// latency and CPU stay flat however long the lesson is.
+
+interface Sentence {
     start: number;
     end: number;
+    hindi: boolean;
+}
+
+interface LessonIndex {
+    text: string;
+    nodes: Text[];
+    nodeStarts: number[]; // Offset of nodes[i] in text, ascending
+    sentences: Sentence[];
+    dirty: boolean;       // Set by the MutationObserver when the lesson re-renders
 }
 
-interface TextMap {
-    node: Node;
+interface Chunk {
     start: number;
     end: number;
+    lang: string;
 }
 
-let currentUtterance: SpeechSynthesisUtterance | null = null;
-let currentHighlightSpan: HTMLSpanElement | null = null;
-let originalTextNodeContent: string | null = null;
+const CHUNK_MAX_CHARS = 240; // Chrome cuts off long utterances (~15s) and they delay the first word
+const LOOKAHEAD = 2;         // Utterances queued behind the one speaking, so chunks play back-to-back
+const MAX_WORD_CHARS = 50;
+const HIGHLIGHT_NAME = 'tts-highlight';
+
+const SENTENCE_REGEX = /[^.!?\n]+[.!?\n]*/g;
+const WORD_SEPARATOR = /[\s.!?,'":;()[\]{}]/;
+const HINDI_REGEX = /[\u0900-\u097F]/;
+
+const indexCache = new WeakMap<HTMLElement, LessonIndex>();
+let session = 0; // Bumped on stop, so events from cancelled utterances are ignored
+let highlightBox: HTMLDivElement | null = null;
+
+const supportsHighlightApi = () =>
+    typeof CSS !== 'undefined' && 'highlights' in CSS && typeof (window as any).Highlight === 'function';
 
 export const stopSpeaking = () => {
+    session++;
     if (window.speechSynthesis) {
         window.speechSynthesis.cancel();
     }
     removeHighlight();
-    currentUtterance = null;
 };
 
 const removeHighlight = () => {
-    if (currentHighlightSpan && currentHighlightSpan.parentNode) {
-        const parent = currentHighlightSpan.parentNode;
-        // Restore the text
-        const text = currentHighlightSpan.textContent || '';
-        const textNode = document.createTextNode(text);
-        parent.replaceChild(textNode, currentHighlightSpan);
-        parent.normalize(); // Merge adjacent text nodes to keep DOM clean
-        currentHighlightSpan = null;
-    }
+    if (supportsHighlightApi()) (CSS as any).highlights.delete(HIGHLIGHT_NAME);
+    if (highlightBox) highlightBox.style.display = 'none';
 };
 
 const blockTags = new Set([
@@ -42,99 +61,178 @@ const blockTags = new Set([
     'MAIN', 'ASIDE', 'TR', 'TD', 'TH', 'CAPTION', 'FIGCAPTION'
 ]);
 
-const buildTextAndMap = (root: HTMLElement): { text: string, map: TextMap[] } => {
-    const map: TextMap[] = [];
+// Splits the text into sentences; sentences longer than a chunk are cut at the last space
+const buildSentences = (text: string): Sentence[] => {
+    const sentences: Sentence[] = [];
+    const push = (start: number, end: number) => {
+        const sentence = text.slice(start, end);
+        if (sentence.trim()) sentences.push({ start, end, hindi: HINDI_REGEX.test(sentence) });
+    };
+
+    let match;
+    SENTENCE_REGEX.lastIndex = 0;
+    while ((match = SENTENCE_REGEX.exec(text)) !== null) {
+        let start = match.index;
+        const end = match.index + match[0].length;
+        while (end - start > CHUNK_MAX_CHARS) {
+            const cut = text.lastIndexOf(' ', start + CHUNK_MAX_CHARS);
+            const splitAt = cut > start ? cut + 1 : start + CHUNK_MAX_CHARS;
+            push(start, splitAt);
+            start = splitAt;
+        }
+        push(start, end);
+    }
+
+    // Fallback if no sentence matched
+    if (sentences.length === 0 && text.trim()) push(0, text.length);
+    return sentences;
+};
+
+const buildIndex = (root: HTMLElement): LessonIndex => {
+    const nodes: Text[] = [];
+    const nodeStarts: number[] = [];
     let text = "";
 
     const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT, null);
-    let currentNode: Node | null = walker.nextNode();
+    let currentNode = walker.nextNode() as Text | null;
     let lastParent: Element | null = null;
 
     while (currentNode) {
-        // Skip empty or whitespace-only nodes?
-        // No, keep them to preserve fidelity, but maybe normalize spaces?
-        // textContent returns raw text.
-        const val = currentNode.textContent || "";
-
+        const val = currentNode.data;
         if (!val) {
-            currentNode = walker.nextNode();
+            currentNode = walker.nextNode() as Text | null;
             continue;
         }
 
         const parent = currentNode.parentElement;
 
-        // Determine if we should insert a separator (space)
-        // Heuristic: If we switched block contexts and aren't in a parent-child relationship
+        // Insert a space when moving into a new, non-nested block so words don't run together
         if (lastParent && parent && lastParent !== parent) {
             const isBlockBoundary = blockTags.has(parent.tagName) || blockTags.has(lastParent.tagName);
             const isRelated = parent.contains(lastParent) || lastParent.contains(parent);
-
-            // If we crossed a block boundary and strictly moved to a new non-nested element
-            if (isBlockBoundary && !isRelated) {
-                // Ensure there is a space if the previous text didn't end with one
-                if (text.length > 0 && !/[ \n\t]$/.test(text)) {
-                    text += " ";
-                    // This space is unmapped (gap in map)
-                }
+            if (isBlockBoundary && !isRelated && text.length > 0 && !/[ \n\t]$/.test(text)) {
+                text += " "; // Unmapped gap
             }
         }
 
-        const start = text.length;
+        nodes.push(currentNode);
+        nodeStarts.push(text.length);
         text += val;
-        const end = text.length;
-
-        map.push({ node: currentNode, start, end });
 
         lastParent = parent;
-        currentNode = walker.nextNode();
+        currentNode = walker.nextNode() as Text | null;
     }
 
-    return { text, map };
+    return { text, nodes, nodeStarts, sentences: buildSentences(text), dirty: false };
 };
 
-const highlightWord = (map: TextMap[], globalIndex: number, length: number) => {
-    removeHighlight(); // Clear previous
+// Cached per container; rebuilt only after the lesson's DOM changes
+const getIndex = (container: HTMLElement): LessonIndex => {
+    const cached = indexCache.get(container);
+    if (cached && !cached.dirty) return cached;
+
+    const index = buildIndex(container);
+    indexCache.set(container, index);
+    const observer = new MutationObserver(() => {
+        index.dirty = true;
+        observer.disconnect();
+    });
+    observer.observe(container, { childList: true, subtree: true, characterData: true });
+    return index;
+};
 
-    // Find the node containing the globalIndex
-    // We use .find or loop. Since map is sorted by start, binary search is faster, but linear is fine for normal lengths.
-    const mapping = map.find(m => globalIndex >= m.start && globalIndex < m.end);
+// Index of the text node containing `offset`, or -1 if it falls in a separator gap
+const findNode = (index: LessonIndex, offset: number): number => {
+    let lo = 0;
+    let hi = index.nodeStarts.length - 1;
+    while (lo < hi) {
+        const mid = (lo + hi + 1) >> 1;
+        if (index.nodeStarts[mid] <= offset) lo = mid;
+        else hi = mid - 1;
+    }
+    const node = index.nodes[lo];
+    if (!node || offset < index.nodeStarts[lo] || offset >= index.nodeStarts[lo] + node.length) return -1;
+    return lo;
+};
 
-    if (!mapping) return;
+// Boundary events without charLength: read up to the next separator
+const wordLengthAt = (text: string, offset: number, limit: number): number => {
+    const end = Math.min(limit, offset + MAX_WORD_CHARS);
+    let i = offset;
+    while (i < end && !WORD_SEPARATOR.test(text[i])) i++;
+    return Math.max(1, i - offset);
+};
 
-    // Calculate offset within the node
-    const localOffset = globalIndex - mapping.start;
+const drawHighlightBox = (rect: DOMRect) => {
+    if (!highlightBox) {
+        highlightBox = document.createElement('div');
+        highlightBox.className = HIGHLIGHT_NAME;
+        Object.assign(highlightBox.style, {
+            position: 'absolute',
+            pointerEvents: 'none',
+            backgroundColor: 'yellow',
+            mixBlendMode: 'multiply',
+            borderRadius: '2px',
+            zIndex: '9999'
+        });
+        document.body.appendChild(highlightBox);
+    }
+    Object.assign(highlightBox.style, {
+        display: 'block',
+        left: `${rect.left + window.scrollX}px`,
+        top: `${rect.top + window.scrollY}px`,
+        width: `${rect.width}px`,
+        height: `${rect.height}px`
+    });
+};
 
-    // Ensure we don't overflow the node
-    const nodeTextLen = (mapping.node.textContent || "").length;
-    const safeLength = Math.min(length, nodeTextLen - localOffset);
+const highlightWord = (index: LessonIndex, globalIndex: number, length: number) => {
+    const i = findNode(index, globalIndex);
+    if (i === -1) return;
 
-    if (safeLength <= 0) return;
+    const node = index.nodes[i];
+    const localOffset = globalIndex - index.nodeStarts[i];
+    const safeLength = Math.min(length, node.length - localOffset);
+    if (safeLength <= 0 || !node.isConnected) return;
 
     try {
         const range = document.createRange();
-        range.setStart(mapping.node, localOffset);
-        range.setEnd(mapping.node, localOffset + safeLength);
-
-        const span = document.createElement('span');
-        span.style.backgroundColor = 'yellow';
-        span.style.color = 'black';
-        span.className = 'tts-highlight'; // Useful for external styling if needed
-
-        range.surroundContents(span);
-        currentHighlightSpan = span;
-
-        // Auto scroll to view (smoothly)
-        // Check if element is already in view to avoid jarring jumps?
-        // span.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
-        // 'center' is usually better for reading
-        span.scrollIntoView({ behavior: 'smooth', block: 'center' });
+        range.setStart(node, localOffset);
+        range.setEnd(node, localOffset + safeLength);
+        const rect = range.getBoundingClientRect();
+
+        if (supportsHighlightApi()) {
+            (CSS as any).highlights.set(HIGHLIGHT_NAME, new (window as any).Highlight(range));
+        } else {
+            drawHighlightBox(rect);
+        }
 
+        // Scroll only when the word leaves the viewport, not on every word
+        if (rect.top < 0 || rect.bottom > window.innerHeight) {
+            node.parentElement?.scrollIntoView({ behavior: 'smooth', block: 'center' });
+        }
     } catch (e) {
-        // Can fail if DOM changed or range is invalid (e.g. split text node)
-        // console.warn("Highlight error:", e);
+        // Range can be invalid if the lesson re-rendered mid-speech
     }
 };
 
+// Groups consecutive same-language sentences into chunks of up to CHUNK_MAX_CHARS
+const buildChunks = (index: LessonIndex, lang: string): Chunk[] => {
+    const chunks: Chunk[] = [];
+    let current: Chunk | null = null;
+    for (const sentence of index.sentences) {
+        // Auto-detect Hindi mixed in (simple check)
+        const sentenceLang = sentence.hindi ? 'hi-IN' : lang;
+        if (current && current.lang === sentenceLang && sentence.end - current.start <= CHUNK_MAX_CHARS) {
+            current.end = sentence.end;
+        } else {
+            current = { start: sentence.start, end: sentence.end, lang: sentenceLang };
+            chunks.push(current);
+        }
+    }
+    return chunks;
+};
+
 export const speakWithHighlight = (
     container: HTMLElement,
     rate: number = 1.0,
@@ -143,92 +241,53 @@ export const speakWithHighlight = (
 ) => {
     stopSpeaking();
 
-    // 1. Build Spoken Text and Map
-    const { text: fullText, map } = buildTextAndMap(container);
-
-    if (!fullText.trim()) {
+    const index = getIndex(container);
+    const chunks = buildChunks(index, lang);
+    if (chunks.length === 0) {
         if (onEnd) onEnd();
         return;
     }
 
-    // 2. Chunking Logic (Sentence level)
-    const chunks: Chunk[] = [];
-    // Regex matches sequence of non-sentence-ending chars, followed by sentence-ending chars
-    const regex = /[^.!?\n]+[.!?\n]*/g;
-    let match;
+    const speakSession = session;
+    let nextChunk = 0;
 
-    while ((match = regex.exec(fullText)) !== null) {
-        chunks.push({
-            text: match[0],
-            start: match.index,
-            end: match.index + match[0].length
-        });
-    }
+    // Utterances are created lazily: one more each time a queued one starts
+    const enqueueNext = () => {
+        if (nextChunk >= chunks.length) return;
+        const chunk = chunks[nextChunk++];
+        const isLast = nextChunk === chunks.length;
 
-    // Fallback if no punctuation found
-    if (chunks.length === 0 && fullText.trim()) {
-        chunks.push({ text: fullText, start: 0, end: fullText.length });
-    }
-
-    let chunkIdx = 0;
-
-    const speakNextChunk = () => {
-        if (chunkIdx >= chunks.length) {
-            if (onEnd) onEnd();
-            return;
-        }
-
-        const chunk = chunks[chunkIdx];
-
-        // Skip empty chunks (whitespace)
-        if (!chunk.text.trim()) {
-            chunkIdx++;
-            speakNextChunk();
-            return;
-        }
-
-        const utterance = new SpeechSynthesisUtterance(chunk.text);
+        const utterance = new SpeechSynthesisUtterance(index.text.slice(chunk.start, chunk.end));
         utterance.rate = rate;
-        utterance.lang = lang;
+        utterance.lang = chunk.lang;
 
-        // Auto-detect Hindi mixed (Simple check)
-        if (/[\u0900-\u097F]/.test(chunk.text)) {
-             utterance.lang = 'hi-IN';
-        }
+        utterance.onstart = () => {
+            if (speakSession === session) enqueueNext();
+        };
 
         utterance.onboundary = (event) => {
-            if (event.name === 'word') {
-                const charIndex = event.charIndex; // Relative to chunk text
-                const globalIndex = chunk.start + charIndex; // Relative to full text
-
-                // Heuristic to determine length of word to highlight
-                // We peek at the chunk text starting from charIndex
-                const remainder = chunk.text.substring(charIndex);
-
-                // Match word characters.
-                // Note: \w works for English. For Hindi/others it might fail.
-                // Better approach: Read until next whitespace or punctuation
-                const nextSeparator = remainder.search(/[\s.!?,'":;()[\]{}]/);
-                let wordLen = nextSeparator === -1 ? remainder.length : nextSeparator;
-                if (wordLen === 0) wordLen = 1; // Fallback
-
-                highlightWord(map, globalIndex, wordLen);
-            }
+            if (speakSession !== session || event.name !== 'word') return;
+            const globalIndex = chunk.start + event.charIndex;
+            highlightWord(index, globalIndex, event.charLength || wordLengthAt(index.text, globalIndex, chunk.end));
         };
 
         utterance.onend = () => {
-            chunkIdx++;
-            speakNextChunk();
+            if (speakSession !== session || !isLast) return;
+            removeHighlight();
+            if (onEnd) onEnd();
         };
 
         utterance.onerror = (e) => {
+            // Cancelled by stopSpeaking() or a new speakWithHighlight()
+            if (speakSession !== session || e.error === 'interrupted' || e.error === 'canceled') return;
             console.error("TTS Error", e);
             stopSpeaking();
+            if (onEnd) onEnd();
         };
 
-        currentUtterance = utterance;
         window.speechSynthesis.speak(utterance);
     };
 
-    speakNextChunk();
+    // The first chunk's onstart queues the next, keeping LOOKAHEAD behind the one speaking
+    for (let i = 0; i < LOOKAHEAD; i++) enqueueNext();
 };
@@ -0,0 +1,339 @@
+"""
+Leaderboard read-cost benchmark against the Firestore emulator.
+
+Start the emulator first:
+    firebase emulators:start --only firestore --project iic-adf79
+
+Then:
+    python verify_leaderboard_benchmark.py [--checkpoints 1000,5000,20000,100000,1000000]
+                                           [--concurrency 16] [--transactional-up-to 20000]
+
+The first --transactional-up-to attempts go through the same transactional update
+the app runs (updateLeaderboards in firebase.ts): beginTransaction -> read the
+user's shard of the DAILY/WEEKLY/MONTHLY/ALL_TIME leaderboards + their member docs
+-> fold the attempt in (utils/leaderboard.ts rules) -> commit, retried on
+contention. Beyond that (one REST round trip per attempt would take hours for 1M)
+the remaining attempts are folded in here with the same apply_attempt() and only
+the resulting shard + member docs are bulk-written with batched commits. At each
+checkpoint a student's read (all shard docs of one leaderboard + their own member
+doc) is timed. Read cost must stay flat while attempts grow.
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+EMULATOR_HOST = os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080")
+PROJECT_ID = os.environ.get("FIREBASE_PROJECT", "iic-adf79")
+BASE_URL = f"http://{EMULATOR_HOST}/v1/projects/{PROJECT_ID}/databases/(default)/documents"
+
+TOP_K = 50
+BUCKETS = 10
+SHARDS = 8
+PERIODS = ["DAILY", "WEEKLY", "MONTHLY", "ALL_TIME"]
+TXN_MAX_ATTEMPTS = 10
+USERS = 5_000
+BULK_BATCH = 500  # Max writes per commit
+READS_PER_CHECKPOINT = 20
+BOARD, CLASS_LEVEL = "CBSE", "10"
+READER_ID = "user_0"
+
+
+# --- MIRROR OF utils/hash.ts + utils/leaderboard.ts ---
+
+def fnv1a(text):
+    h = 0x811C9DC5
+    for ch in text:
+        h ^= ord(ch)
+        h = (h * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def shard_of(user_id):
+    """getLeaderboardShard()"""
+    return fnv1a(user_id) % SHARDS
+
+
+def period_key(period, now):
+    """getPeriodKey()"""
+    if period == "DAILY":
+        return f"d_{now.strftime('%Y-%m-%d')}"
+    if period == "WEEKLY":
+        year, week, _ = now.isocalendar()
+        return f"w_{year}-W{week:02d}"
+    if period == "MONTHLY":
+        return f"m_{now.strftime('%Y-%m')}"
+    return "all"
+
+
+def bucket_of(score):
+    return max(0, min(BUCKETS - 1, score // (100 // BUCKETS)))
+
+
+def empty_aggregate(lb_id, board, class_level, period, shard):
+    return {"id": lb_id, "shard": shard, "board": board, "classLevel": class_level, "period": period,
+            "top": [], "buckets": [0] * BUCKETS, "participants": 0, "attempts": 0, "updatedAt": ""}
+
+
+def apply_attempt(agg, prev, entry):
+    """Mirror of applyAttempt(): updates agg in place, returns the new member doc or None."""
+    agg["attempts"] += 1
+    agg["updatedAt"] = entry["date"]
+    if prev is not None and prev["best"] >= entry["score"]:
+        return None
+    bucket = bucket_of(entry["score"])
+    if prev is not None:
+        agg["buckets"][prev["bucket"]] = max(0, agg["buckets"][prev["bucket"]] - 1)
+    else:
+        agg["participants"] += 1
+    agg["buckets"][bucket] += 1
+
+    top = agg["top"]
+    if len(top) < TOP_K or entry["score"] > top[-1]["score"] or (entry["score"] == top[-1]["score"] and entry["date"] > top[-1]["date"]):
+        top = [e for e in top if e["userId"] != entry["userId"]] + [entry]
+        # Score DESC, then Date DESC
+        top.sort(key=lambda e: (e["score"], e["date"]), reverse=True)
+        agg["top"] = top[:TOP_K]
+    return {"userId": entry["userId"], "best": entry["score"], "bucket": bucket, "date": entry["date"]}
+
+
+def leaderboard_targets(board, class_level, user_id, when):
+    """The docs one updateLeaderboards() transaction reads and writes."""
+    shard = shard_of(user_id)
+    targets = []
+    for period in PERIODS:
+        lb_id = f"{board}_{class_level}_{period_key(period, when)}"
+        targets.append({
+            "id": lb_id, "period": period, "shard": shard,
+            "agg_path": f"leaderboards/{lb_id}_s{shard}",
+            "member_path": f"leaderboards/{lb_id}/members/{user_id}",
+        })
+    return targets
+
+
+def leaderboard_updates(docs, targets, board, class_level, entry):
+    """Body of the updateLeaderboards() transaction: {path: fields} to write."""
+    updates = {}
+    for t in targets:
+        agg = docs.get(t["agg_path"]) or empty_aggregate(t["id"], board, class_level, t["period"], t["shard"])
+        member = apply_attempt(agg, docs.get(t["member_path"]), entry)
+        updates[t["agg_path"]] = agg
+        if member:
+            updates[t["member_path"]] = member
+    return updates
+
+
+# --- FIRESTORE REST ---
+
+def encode(value):
+    """Python value -> Firestore REST Value."""
+    if isinstance(value, bool):
+        return {"booleanValue": value}
+    if isinstance(value, int):
+        return {"integerValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    if isinstance(value, list):
+        return {"arrayValue": {"values": [encode(v) for v in value]}}
+    if isinstance(value, dict):
+        return {"mapValue": {"fields": {k: encode(v) for k, v in value.items()}}}
+    return {"nullValue": None}
+
+
+def decode(value):
+    """Firestore REST Value -> Python value (inverse of encode)."""
+    if "integerValue" in value:
+        return int(value["integerValue"])
+    if "doubleValue" in value:
+        return value["doubleValue"]
+    if "booleanValue" in value:
+        return value["booleanValue"]
+    if "stringValue" in value:
+        return value["stringValue"]
+    if "arrayValue" in value:
+        return [decode(v) for v in value["arrayValue"].get("values", [])]
+    if "mapValue" in value:
+        return {k: decode(v) for k, v in value["mapValue"].get("fields", {}).items()}
+    return None
+
+
+def doc_name(path):
+    return f"projects/{PROJECT_ID}/databases/(default)/documents/{path}"
+
+
+def request(method, suffix, body=None):
+    """Returns (ms, response bytes, parsed JSON)."""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(f"{BASE_URL}{suffix}", data=data, method=method)
+    req.add_header("Content-Type", "application/json")
+    req.add_header("Authorization", "Bearer owner")  # Emulator admin bypass
+    start = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=30) as res:
+        payload = res.read()
+    return (time.perf_counter() - start) * 1000, len(payload), (json.loads(payload) if payload else None)
+
+
+def run_transaction(paths, apply):
+    """beginTransaction -> batchGet -> apply -> commit, retried on contention. Returns retries."""
+    for attempt in range(TXN_MAX_ATTEMPTS):
+        _, _, begun = request("POST", ":beginTransaction", {})
+        txn = begun["transaction"]
+        _, _, results = request("POST", ":batchGet", {"documents": [doc_name(p) for p in paths], "transaction": txn})
+        docs = {}
+        for r in results or []:
+            if "found" in r:
+                path = r["found"]["name"].split("/documents/", 1)[1]
+                docs[path] = {k: decode(v) for k, v in r["found"].get("fields", {}).items()}
+        writes = [{"update": {"name": doc_name(p), "fields": {k: encode(v) for k, v in f.items()}}}
+                  for p, f in apply(docs).items()]
+        try:
+            request("POST", ":commit", {"writes": writes, "transaction": txn})
+            return attempt
+        except urllib.error.HTTPError as e:
+            if e.code not in (409, 400) or attempt == TXN_MAX_ATTEMPTS - 1:
+                raise
+            time.sleep(random.uniform(0.01, 0.05) * (attempt + 1))
+    return TXN_MAX_ATTEMPTS
+
+
+def submit_attempt(user_id, score, n):
+    """What saveTestResult() does for a ranked test: one updateLeaderboards() transaction."""
+    now = datetime.now(timezone.utc)
+    entry = {"id": f"{user_id}_{n}", "userId": user_id, "userName": user_id, "score": score,
+             "total": 100, "date": now.isoformat().replace("+00:00", "Z"), "topic": "Benchmark"}
+    targets = leaderboard_targets(BOARD, CLASS_LEVEL, user_id, now)
+    paths = [p for t in targets for p in (t["agg_path"], t["member_path"])]
+    return run_transaction(paths, lambda docs: leaderboard_updates(docs, targets, BOARD, CLASS_LEVEL, entry))
+
+
+def load_docs(lb_ids):
+    """Current shard + member docs of the given leaderboards, as {path: fields}."""
+    docs = {}
+    for lb_id in lb_ids:
+        _, _, rows = request("POST", ":runQuery", {"structuredQuery": {
+            "from": [{"collectionId": "leaderboards"}],
+            "where": {"fieldFilter": {"field": {"fieldPath": "id"}, "op": "EQUAL", "value": {"stringValue": lb_id}}},
+        }})
+        for r in rows or []:
+            if "document" in r:
+                path = r["document"]["name"].split("/documents/", 1)[1]
+                docs[path] = {k: decode(v) for k, v in r["document"].get("fields", {}).items()}
+        token = ""
+        while True:
+            _, _, page = request("GET", f"/leaderboards/{lb_id}/members?pageSize=1000&pageToken={token}")
+            for d in (page or {}).get("documents", []):
+                path = d["name"].split("/documents/", 1)[1]
+                docs[path] = {k: decode(v) for k, v in d.get("fields", {}).items()}
+            token = (page or {}).get("nextPageToken")
+            if not token:
+                break
+    return docs
+
+
+def bulk_seed(start, target):
+    """Folds attempts start..target-1 in locally and batch-writes the changed docs."""
+    now = datetime.now(timezone.utc)
+    lb_ids = [f"{BOARD}_{CLASS_LEVEL}_{period_key(p, now)}" for p in PERIODS]
+    docs = load_docs(lb_ids)
+    dirty = set()
+    for n in range(start, target):
+        user_id = f"user_{random.randrange(USERS)}"
+        # Strictly increasing dates keep the top-K tie-break identical to live submits
+        date = (now + timedelta(microseconds=n)).isoformat().replace("+00:00", "Z")
+        entry = {"id": f"{user_id}_{n}", "userId": user_id, "userName": user_id, "score": random.randint(0, 100),
+                 "total": 100, "date": date, "topic": "Benchmark"}
+        targets = leaderboard_targets(BOARD, CLASS_LEVEL, user_id, now)
+        updates = leaderboard_updates(docs, targets, BOARD, CLASS_LEVEL, entry)
+        docs.update(updates)
+        dirty.update(updates)
+
+    writes = [{"update": {"name": doc_name(p), "fields": {k: encode(v) for k, v in docs[p].items()}}} for p in sorted(dirty)]
+    for i in range(0, len(writes), BULK_BATCH):
+        request("POST", ":commit", {"writes": writes[i:i + BULK_BATCH]})
+
+
+def read_leaderboard(lb_id, user_id):
+    """A student's read (subscribeToLeaderboard + getLeaderboardMember): returns (ms, bytes, docs)."""
+    ms_q, bytes_q, rows = request("POST", ":runQuery", {"structuredQuery": {
+        "from": [{"collectionId": "leaderboards"}],
+        "where": {"fieldFilter": {"field": {"fieldPath": "id"}, "op": "EQUAL", "value": {"stringValue": lb_id}}},
+    }})
+    shard_docs = sum(1 for r in rows or [] if "document" in r)
+    try:
+        ms_m, bytes_m, _ = request("GET", f"/leaderboards/{lb_id}/members/{user_id}")
+    except urllib.error.HTTPError:
+        ms_m, bytes_m = 0.0, 0
+    return ms_q + ms_m, bytes_q + bytes_m, shard_docs + 1
+
+
+def run_benchmark(checkpoints, concurrency, transactional_up_to):
+    random.seed(42)
+    lb_id = f"{BOARD}_{CLASS_LEVEL}_all"
+    retries = 0
+    lock = threading.Lock()
+
+    def one(n):
+        nonlocal retries
+        user_id = READER_ID if n == 0 else f"user_{random.randrange(USERS)}"
+        r = submit_attempt(user_id, random.randint(0, 100), n)
+        with lock:
+            retries += r
+
+    print(f"{'attempts':>10} {'participants':>12} {'docs read':>9} {'bytes':>7} {'avg ms':>7} {'p95 ms':>7} {'txn retries':>11}")
+    done = 0
+    results = []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for target in checkpoints:
+            live_end = max(done, min(target, transactional_up_to))
+            list(pool.map(one, range(done, live_end)))
+            if target > live_end:
+                bulk_seed(live_end, target)
+            done = target
+
+            timings, size, docs_read = [], 0, 0
+            for _ in range(READS_PER_CHECKPOINT):
+                ms, size, docs_read = read_leaderboard(lb_id, READER_ID)
+                timings.append(ms)
+            timings.sort()
+            avg = sum(timings) / len(timings)
+            p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+
+            _, _, rows = request("POST", ":runQuery", {"structuredQuery": {
+                "from": [{"collectionId": "leaderboards"}],
+                "where": {"fieldFilter": {"field": {"fieldPath": "id"}, "op": "EQUAL", "value": {"stringValue": lb_id}}},
+            }})
+            participants = sum(decode(r["document"]["fields"]["participants"]) for r in rows or [] if "document" in r)
+            results.append((target, size, docs_read))
+            print(f"{target:>10} {participants:>12} {docs_read:>9} {size:>7} {avg:>7.2f} {p95:>7.2f} {retries:>11}")
+
+    # Read payload must not grow with attempts (top-K + histogram per shard are bounded)
+    failures = []
+    smallest = min(s for _, s, _ in results)
+    largest = max(s for _, s, _ in results)
+    if largest > smallest * 1.5:
+        failures.append(f"read size grew from {smallest} to {largest} bytes")
+    most_docs = max(d for _, _, d in results)
+    if most_docs > SHARDS + 1:
+        failures.append(f"read {most_docs} docs (expected at most {SHARDS + 1})")
+    if failures:
+        raise SystemExit("FAIL: " + "; ".join(failures))
+    print("PASS: read cost is constant in the number of attempts")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checkpoints", default="1000,5000,20000,100000,1000000",
+                        help="comma-separated attempt counts to measure at")
+    parser.add_argument("--concurrency", type=int, default=16, help="parallel submitting clients")
+    parser.add_argument("--transactional-up-to", type=int, default=20_000,
+                        help="attempts submitted one transaction each; the rest are bulk-seeded")
+    args = parser.parse_args()
+    run_benchmark([int(c) for c in args.checkpoints.split(",")], args.concurrency, args.transactional_up_to)
@@ -0,0 +1,664 @@
+"""
+Load generator: simulated students running the real flows against local stand-ins.
+
+Each virtual student issues the same Firestore / RTDB calls the app makes
+(firebase.ts) for: login -> open chapter -> take MCQ test -> submit -> view
+marksheet (with an AI analysis for a share of students). Nothing touches the
+production project.
+
+Start the stand-ins first:
+    firebase emulators:start --only firestore,database --project iic-adf79
+
+Then (the mock /api/groq server is started in-process):
+    python verify_load_test.py --students 500 --concurrency 200
+    python verify_load_test.py --students 2000 --concurrency 1000 --ai-share 0.1
+
+    # Only the mock /api/groq (e.g. to point the dev server or Playwright at it)
+    python verify_load_test.py --serve-groq-only --groq-port 8787
+
+Reports requests/sec, p50/p95 latency per step and per flow, read/write counts
+per collection and leaderboard transaction retries. Exits non-zero when
+--max-p95-ms or --max-error-rate is exceeded.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from verify_leaderboard_benchmark import decode, encode, leaderboard_targets, leaderboard_updates
+
+FIRESTORE_HOST = os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080")
+DATABASE_HOST = os.environ.get("FIREBASE_DATABASE_EMULATOR_HOST", "localhost:9000")
+PROJECT_ID = os.environ.get("FIREBASE_PROJECT", "iic-adf79")
+RTDB_NAMESPACE = f"{PROJECT_ID}-default-rtdb"
+
+FIRESTORE_ROOT = f"http://{FIRESTORE_HOST}/v1/projects/{PROJECT_ID}/databases/(default)/documents"
+RTDB_ROOT = f"http://{DATABASE_HOST}"
+
+BOARDS = ["CBSE", "BSEB"]
+CLASSES = ["9", "10", "11", "12"]
+SUBJECTS = ["Math", "Science", "Social Science"]
+CHAPTERS_PER_SUBJECT = 12
+QUESTIONS_PER_TEST = 15
+LIVE_FEED_SIZE = 50
+LIVE_FEED_SHARDS = 4  # firebase.ts
+ANALYSIS_SHARDS = 4  # utils/analysisAggregates.ts
+RANKED_SHARE = 0.3  # Daily challenges / weekly tests; chapter practice is not ranked
+SETTINGS_SECTIONS = ["plans", "featured", "tests", "rewards", "visibility", "ai", "core"]
+TXN_MAX_ATTEMPTS = 5
+
+
+# --- FIXTURES (User shape from types.ts; the verify_* UI scripts inline theirs, there is no shared helper) ---
+
+def make_student(i):
+    board = BOARDS[i % len(BOARDS)]
+    class_level = CLASSES[i % len(CLASSES)]
+    return {
+        "id": f"load-student-{i}",
+        "name": f"Load Student {i}",
+        "email": f"student{i}@example.com",
+        "role": "STUDENT",
+        "board": board,
+        "classLevel": class_level,
+        "stream": "Science" if class_level in ("11", "12") else None,
+        "credits": 100,
+        "isPremium": i % 5 == 0,
+        "createdAt": "2026-01-01T00:00:00.000Z",
+        "mcqHistory": [],
+    }
+
+
+def make_admin():
+    return {"id": "admin-1", "name": "Super Admin", "role": "ADMIN", "isPremium": True}
+
+
+def make_mcqs(subject, chapter_id, count=30):
+    return [{
+        "question": f"{subject} {chapter_id} Q{n + 1}?",
+        "options": ["A", "B", "C", "D"],
+        "correctAnswer": n % 4,
+        "explanation": "Seeded by verify_load_test.py",
+        "topic": f"Topic {n % 5}",
+    } for n in range(count)]
+
+
+def content_key(student, subject, chapter_id):
+    """Same key format as AdminDashboard / getChapterData."""
+    stream_key = f"-{student['stream']}" if student["classLevel"] in ("11", "12") and student["stream"] else ""
+    return f"nst_content_{student['board']}_{student['classLevel']}{stream_key}_{subject}_{chapter_id}"
+
+
+# --- METRICS ---
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)     # step -> [ms]
+        self.flow_latencies = defaultdict(list)  # flow -> [ms]
+        self.reads = defaultdict(int)          # collection -> docs read
+        self.writes = defaultdict(int)         # collection -> docs written
+        self.errors = defaultdict(int)         # step -> count
+        self.requests = 0
+        self.txn_retries = 0
+
+    def record(self, step, ms, reads=None, writes=None, ok=True):
+        with self.lock:
+            self.requests += 1
+            self.latencies[step].append(ms)
+            for c, n in (reads or {}).items():
+                self.reads[c] += n
+            for c, n in (writes or {}).items():
+                self.writes[c] += n
+            if not ok:
+                self.errors[step] += 1
+
+    def record_flow(self, flow, ms):
+        with self.lock:
+            self.flow_latencies[flow].append(ms)
+
+    def add_reads(self, reads):
+        with self.lock:
+            for c, n in reads.items():
+                self.reads[c] += n
+
+    def add_retry(self):
+        with self.lock:
+            self.txn_retries += 1
+
+
+METRICS = Metrics()
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(len(ordered) * p + 0.5) - 1))]
+
+
+def collection_of(path):
+    """users/abc/history/x -> users/*/history (doc ids collapsed)."""
+    parts = path.split("/")
+    return "/".join(p if i % 2 == 0 else "*" for i, p in enumerate(parts[:-1] if len(parts) % 2 == 0 else parts))
+
+
+# --- TRANSPORT ---
+
+def http(method, url, body=None, headers=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method)
+    req.add_header("Content-Type", "application/json")
+    for k, v in (headers or {}).items():
+        req.add_header(k, v)
+    with urllib.request.urlopen(req, timeout=30) as res:
+        payload = res.read()
+    return json.loads(payload) if payload else None
+
+
+def timed(step, fn, reads=None, writes=None):
+    start = time.perf_counter()
+    try:
+        result = fn()
+        METRICS.record(step, (time.perf_counter() - start) * 1000, reads, writes)
+        return result
+    except urllib.error.HTTPError as e:
+        ok = e.code == 404  # A missing doc is a normal (billed) read
+        METRICS.record(step, (time.perf_counter() - start) * 1000, reads, writes if ok else None, ok=ok)
+        if not ok:
+            raise
+        return None
+
+
+FS_HEADERS = {"Authorization": "Bearer owner"}  # Emulator admin bypass
+
+
+def fs_get(step, path):
+    return timed(step, lambda: http("GET", f"{FIRESTORE_ROOT}/{path}", headers=FS_HEADERS),
+                 reads={collection_of(path): 1})
+
+
+def fs_set(step, path, fields):
+    body = {"fields": {k: encode(v) for k, v in fields.items()}}
+    return timed(step, lambda: http("PATCH", f"{FIRESTORE_ROOT}/{path}", body, FS_HEADERS),
+                 writes={collection_of(path): 1})
+
+
+def fs_commit(step, writes, transaction=None):
+    body = {"writes": writes}
+    if transaction:
+        body["transaction"] = transaction
+    counts = defaultdict(int)
+    for w in writes:
+        name = (w.get("update") or {}).get("name") or w.get("transform", {}).get("document", "")
+        counts[collection_of(name.split("/documents/", 1)[-1])] += 1
+    return timed(step, lambda: http("POST", f"{FIRESTORE_ROOT}:commit", body, FS_HEADERS), writes=dict(counts))
+
+
+def fs_query(step, collection, field, value):
+    """Single equality query, like the leaderboard shard listener."""
+    body = {"structuredQuery": {
+        "from": [{"collectionId": collection}],
+        "where": {"fieldFilter": {"field": {"fieldPath": field}, "op": "EQUAL", "value": encode(value)}},
+    }}
+    rows = timed(step, lambda: http("POST", f"{FIRESTORE_ROOT}:runQuery", body, FS_HEADERS))
+    docs = [r["document"] for r in rows or [] if "document" in r]
+    METRICS.add_reads({collection: max(1, len(docs))})  # Billed per returned doc, minimum one
+    return docs
+
+
+def fs_list(step, collection):
+    """Whole-collection query, like the live feed shard listener."""
+    body = {"structuredQuery": {"from": [{"collectionId": collection}]}}
+    rows = timed(step, lambda: http("POST", f"{FIRESTORE_ROOT}:runQuery", body, FS_HEADERS))
+    docs = [r["document"] for r in rows or [] if "document" in r]
+    METRICS.add_reads({collection: max(1, len(docs))})
+    return docs
+
+
+def rtdb(step, method, path, body=None):
+    url = f"{RTDB_ROOT}/{path}.json?ns={RTDB_NAMESPACE}"
+    key = f"rtdb:{path.split('/')[0]}"
+    counts = {key: 1}
+    return timed(step, lambda: http(method, url, body, {"Authorization": "Bearer owner"}),
+                 reads=counts if method == "GET" else None,
+                 writes=None if method == "GET" else counts)
+
+
+def doc_name(path):
+    return f"projects/{PROJECT_ID}/databases/(default)/documents/{path}"
+
+
+def run_transaction(step, paths, apply):
+    """
+    beginTransaction -> batchGet(paths) -> apply(docs) -> commit, retried on
+    contention like the client SDK's runTransaction. apply returns
+    {path: fields} to write.
+    """
+    for attempt in range(TXN_MAX_ATTEMPTS):
+        txn = timed(f"{step}.begin", lambda: http("POST", f"{FIRESTORE_ROOT}:beginTransaction", {}, FS_HEADERS))["transaction"]
+        reads = defaultdict(int)
+        for p in paths:
+            reads[collection_of(p)] += 1
+        results = timed(f"{step}.read", lambda: http("POST", f"{FIRESTORE_ROOT}:batchGet", {
+            "documents": [doc_name(p) for p in paths], "transaction": txn
+        }, FS_HEADERS), reads=dict(reads))
+        docs = {}
+        for r in results or []:
+            if "found" in r:
+                path = r["found"]["name"].split("/documents/", 1)[1]
+                docs[path] = {k: decode(v) for k, v in r["found"].get("fields", {}).items()}
+        updates = apply(docs)
+        writes = [{"update": {"name": doc_name(p), "fields": {k: encode(v) for k, v in f.items()}}} for p, f in updates.items()]
+        try:
+            fs_commit(f"{step}.commit", writes, txn)
+            return attempt
+        except urllib.error.HTTPError as e:
+            if e.code not in (409, 400) or attempt == TXN_MAX_ATTEMPTS - 1:
+                raise
+            METRICS.add_retry()
+            time.sleep(random.uniform(0.01, 0.05) * (attempt + 1))
+    return TXN_MAX_ATTEMPTS
+
+
+# --- ANALYSIS AGGREGATES (mirror of utils/analysisAggregates.ts) ---
+
+HIST_BUCKETS = 10
+WEAK_THRESHOLD = 50
+UNSAFE_KEY_CHARS = re.compile(r"[./\[\]*`~]")
+SIMPLE_FIELD = re.compile(r"^[A-Za-z_][A-Za-z_0-9]*$")
+
+
+def window_keys(now):
+    """getWindowKey() for HOURLY + DAILY."""
+    day = now.strftime("%Y-%m-%d")
+    return [("HOURLY", f"h_{day}T{now.strftime('%H')}"), ("DAILY", f"d_{day}")]
+
+
+def js_round(x):
+    """Math.round (halves round up, unlike Python's round)."""
+    return math.floor(x + 0.5)
+
+
+def percentage_of(log):
+    return max(0, min(100, log["score"] / log["totalQuestions"] * 100)) if log["totalQuestions"] > 0 else 0
+
+
+def safe_key(s):
+    """safeKey(): map keys become Firestore field names."""
+    return UNSAFE_KEY_CHARS.sub("_", s or "Unknown").strip() or "Unknown"
+
+
+def field_path(*segments):
+    """REST field path; segments that aren't plain identifiers are backtick-quoted (as the SDK does)."""
+    return ".".join(seg if SIMPLE_FIELD.match(seg)
+                    else "`" + seg.replace("\\", "\\\\").replace("`", "\\`") + "`" for seg in segments)
+
+
+def counter_increments(prefix, pct):
+    """counterIncrement() under one map key, as {field path: n}."""
+    bucket = f"b{min(HIST_BUCKETS - 1, math.floor(pct / 10))}"
+    return {
+        field_path(*prefix, "count"): 1,
+        field_path(*prefix, "scoreSum"): js_round(pct),
+        field_path(*prefix, "low"): 1 if pct < WEAK_THRESHOLD else 0,
+        field_path(*prefix, "hist", bucket): 1,
+    }
+
+
+def aggregate_write(log, window, window_key, shard):
+    """One buildAggregateIncrements() setDoc(merge) as a REST write: window fields + increments."""
+    pct = percentage_of(log)
+    subject = safe_key(log.get("subject"))
+    increments = {**counter_increments(["totals"], pct),
+                  **counter_increments(["subjects", subject], pct),
+                  **counter_increments(["chapters", f"{subject}::{safe_key(log.get('chapter'))}"], pct)}
+    if log.get("topic"):
+        increments.update(counter_increments(["topics", safe_key(log["topic"])], pct))
+    return {
+        "update": {"name": doc_name(f"analytics_aggregates/{window_key}_s{shard}"),
+                   "fields": {"window": encode(window), "windowKey": encode(window_key)}},
+        "updateMask": {"fieldPaths": ["window", "windowKey"]},
+        "updateTransforms": [{"fieldPath": f, "increment": {"integerValue": str(n)}} for f, n in increments.items()],
+    }
+
+
+# --- FLOWS (each mirrors the firebase.ts calls the app makes) ---
+
+def flow_login(student):
+    rtdb("login.getUserData", "GET", f"users/{student['id']}")
+    manifest = fs_get("login.settingsManifest", "config/settings_manifest")
+    if manifest is None:
+        fs_get("login.legacySettings", "config/system_settings")
+    elif student.get("_cold", True):
+        # First launch on a device: every section hash is new
+        for s in SETTINGS_SECTIONS:
+            fs_get("login.settingsSection", f"settings_sections/{s}")
+        student["_cold"] = False
+    save_user_to_live(student, "login.saveUserToLive")
+    rtdb("login.updateUserStatus", "PATCH", f"users/{student['id']}", {"lastActiveTime": now_iso()})
+    if not fs_list("login.liveFeed", "live_results"):
+        # No feed shard yet: subscribeToPublicActivity falls back to the RTDB stream
+        rtdb("login.liveFeedRtdb", "GET", f'public_activity?orderBy="$key"&limitToLast={LIVE_FEED_SIZE}')
+    fs_query("login.leaderboard", "leaderboards", "id", f"{student['board']}_{student['classLevel']}_all")
+
+
+def flow_open_chapter(student, subject, chapter_id, ai_share):
+    key = content_key(student, subject, chapter_id)
+    data = fs_get("openChapter.getChapterData", f"content_data/{key}")
+    if data is None:
+        rtdb("openChapter.getChapterDataRtdb", "GET", f"content_data/{key}")
+        if random.random() < ai_share:
+            ai_call("openChapter.generateMcqs", f"Create {QUESTIONS_PER_TEST} MCQs for {subject} {chapter_id}")
+    return data
+
+
+def flow_take_test(student, subject, chapter_id):
+    """Answers locally (no I/O), like McqView; returns the attempt."""
+    time.sleep(random.uniform(0.0, 0.05))  # Compressed think time
+    score = sum(1 for _ in range(QUESTIONS_PER_TEST) if random.random() < 0.6)
+    return {
+        "id": f"{student['id']}-{int(time.time() * 1000)}-{random.randrange(1000)}",
+        "testId": f"{subject}-{chapter_id}",
+        "date": now_iso(),
+        "score": score,
+        "total": QUESTIONS_PER_TEST,
+        "chapterId": chapter_id,
+        "chapterTitle": f"Chapter {chapter_id}",
+        "subjectName": subject,
+        "classLevel": student["classLevel"],
+        "ranked": random.random() < RANKED_SHARE,
+    }
+
+
+def flow_submit(student, attempt):
+    uid = student["id"]
+    fs_set("submit.saveUserHistory", f"users/{uid}/history/history_{attempt['id']}", attempt)
+    fs_set("submit.saveTestResult", f"users/{uid}/test_results/{attempt['testId']}_{attempt['id']}", attempt)
+    if attempt["ranked"]:
+        update_leaderboards(student, attempt)
+    save_public_activity(student, attempt)
+    student["credits"] = max(0, student["credits"] - 1)
+    student["mcqHistory"] = ([{"id": attempt["id"], "score": attempt["score"]}] + student["mcqHistory"])[:20]
+    save_user_to_live(student, "submit.saveUserToLive")
+
+
+def flow_marksheet(student, attempt, ai_share):
+    fs_get("marksheet.getChapterData", f"content_data/{content_key(student, attempt['subjectName'], attempt['chapterId'])}")
+    fs_get("marksheet.universalNotes", "content_data/nst_universal_notes")
+    if random.random() < ai_share:
+        # Ultra analysis: quota check, AI call, usage counter, analysis log
+        fs_get("marksheet.getApiUsage", f"admin_stats/api_usage_{datetime.now(timezone.utc).strftime('%Y-%m-%d')}")
+        ai_call("marksheet.ultraAnalysis", f"Analyse {attempt['score']}/{attempt['total']}")
+        increment_api_usage()
+        save_universal_analysis(student, attempt)
+        fs_set("marksheet.saveAiInteraction", f"ai_interactions/ai-ultra-{attempt['id']}",
+               {"userId": student["id"], "type": "ULTRA_ANALYSIS"})
+
+
+def save_user_to_live(student, step):
+    public = {k: v for k, v in student.items() if not k.startswith("_") and v is not None}
+    rtdb(f"{step}.rtdb", "PUT", f"users/{student['id']}", public)
+    fs_set(f"{step}.firestore", f"users/{student['id']}", public)
+
+
+def update_leaderboards(student, attempt):
+    """Same transaction as updateLeaderboards(): the user's shard of each period + member docs."""
+    now = datetime.fromisoformat(attempt["date"].replace("Z", "+00:00"))  # ctx.attemptedAt
+    pct = round(attempt["score"] / attempt["total"] * 100) if attempt["total"] else 0
+    entry = {"id": attempt["id"], "userId": student["id"], "userName": student["name"],
+             "score": pct, "total": 100, "date": attempt["date"], "topic": attempt["chapterTitle"]}
+    targets = leaderboard_targets(student["board"], student["classLevel"], student["id"], now)
+    paths = [p for t in targets for p in (t["agg_path"], t["member_path"])]
+    run_transaction("submit.leaderboardTxn", paths,
+                    lambda docs: leaderboard_updates(docs, targets, student["board"], student["classLevel"], entry))
+
+
+def save_public_activity(student, attempt):
+    act_id = f"act_{int(time.time() * 1000)}_{random.randrange(100000)}"
+    activity = {"id": act_id, "userId": student["id"], "userName": student["name"], "type": "TEST",
+                "score": attempt["score"], "total": attempt["total"], "timestamp": now_iso()}
+    rtdb("submit.publicActivity.rtdb", "PUT", f"public_activity/{act_id}", activity)
+    fs_set("submit.publicActivity.firestore", f"public_activity/{act_id}", activity)
+
+    def fold(docs):
+        feed = docs.get(feed_path) or {"recent": [], "count": 0}
+        recent = [activity] + [a for a in feed.get("recent", []) if a.get("id") != act_id]
+        return {feed_path: {"recent": recent[:LIVE_FEED_SIZE], "count": feed.get("count", 0) + 1, "updatedAt": now_iso()}}
+
+    feed_path = f"live_results/feed_s{random.randrange(LIVE_FEED_SHARDS)}"
+    run_transaction("submit.publicActivity.feedTxn", [feed_path], fold)
+
+
+def increment_transform(path, fields):
+    return {"transform": {"document": doc_name(path), "fieldTransforms": [
+        {"fieldPath": f, "increment": {"integerValue": str(n)}} for f, n in fields.items()
+    ]}}
+
+
+def increment_api_usage():
+    day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    fs_commit("marksheet.incrementApiUsage", [increment_transform(f"admin_stats/api_usage_{day}",
+                                                                 {"key_0": 1, "total": 1, "studentCount": 1})])
+
+
+def save_universal_analysis(student, attempt):
+    log_id = f"analysis-{attempt['id']}"
+    log = {"id": log_id, "userId": student["id"], "subject": attempt["subjectName"], "chapter": attempt["chapterTitle"],
+           "score": attempt["score"], "totalQuestions": attempt["total"], "date": now_iso()}
+    rtdb("marksheet.analysisLog.rtdb", "PUT", f"universal_analysis_logs/{log_id}", log)
+    fs_set("marksheet.analysisLog.firestore", f"universal_analysis_logs/{log_id}", log)
+    # Window keys come from the log date, one random shard per window (saveUniversalAnalysis)
+    when = datetime.fromisoformat(log["date"].replace("Z", "+00:00"))
+    for window, key in window_keys(when):
+        fs_commit("marksheet.analysisAggregate", [aggregate_write(log, window, key, random.randrange(ANALYSIS_SHARDS))])
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+# --- MOCK /api/groq ---
+
+class GroqHandler(BaseHTTPRequestHandler):
+    latency_ms = 400
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/api/groq":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(self.latency_ms / 1000 * random.uniform(0.5, 1.5))
+        text = "[]" if "MCQ" in json.dumps(body.get("messages", [])) else "Mock analysis: revise weak topics."
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for word in text.split(" "):
+                chunk = {"choices": [{"delta": {"content": word + " "}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+            return
+        payload = json.dumps({"choices": [{"message": {"role": "assistant", "content": text}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+GROQ_URL = None
+
+
+def start_groq_mock(port, latency_ms):
+    GroqHandler.latency_ms = latency_ms
+    server = ThreadingHTTPServer(("127.0.0.1", port), GroqHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def ai_call(step, prompt):
+    timed(step, lambda: http("POST", GROQ_URL, {"model": "llama-3.1-8b-instant",
+                                                "messages": [{"role": "user", "content": prompt}]}))
+
+
+# --- DRIVER ---
+
+def seed_content(students):
+    """One content_data doc per (board, class, subject, chapter) the students will open."""
+    seen = set()
+    for s in students:
+        for subject in SUBJECTS:
+            for ch in range(1, CHAPTERS_PER_SUBJECT + 1):
+                key = content_key(s, subject, f"ch{ch}")
+                if key in seen:
+                    continue
+                seen.add(key)
+                fs_set("seed", f"content_data/{key}", {
+                    "subjectName": subject,
+                    "schoolPremiumNotesHtml": "<p>" + "Notes " * 2000 + "</p>",
+                    "manualMcqData": make_mcqs(subject, f"ch{ch}"),
+                })
+    fs_set("seed", "content_data/nst_universal_notes", {"notes": []})
+    admin = make_admin()
+    fs_set("seed", f"users/{admin['id']}", admin)
+    return len(seen)
+
+
+def run_student(student, args):
+    flow_start = time.perf_counter()
+    for _ in range(args.tests_per_student):
+        step_start = time.perf_counter()
+        try:
+            if not student.get("_logged_in"):
+                flow_login(student)
+                student["_logged_in"] = True
+                METRICS.record_flow("login", (time.perf_counter() - step_start) * 1000)
+
+            subject = random.choice(SUBJECTS)
+            chapter_id = f"ch{random.randint(1, CHAPTERS_PER_SUBJECT)}"
+            t = time.perf_counter()
+            flow_open_chapter(student, subject, chapter_id, args.ai_share)
+            METRICS.record_flow("open_chapter", (time.perf_counter() - t) * 1000)
+
+            attempt = flow_take_test(student, subject, chapter_id)
+
+            t = time.perf_counter()
+            flow_submit(student, attempt)
+            METRICS.record_flow("submit", (time.perf_counter() - t) * 1000)
+
+            t = time.perf_counter()
+            flow_marksheet(student, attempt, args.ai_share)
+            METRICS.record_flow("marksheet", (time.perf_counter() - t) * 1000)
+        except Exception as e:  # Keep the other students going; errors are counted per step
+            METRICS.record("student.aborted", (time.perf_counter() - step_start) * 1000, ok=False)
+            if args.verbose:
+                print(f"{student['id']}: {e}")
+    METRICS.record_flow("student_total", (time.perf_counter() - flow_start) * 1000)
+
+
+def print_report(elapsed, args):
+    m = METRICS
+    total_errors = sum(m.errors.values())
+    print(f"\n== {args.students} students, concurrency {args.concurrency}, {elapsed:.1f}s ==")
+    print(f"requests: {m.requests}   req/s: {m.requests / elapsed:.1f}   errors: {total_errors}   txn retries: {m.txn_retries}")
+
+    print(f"\n{'flow':<16} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for flow, values in sorted(m.flow_latencies.items()):
+        print(f"{flow:<16} {len(values):>7} {percentile(values, 0.5):>9.1f} {percentile(values, 0.95):>9.1f} {max(values):>9.1f}")
+
+    print(f"\n{'step':<40} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+    for step, values in sorted(m.latencies.items()):
+        if step == "seed":
+            continue
+        print(f"{step:<40} {len(values):>7} {percentile(values, 0.5):>9.1f} {percentile(values, 0.95):>9.1f} {m.errors.get(step, 0):>7}")
+
+    print(f"\n{'collection':<32} {'reads':>9} {'writes':>9} {'reads/student':>14} {'writes/student':>15}")
+    for c in sorted(set(m.reads) | set(m.writes)):
+        r, w = m.reads.get(c, 0), m.writes.get(c, 0)
+        print(f"{c:<32} {r:>9} {w:>9} {r / args.students:>14.2f} {w / args.students:>15.2f}")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({
+                "students": args.students, "concurrency": args.concurrency, "elapsedSec": elapsed,
+                "requests": m.requests, "requestsPerSec": m.requests / elapsed, "txnRetries": m.txn_retries,
+                "flows": {k: {"count": len(v), "p50": percentile(v, 0.5), "p95": percentile(v, 0.95)} for k, v in m.flow_latencies.items()},
+                "steps": {k: {"count": len(v), "p95": percentile(v, 0.95), "errors": m.errors.get(k, 0)} for k, v in m.latencies.items()},
+                "reads": dict(m.reads), "writes": dict(m.writes),
+            }, f, indent=2)
+        print(f"\nReport saved to {args.report}")
+
+    failures = []
+    flow_p95 = max((percentile(v, 0.95) for k, v in m.flow_latencies.items() if k != "student_total"), default=0)
+    if args.max_p95_ms and flow_p95 > args.max_p95_ms:
+        failures.append(f"flow p95 {flow_p95:.0f} ms > {args.max_p95_ms} ms")
+    error_rate = total_errors / m.requests if m.requests else 0
+    if error_rate > args.max_error_rate:
+        failures.append(f"error rate {error_rate:.2%} > {args.max_error_rate:.2%}")
+    if failures:
+        raise SystemExit("FAIL: " + "; ".join(failures))
+    print("PASS")
+
+
+def main():
+    global GROQ_URL, METRICS
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=100, help="students active at the same time")
+    parser.add_argument("--tests-per-student", type=int, default=1)
+    parser.add_argument("--ai-share", type=float, default=0.2, help="share of marksheets that request AI analysis")
+    parser.add_argument("--groq-port", type=int, default=8787)
+    parser.add_argument("--groq-latency-ms", type=int, default=400)
+    parser.add_argument("--max-p95-ms", type=float, default=0, help="fail if any flow p95 exceeds this (0 = off)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--report", default="load_report.json")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="content_data is already seeded")
+    parser.add_argument("--serve-groq-only", action="store_true")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = start_groq_mock(args.groq_port, args.groq_latency_ms)
+    GROQ_URL = f"http://127.0.0.1:{args.groq_port}/api/groq"
+    if args.serve_groq_only:
+        print(f"Mock /api/groq listening on {GROQ_URL} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    random.seed(args.seed)
+    students = [make_student(i) for i in range(args.students)]
+    if not args.skip_seed:
+        print(f"Seeded {seed_content(students)} chapters")
+
+    # Seed writes aren't part of the measured load
+    METRICS = Metrics()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(lambda s: run_student(s, args), students))
+    elapsed = time.perf_counter() - start
+
+    server.shutdown()
+    print_report(elapsed, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Repeat-visit startup with the app-shell service worker (sw.js).
+
+The service worker is only registered in production builds, so run against
+the preview server:
+    npm run build && npm run preview
+    python verify_offline_startup.py [base_url]
+
+Measures time from navigation start until the app has rendered into #root:
+  - cold:    first visit, throttled, service worker blocked (baseline)
+  - repeat:  second visit, same throttling, served by the service worker
+  - offline: network fully off, must still render from the precache
+Fails if the repeat or offline visit exceeds its budget. Results are written
+to offline_startup.json in the system temp dir (override with
+OFFLINE_STARTUP_REPORT), never into the repo.
+"""
+import json
+import os
+import sys
+import tempfile
+from playwright.sync_api import sync_playwright
+
+BASE_URL = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:4173"
+REPORT_PATH = os.environ.get("OFFLINE_STARTUP_REPORT", os.path.join(tempfile.gettempdir(), "offline_startup.json"))
+
+# Roughly Chrome DevTools "Slow 3G"
+SLOW_3G = {
+    "offline": False,
+    "latency": 400,
+    "downloadThroughput": 50 * 1024,
+    "uploadThroughput": 20 * 1024,
+}
+
+BUDGETS_MS = {
+    "repeat": 3000,
+    "offline": 3000,
+}
+RENDER_TIMEOUT_MS = 120000
+
+STUDENT_USER = {
+    "id": "offline-student-1",
+    "name": "Offline Student",
+    "role": "STUDENT",
+    "board": "CBSE",
+    "classLevel": "10",
+    "credits": 100,
+    "isPremium": False,
+    "createdAt": "2026-01-01T00:00:00.000Z",
+}
+
+SEED_SCRIPT = f"""
+    if (!localStorage.getItem('nst_current_user')) {{
+        localStorage.setItem('nst_current_user', JSON.stringify({json.dumps(STUDENT_USER)}));
+        localStorage.setItem('nst_terms_accepted', 'true');
+        localStorage.setItem('nst_has_seen_welcome', 'true');
+        localStorage.setItem('nst_last_daily_tracker_date', new Date().toDateString());
+        localStorage.setItem('nst_last_daily_challenge_date', new Date().toDateString());
+    }}
+"""
+
+
+def throttle(context, page, conditions):
+    cdp = context.new_cdp_session(page)
+    cdp.send("Network.enable")
+    cdp.send("Network.emulateNetworkConditions", conditions)
+    return cdp
+
+
+def measure_startup(page):
+    """Navigates and returns ms from navigation start until #root has content."""
+    page.goto(BASE_URL, wait_until="commit", timeout=RENDER_TIMEOUT_MS)
+    page.wait_for_function(
+        "document.getElementById('root') && document.getElementById('root').children.length > 0",
+        timeout=RENDER_TIMEOUT_MS,
+    )
+    return round(page.evaluate("performance.now()"))
+
+
+def run():
+    results = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+
+        # Baseline: what every cold start costs today
+        cold_context = browser.new_context(viewport={"width": 390, "height": 844}, service_workers="block")
+        cold_context.add_init_script(SEED_SCRIPT)
+        cold_page = cold_context.new_page()
+        throttle(cold_context, cold_page, SLOW_3G)
+        results["cold"] = measure_startup(cold_page)
+        cold_context.close()
+
+        context = browser.new_context(viewport={"width": 390, "height": 844})
+        context.add_init_script(SEED_SCRIPT)
+        page = context.new_page()
+
+        # First visit installs the service worker and precaches the shell
+        page.goto(BASE_URL)
+        page.wait_for_load_state("networkidle")
+        installed = page.evaluate("""async () => {
+            if (!('serviceWorker' in navigator)) return false;
+            await navigator.serviceWorker.ready;
+            return true;
+        }""")
+        if not installed:
+            raise SystemExit("FAIL: service worker did not install (is this a production build?)")
+        # Load once under control so the runtime caches (fonts, KaTeX, Tailwind) fill
+        page.reload()
+        page.wait_for_load_state("networkidle")
+        if not page.evaluate("!!navigator.serviceWorker.controller"):
+            raise SystemExit("FAIL: page is not controlled by the service worker")
+
+        cdp = throttle(context, page, SLOW_3G)
+        results["repeat"] = measure_startup(page)
+        cdp.send("Network.emulateNetworkConditions", {"offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1})
+
+        context.set_offline(True)
+        try:
+            results["offline"] = measure_startup(page)
+        except Exception as e:
+            results["offline"] = None
+            print(f"Offline visit did not render: {e}")
+        context.set_offline(False)
+
+        browser.close()
+
+    with open(REPORT_PATH, "w") as f:
+        json.dump({"budgetsMs": BUDGETS_MS, "resultsMs": results}, f, indent=2)
+
+    print(f"{'visit':<10} {'startup ms':>12} / budget")
+    for visit, ms in results.items():
+        budget = BUDGETS_MS.get(visit)
+        shown = "n/a" if ms is None else ms
+        print(f"{visit:<10} {shown:>12} / {budget if budget is not None else '-'}")
+    if results["cold"] and results["repeat"]:
+        print(f"\nRepeat visit is {results['cold'] / max(results['repeat'], 1):.1f}x faster than cold on Slow 3G")
+
+    failures = []
+    for visit, budget in BUDGETS_MS.items():
+        ms = results.get(visit)
+        if ms is None:
+            failures.append(f"{visit}: app did not render")
+        elif ms > budget:
+            failures.append(f"{visit}: {ms} ms (budget {budget} ms)")
+
+    if failures:
+        print("\nFAIL: startup budget exceeded")
+        for f in failures:
+            print(f"  - {f}")
+        raise SystemExit(1)
+    print(f"\nPASS: repeat and offline startup within budget (report saved to {REPORT_PATH})")
+
+
+if __name__ == "__main__":
+    run()
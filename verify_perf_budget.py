@@ -0,0 +1,133 @@
+"""
+Per-flow performance budgets, read from the in-app tracing hook (utils/perf.ts).
+
+Start the dev server first (npm run dev), then:
+    python verify_perf_budget.py [base_url]
+
+Tracing is switched on before the app boots (window.__NST_PERF__), each flow is
+wrapped in window.__nstPerf.beginFlow()/endFlow(), and the collected profile is
+checked against BUDGETS. Any flow over its latency or call-count budget fails
+the run. The full profile is written to perf_profile.json in the system temp
+dir (override with PERF_PROFILE_PATH) for inspection, never into the repo.
+"""
+import json
+import os
+import sys
+import tempfile
+from playwright.sync_api import sync_playwright
+
+BASE_URL = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:5000"
+PROFILE_PATH = os.environ.get("PERF_PROFILE_PATH", os.path.join(tempfile.gettempdir(), "perf_profile.json"))
+
+STUDENT_USER = {
+    "id": "perf-student-1",
+    "name": "Perf Student",
+    "role": "STUDENT",
+    "board": "CBSE",
+    "classLevel": "10",
+    "credits": 100,
+    "isPremium": False,
+    "createdAt": "2026-01-01T00:00:00.000Z",
+}
+
+# Per flow: "wallMs" caps the whole flow, "<metric>.p95" caps a histogram's p95,
+# "<counter>" caps a counter (e.g. how many times a call may run in the flow).
+BUDGETS = {
+    "startup": {
+        "wallMs": 8000,
+        "getChapterData.calls": 10,
+        "saveUserToLive.calls": 2,
+        "storage.getItem.calls": 60,
+        "storage.getItem.p95": 150,
+        "callGroqApi.calls": 0,
+    },
+    "idle": {
+        "saveUserToLive.calls": 1,
+        "getChapterData.calls": 0,
+        "callGroqApi.calls": 0,
+        "callGroqApiStream.calls": 0,
+    },
+}
+
+
+def check_budget(flow, profile, budget):
+    """Returns a list of human-readable budget violations for one flow."""
+    failures = []
+    counters = profile.get("counters", {})
+    histograms = profile.get("histograms", {})
+    for metric, limit in budget.items():
+        if metric == "wallMs":
+            actual = profile.get("wallMs", 0)
+        elif metric.endswith((".p95", ".p50", ".max", ".avg")):
+            name, stat = metric.rsplit(".", 1)
+            actual = histograms.get(name, {}).get(stat, 0)
+        else:
+            actual = counters.get(metric, 0)
+        status = "ok" if actual <= limit else "OVER"
+        print(f"  {flow:<10} {metric:<28} {actual:>10} / {limit:<8} {status}")
+        if actual > limit:
+            failures.append(f"{flow}: {metric} = {actual} (budget {limit})")
+    return failures
+
+
+def run_flow(page, name, action):
+    page.evaluate(f"window.__nstPerf.beginFlow({json.dumps(name)})")
+    action()
+    page.evaluate("window.__nstPerf.endFlow()")
+
+
+def run():
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context = browser.new_context(viewport={"width": 390, "height": 844})
+        # Enable tracing before any app module runs
+        context.add_init_script("window.__NST_PERF__ = true;")
+        page = context.new_page()
+
+        page.goto(BASE_URL)
+        page.evaluate(f"""
+            localStorage.setItem('nst_current_user', JSON.stringify({json.dumps(STUDENT_USER)}));
+            localStorage.setItem('nst_terms_accepted', 'true');
+            localStorage.setItem('nst_has_seen_welcome', 'true');
+            localStorage.setItem('nst_last_daily_tracker_date', new Date().toDateString());
+            localStorage.setItem('nst_last_daily_challenge_date', new Date().toDateString());
+        """)
+
+        # Startup: from module load (flow opened by utils/perf.ts) until the network settles
+        context.add_init_script("window.__NST_PERF_FLOW__ = 'startup';")
+        page.reload()
+        if not page.evaluate("!!window.__nstPerf"):
+            raise SystemExit("FAIL: window.__nstPerf missing (is utils/perf.ts bundled?)")
+        page.wait_for_load_state("networkidle")
+        page.evaluate("window.__nstPerf.endFlow()")
+        startup = page.evaluate("window.__nstPerf.snapshot()")
+
+        # Idle: a logged-in student doing nothing should not keep hitting the backend
+        page.evaluate("window.__nstPerf.reset()")
+        run_flow(page, "idle", lambda: page.wait_for_timeout(5000))
+        snapshot = page.evaluate("window.__nstPerf.snapshot()")
+
+        profile = {**startup["flows"], **snapshot["flows"]}
+        with open(PROFILE_PATH, "w") as f:
+            json.dump({"flows": profile, "spans": startup["spans"] + snapshot["spans"]}, f, indent=2)
+
+        browser.close()
+
+    print(f"{'flow':<12} {'metric':<28} {'actual':>10} / budget")
+    failures = []
+    for flow, budget in BUDGETS.items():
+        if flow not in profile:
+            failures.append(f"{flow}: no profile collected")
+            continue
+        failures.extend(check_budget(flow, profile[flow], budget))
+
+    if failures:
+        print(f"\nFAIL: performance budget exceeded (profile saved to {PROFILE_PATH})")
+        for f in failures:
+            print(f"  - {f}")
+        raise SystemExit(1)
+    print(f"\nPASS: all flows within budget (profile saved to {PROFILE_PATH})")
+
+
+if __name__ == "__main__":
+    run()
@@ -1,8 +1,42 @@
+import fs from 'fs';
 import path from 'path';
-import { defineConfig, loadEnv } from 'vite';
+import { createHash } from 'crypto';
+import { defineConfig, loadEnv, Plugin } from 'vite';
 import react from '@vitejs/plugin-react';
 
-export default defineConfig(({ mode }) => {
+// Emits /sw.js from the sw.js template with the app shell of this build (entry
+// chunks, their static imports and all CSS). The build id is derived from the
+// hashed file names, so sw.js only changes (and the browser only re-installs
+// it) when the shell actually changes.
+const precacheManifest = (): Plugin => ({
+  name: 'nst-precache-manifest',
+  apply: 'build',
+  enforce: 'post',
+  generateBundle(_options, bundle) {
+    const files = new Set<string>();
+    const addChunk = (fileName: string) => {
+      const chunk = bundle[fileName];
+      if (!chunk || files.has(fileName)) return;
+      files.add(fileName);
+      if (chunk.type === 'chunk') chunk.imports.forEach(addChunk);
+    };
+    Object.values(bundle).forEach(item => {
+      if (item.type === 'chunk' && item.isEntry) addChunk(item.fileName);
+      if (item.type === 'asset' && item.fileName.endsWith('.css')) files.add(item.fileName);
+    });
+
+    const urls = ['/', ...[...files].sort().map(f => `/${f}`)];
+    const build = createHash('sha256').update(urls.join('\n')).digest('hex').slice(0, 12);
+    const template = fs.readFileSync(path.resolve(__dirname, 'sw.js'), 'utf-8');
+    this.emitFile({
+      type: 'asset',
+      fileName: 'sw.js',
+      source: template.replace('self.__PRECACHE_MANIFEST__', JSON.stringify({ build, urls }))
+    });
+  }
+});
+
+export default defineConfig(({ mode, command }) => {
     const env = loadEnv(mode, '.', '');
     return {
       server: {
@@ -10,7 +44,7 @@ export default defineConfig(({ mode }) => {
         host: '0.0.0.0',
         allowedHosts: true,
       },
-      plugins: [react()],
+      plugins: [react(), precacheManifest()],
       optimizeDeps: {
         include: ['pdfjs-dist'],
       },
@@ -22,7 +56,9 @@ export default defineConfig(({ mode }) => {
       },
       define: {
         'process.env.API_KEY': JSON.stringify(env.GEMINI_API_KEY),
-        'process.env.GEMINI_API_KEY': JSON.stringify(env.GEMINI_API_KEY)
+        'process.env.GEMINI_API_KEY': JSON.stringify(env.GEMINI_API_KEY),
+        // Service worker only in builds; in dev it would serve stale modules over HMR
+        'process.env.ENABLE_SW': JSON.stringify(String(command === 'build'))
       }
     };
 });